@@ -0,0 +1,50 @@
+# Compares parsing candles and trades into rows with decoding them into columns (params={'format': 'columns'}).
+# Run from the src folder with: python -m benchmarks.bench_columns
+import time
+
+from bullish_ccxt.bullish import bullish
+from bullish_ccxt.columns import candle_columns, trade_columns
+
+ROW_COUNT = 10000
+ROUNDS = 10
+
+
+def make_candles(count):
+    return [{
+        'open': '%.4f' % (63000 + i % 50), 'high': '%.4f' % (63100 + i % 50), 'low': '%.4f' % (62900 + i % 50),
+        'close': '%.4f' % (63050 + i % 50), 'volume': '%.8f' % (1 + i % 7),
+        'createdAtTimestamp': str(1714521600000 + i * 60000), 'createdAtDatetime': '2024-05-01T00:00:00.000Z',
+    } for i in range(count)]
+
+
+def make_trades(count):
+    return [{
+        'tradeId': str(100020000000000000 + i), 'orderId': str(390755251232145409 + i), 'symbol': 'BTCUSDC',
+        'price': '%.4f' % (63000 + i % 50), 'quantity': '%.8f' % (0.1 + i % 7), 'side': 'BUY' if i % 2 else 'SELL',
+        'isTaker': bool(i % 3), 'createdAtDatetime': '2024-05-01T00:00:00.000Z', 'createdAtTimestamp': str(1714521600000 + i),
+    } for i in range(count)]
+
+
+def measure(name, run):
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        run()
+    elapsed = (time.perf_counter() - started) / ROUNDS
+    print('%-16s %10.2f ms' % (name, elapsed * 1000))
+
+
+def main():
+    exchange = bullish()
+    exchange.symbols_bullish_to_unified = {'BTCUSDC': 'BTC/USDC'}
+    exchange.symbols_unified_to_bullish = {'BTC/USDC': 'BTCUSDC'}
+    candles = make_candles(ROW_COUNT)
+    trades = make_trades(ROW_COUNT)
+    print('%d candles, %d trades' % (len(candles), len(trades)))
+    measure('ohlcv rows', lambda: list(map(exchange.parse_ohlcv, candles)))
+    measure('ohlcv columns', lambda: candle_columns(candles))
+    measure('trades rows', lambda: list(map(exchange.parse_trade, trades)))
+    measure('trades columns', lambda: trade_columns(trades, exchange.to_unified_symbol))
+
+
+if __name__ == '__main__':
+    main()
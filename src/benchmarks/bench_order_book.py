@@ -0,0 +1,66 @@
+# Compares parsing and querying order books as lists of [price, amount] pairs and as ArrayOrderBook.
+# Run from the src folder with: python -m benchmarks.bench_order_book
+import time
+
+from bullish_ccxt.bullish import bullish
+
+BOOK_COUNT = 50
+DEPTH = 100
+ROUNDS = 20
+SIZES = [0.5, 5.0, 50.0]
+
+
+def make_order_book(depth):
+    return {
+        'bids': [{'price': '%.4f' % (63000 - i), 'priceLevelQuantity': '%.8f' % (1 + i % 7)} for i in range(depth)],
+        'asks': [{'price': '%.4f' % (63001 + i), 'priceLevelQuantity': '%.8f' % (1 + i % 5)} for i in range(depth)],
+        'timestamp': '1714521600000',
+        'sequenceNumber': 1,
+    }
+
+
+# The depth queries written against lists, as the pricing loop does today
+def list_vwap(levels, size):
+    filled = cost = 0.0
+    for price, amount in levels:
+        take = min(amount, size - filled)
+        filled += take
+        cost += take * price
+        if filled >= size:
+            return cost / size
+    return None
+
+
+def measure(name, run):
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        run()
+    elapsed = (time.perf_counter() - started) / ROUNDS
+    print('%-10s %10.3f ms per tick' % (name, elapsed * 1000))
+
+
+def main():
+    exchange = bullish()
+    responses = [make_order_book(DEPTH) for _ in range(BOOK_COUNT)]
+    print('%d books of %d levels per side, %d sizes' % (BOOK_COUNT, DEPTH, len(SIZES)))
+
+    def with_lists():
+        for response in responses:
+            book = exchange._parse_order_book(response, 'BTC/USDC', 1714521600000)
+            for size in SIZES:
+                list_vwap(book['asks'], size)
+                list_vwap(book['bids'], size)
+
+    def with_arrays():
+        for response in responses:
+            book = exchange._parse_array_order_book(response, 'BTC/USDC', 1714521600000)
+            for size in SIZES:
+                book.vwap('asks', size)
+                book.vwap('bids', size)
+
+    measure('lists', with_lists)
+    measure('arrays', with_arrays)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+# Compares parse_order / parse_trade / parse_ticker with the batch parsers of fast_parsers.
+# Run from the src folder with: python -m benchmarks.bench_parsers
+import time
+
+from bullish_ccxt.bullish import bullish
+from benchmarks.bench_columns import make_trades
+
+ROW_COUNT = 10000
+ROUNDS = 10
+
+
+def make_orders(count):
+    return [{
+        'orderId': str(390755251232145409 + i), 'clientOrderId': str(1714521600000000 + i), 'symbol': 'BTCUSDC',
+        'price': '%.4f' % (63000 + i % 50), 'avgPrice': '%.4f' % (63000 + i % 50), 'stopPrice': None,
+        'quantity': '%.8f' % (0.1 + i % 7), 'quantityFilled': '%.8f' % (i % 3 * 0.05), 'baseFee': '0.00000000',
+        'quoteFee': '3.1500', 'side': 'BUY' if i % 2 else 'SELL', 'type': 'LMT', 'timeInForce': 'GTC',
+        'status': ('OPEN', 'FILLED', 'CANCELLED')[i % 3], 'statusReason': 'Ok',
+        'createdAtDatetime': '2024-05-01T00:00:00.000Z', 'createdAtTimestamp': str(1714521600000 + i),
+    } for i in range(count)]
+
+
+def make_tickers(count):
+    return [{
+        'createdAtDatetime': '2024-05-01T00:00:00.000Z', 'createdAtTimestamp': str(1714521600000 + i),
+        'high': '64000.0000', 'low': '62000.0000', 'bestBid': '%.4f' % (63000 + i % 50), 'bidVolume': '1.00000000',
+        'bestAsk': '%.4f' % (63001 + i % 50), 'askVolume': '2.00000000', 'vwap': '63000.5000', 'open': '62500.0000',
+        'close': '63000.0000', 'last': '63000.0000', 'change': '500.0000', 'percentage': '0.80',
+        'average': '62750.0000', 'baseVolume': '100.00000000', 'quoteVolume': '6300000.0000',
+    } for i in range(count)]
+
+
+def measure(name, run, count):
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        run()
+    elapsed = (time.perf_counter() - started) / ROUNDS
+    print('%-16s %10.2f ms %12.0f rows/s' % (name, elapsed * 1000, count / elapsed))
+
+
+def main():
+    exchange = bullish()
+    exchange.symbols_bullish_to_unified = {'BTCUSDC': 'BTC/USDC'}
+    exchange.symbols_unified_to_bullish = {'BTC/USDC': 'BTCUSDC'}
+    orders = make_orders(ROW_COUNT)
+    trades = make_trades(ROW_COUNT)
+    tickers = make_tickers(ROW_COUNT)
+    symbols = ['BTC/USDC'] * ROW_COUNT
+    print('%d orders, %d trades, %d tickers' % (len(orders), len(trades), len(tickers)))
+    measure('orders', lambda: [exchange.parse_order(order) for order in orders], ROW_COUNT)
+    measure('orders fast', lambda: exchange.parse_orders_fast(orders), ROW_COUNT)
+    measure('trades', lambda: [exchange.parse_trade(trade) for trade in trades], ROW_COUNT)
+    measure('trades fast', lambda: exchange.parse_trades_fast(trades), ROW_COUNT)
+    measure('tickers', lambda: [exchange.parse_ticker(ticker, symbol) for ticker, symbol in zip(tickers, symbols)], ROW_COUNT)
+    measure('tickers fast', lambda: exchange.parse_tickers_fast(tickers, symbols), ROW_COUNT)
+
+
+if __name__ == '__main__':
+    main()
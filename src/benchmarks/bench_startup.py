@@ -0,0 +1,46 @@
+# Measures the startup of a process using the client: the import of the package, the first instance and the
+# next ones. Imports are timed in fresh interpreters.
+# Run from the src folder with: python -m benchmarks.bench_startup
+import subprocess
+import sys
+import time
+
+
+ROUNDS = 5
+INSTANCES = 200
+
+STARTUP = '''
+import time
+started = time.perf_counter()
+import bullish_ccxt
+imported = time.perf_counter()
+bullish_ccxt.bullish({'apiKey': 'key', 'secret': 'secret'})
+print(imported - started, time.perf_counter() - imported)
+'''
+
+
+def measure_instances(name, cls):
+    cls({})
+    started = time.perf_counter()
+    for _ in range(INSTANCES):
+        cls({'apiKey': 'key', 'secret': 'secret'})
+    elapsed = (time.perf_counter() - started) / INSTANCES
+    print('%-24s %8.2f ms' % (name, elapsed * 1e3))
+
+
+def main():
+    timings = []
+    for _ in range(ROUNDS):
+        output = subprocess.run([sys.executable, '-c', STARTUP], capture_output=True, text=True, check=True).stdout
+        timings.append([float(value) for value in output.split()])
+    print('%-24s %8.2f ms' % ('import bullish_ccxt', min(imported for imported, first in timings) * 1e3))
+    print('%-24s %8.2f ms' % ('first instance', min(first for imported, first in timings) * 1e3))
+
+    from bullish_ccxt.bullish import bullish
+    from bullish_ccxt.async_support import bullish as async_bullish
+    measure_instances('next instances', bullish)
+    measure_instances('next async instances', async_bullish)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+# Compares building the symbol mappings from every pair of assets with building them from the listed markets.
+# Run from the src folder with: python -m benchmarks.bench_symbol_mappings
+import time
+import tracemalloc
+
+from bullish_ccxt.bullish import bullish
+
+ASSET_COUNT = 300
+MARKET_COUNT = 600
+
+
+def make_assets(count):
+    return ['A%03d' % i for i in range(count - 3)] + ['BTC', 'USDC', 'USD']
+
+
+def make_markets(assets, count):
+    markets = []
+    for i in range(count):
+        base = assets[i % len(assets)]
+        quote = 'USDC' if i % 2 else 'USD'
+        perpetual = i % 5 == 0
+        markets.append({
+            'symbol': base + '-' + quote + '-PERP' if perpetual else base + quote,
+            'baseSymbol': base,
+            'quoteSymbol': quote,
+            'marketType': 'PERPETUAL' if perpetual else 'SPOT',
+        })
+    return markets
+
+
+# The mapping previously built from the cross-product of all assets, kept here for comparison
+def build_from_assets(exchange, available_symbols):
+    exchange.symbols_bullish_to_unified = {}
+    exchange.symbols_unified_to_bullish = {}
+    for left in available_symbols:
+        for right in available_symbols:
+            if left != right:
+                exchange.symbols_bullish_to_unified[left + right] = left + '/' + right
+                exchange.symbols_unified_to_bullish[left + '/' + right] = left + right
+                exchange.symbols_bullish_to_unified[left + '-' + right + '-PERP'] = left + '/' + right + ':' + right
+                exchange.symbols_unified_to_bullish[left + '/' + right + ':' + right] = left + '-' + right + '-PERP'
+
+
+def measure(name, build):
+    tracemalloc.start()
+    started = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print('%-10s %10.2f ms %10.2f MiB peak' % (name, elapsed * 1000, peak / 1024 / 1024))
+
+
+def main():
+    exchange = bullish()
+    assets = make_assets(ASSET_COUNT)
+    markets = make_markets(assets, MARKET_COUNT)
+    print('%d assets, %d markets' % (len(assets), len(markets)))
+    measure('assets', lambda: build_from_assets(exchange, assets))
+    print('%-10s %10d entries' % ('', len(exchange.symbols_bullish_to_unified)))
+    exchange.symbols_bullish_to_unified = exchange.symbols_unified_to_bullish = None
+    measure('markets', lambda: exchange._build_market_symbol_mappings(markets))
+    print('%-10s %10d entries' % ('', len(exchange.symbols_bullish_to_unified)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+# Offline benchmarks of the hot paths of the client, run against the API responses stored in benchmarks/fixtures.
+# Each benchmark reports its operations per second and the peak memory allocated by one operation, compared with
+# the results stored in benchmarks/baseline.json. Baselines are only comparable on the machine which saved them.
+# Run from the src folder with:
+#   python -m benchmarks.suite                  compare with the baseline
+#   python -m benchmarks.suite --save           store the results as the new baseline
+#   python -m benchmarks.suite parse sign       only run the benchmarks whose name contains `parse` or `sign`
+# The exit status is 1 when a benchmark regressed by more than --tolerance
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from bullish_ccxt.bullish import bullish
+from tests import mock_responses
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+# Seconds spent on each of the REPEATS timings of a benchmark, of which the fastest is kept
+DURATION = 0.2
+REPEATS = 5
+ACCOUNT_ID = '111000000000001'
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name + '.json')) as f:
+        return json.load(f)
+
+
+# A logged in client, whose markets endpoint answers with the fixture
+def make_exchange():
+    exchange = bullish({'apiKey': 'key', 'secret': 'secret', 'account_id': ACCOUNT_ID})
+    exchange.creds = mock_responses.LOGIN
+    markets = load_fixture('markets')
+    exchange.publicGetMarkets = lambda params={}: markets
+    exchange.load_market_symbol_mappings()
+    return exchange
+
+
+# Operations to measure, by name. Parsers handle a page of fixtures per operation
+def make_benchmarks(exchange):
+    orders = load_fixture('orders')['data']
+    trades = load_fixture('trades')['data']
+    tickers = load_fixture('tickers')
+    candles = load_fixture('candles')
+    order_book = load_fixture('order_book')
+    symbols = [exchange.to_unified_symbol(market['symbol']) for market in load_fixture('markets')[:len(tickers)]]
+    order_query = exchange._make_paginated_private_request('BTCUSDC', 1714521600000, 100)
+    order_request = exchange._make_create_order_request('BTC/USDC', 'limit', 'buy', 0.1, 63000)
+
+    def load_market_symbol_mappings():
+        exchange.symbols_bullish_to_unified = exchange.symbols_unified_to_bullish = None
+        exchange.load_market_symbol_mappings()
+
+    return {
+        'sign GET orders': lambda: exchange.sign('orders', 'privateV2', 'GET', order_query),
+        'sign POST orders': lambda: exchange.sign('orders', 'privateV2', 'POST', order_request),
+        'parse_order x%d' % len(orders): lambda: [exchange.parse_order(order) for order in orders],
+        'parse_trade x%d' % len(trades): lambda: [exchange.parse_trade(trade) for trade in trades],
+        'parse_ticker x%d' % len(tickers): lambda: [exchange.parse_ticker(ticker, symbol) for ticker, symbol in zip(tickers, symbols)],
+        'parse_ohlcv x%d' % len(candles): lambda: [exchange.parse_ohlcv(candle) for candle in candles],
+        '_parse_order_book': lambda: exchange._parse_order_book(order_book, 'BTC/USDC', 1714521600000),
+        'load_market_symbol_mappings': load_market_symbol_mappings,
+        '_make_paginated_private_request': lambda: exchange._make_paginated_private_request('BTCUSDC', 1714521600000, 100, {'_nextPage': '390755251232145509'}),
+    }
+
+
+def timed(operation, count):
+    started = time.perf_counter()
+    for _ in range(count):
+        operation()
+    return time.perf_counter() - started
+
+
+# Operations per second, and bytes allocated at the peak of one operation
+def measure(operation, duration=DURATION, repeats=REPEATS):
+    operation()
+    count = 1
+    elapsed = timed(operation, count)
+    while elapsed < duration / 10:
+        count *= 10
+        elapsed = timed(operation, count)
+    count = max(int(count * duration / elapsed), 1)
+    best = min(timed(operation, count) for _ in range(repeats))
+    tracemalloc.start()
+    try:
+        operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'ops': count / best, 'peakBytes': peak}
+
+
+# Names of the benchmarks slower, or allocating more, than their baseline by more than `tolerance`
+def find_regressions(results, baseline, tolerance):
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        if result['ops'] < reference['ops'] * (1 - tolerance) or result['peakBytes'] > reference['peakBytes'] * (1 + tolerance):
+            regressions.append(name)
+    return regressions
+
+
+def change(value, reference):
+    return '%+7.1f%%' % ((value / reference - 1) * 100) if reference else '       '
+
+
+def report(results, baseline):
+    print('%-34s %14s %8s %12s %8s' % ('benchmark', 'ops/s', 'vs base', 'peak KiB', 'vs base'))
+    for name, result in results.items():
+        reference = baseline.get(name, {})
+        print('%-34s %14.0f %8s %12.1f %8s' % (
+            name, result['ops'], change(result['ops'], reference.get('ops')),
+            result['peakBytes'] / 1024, change(result['peakBytes'], reference.get('peakBytes'))))
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Offline benchmarks of the hot paths of the client')
+    parser.add_argument('filters', nargs='*', help='only run the benchmarks whose name contains one of these')
+    parser.add_argument('--save', action='store_true', help='store the results as the baseline')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--tolerance', type=float, default=0.2, help='relative regression tolerated, 0.2 by default')
+    args = parser.parse_args(argv)
+
+    benchmarks = make_benchmarks(make_exchange())
+    results = {
+        name: measure(operation) for name, operation in benchmarks.items()
+        if not args.filters or any(text in name for text in args.filters)
+    }
+    baseline = load_baseline(args.baseline)
+    report(results, baseline)
+    if args.save:
+        with open(args.baseline, 'w') as f:
+            json.dump(dict(baseline, **results), f, indent=2, sort_keys=True)
+            f.write('\n')
+        print('Baseline saved to %s' % args.baseline)
+        return 0
+    regressions = find_regressions(results, baseline, args.tolerance)
+    if regressions:
+        print('Regressed by more than %d%%: %s' % (args.tolerance * 100, ', '.join(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,8 +1,25 @@
-import sys
-import os
-# So that this module can self add itself, when used by a file outside of the module
-sys.path.append(os.path.dirname(os.path.realpath(__file__)))
-from bullish import bullish
-from abstract.bullish import ImplicitAPI
-
-__all__ = ["bullish", "ImplicitAPI"]
\ No newline at end of file
+import importlib
+
+# The client is imported eagerly, as importing the `bullish` submodule would otherwise shadow it. The other public
+# names are imported on first access
+from .bullish import bullish
+
+LAZY_EXPORTS = {
+    'ImplicitAPI': '.abstract.bullish',
+    'OrderTracker': '.order_tracker',
+    'ArrayOrderBook': '.array_order_book',
+}
+
+
+def __getattr__(name):
+    if name not in LAZY_EXPORTS:
+        raise AttributeError('module %r has no attribute %r' % (__name__, name))
+    value = globals()[name] = getattr(importlib.import_module(LAZY_EXPORTS[name], __name__), name)
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(LAZY_EXPORTS))
+
+
+__all__ = ["bullish", "ImplicitAPI", "OrderTracker", "ArrayOrderBook"]
@@ -0,0 +1,810 @@
+import argparse
+import base64
+import bisect
+import collections
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+from .rate_limiter import TokenBucket
+from .signer import Signer
+
+BASE_PATH = re.compile(r'^/trading-api/v[12]/')
+PAGE_SIZES = (5, 25, 50, 100)
+DEFAULT_PAGE_SIZE = 25
+PUBLIC_TRADE_COUNT = 100
+TIME_BUCKETS = {'1m': 60, '5m': 300, '30m': 1800, '1h': 3600, '6h': 21600, '12h': 43200, '1d': 86400}
+
+# Endpoints of abstract/bullish.py's ImplicitAPI, as (method, path) → (handler, login required)
+ROUTES = {
+    ('GET', 'markets'): ('get_markets', False),
+    ('GET', 'markets/{symbol}/trades'): ('get_market_trades', False),
+    ('GET', 'markets/{symbol}/candle'): ('get_candles', False),
+    ('GET', 'markets/{symbol}/tick'): ('get_ticker', False),
+    ('GET', 'assets'): ('get_assets', False),
+    ('GET', 'markets/{symbol}/orderbook/hybrid'): ('get_order_book', False),
+    ('GET', 'nonce'): ('get_nonce', False),
+    ('GET', 'users/hmac/login'): ('login', False),
+    ('GET', 'time'): ('get_time', False),
+    ('GET', 'accounts/trading-accounts'): ('get_trading_accounts', True),
+    ('GET', 'orders'): ('get_orders', True),
+    ('GET', 'derivatives-positions'): ('get_positions', True),
+    ('GET', 'orders/{id}'): ('get_order', True),
+    ('POST', 'orders'): ('create_order', True),
+    ('GET', 'trades'): ('get_trades', True),
+    ('GET', 'accounts/asset'): ('get_balances', True),
+    ('GET', 'wallets/transactions'): ('get_wallet_transactions', True),
+    ('GET', 'amm-instructions'): ('get_amm_instructions', True),
+    ('GET', 'amm-instructions/{instructionid}'): ('get_amm_instruction', True),
+}
+ROUTE_PATTERNS = [
+    (method, path, re.compile('^' + re.sub(r'\{(\w+)\}', r'(?P<\1>[^/]+)', path) + '$'), handler, private)
+    for (method, path), (handler, private) in ROUTES.items()
+]
+
+
+def make_market(symbol, base, quote, perpetual=False, market_id=None):
+    return {
+        'marketId': market_id, 'symbol': symbol, 'baseSymbol': base, 'quoteSymbol': quote,
+        'marketType': 'PERPETUAL' if perpetual else 'SPOT', 'marketEnabled': True,
+        'spotTradingEnabled': not perpetual, 'marginTradingEnabled': True,
+        'pricePrecision': 4, 'quantityPrecision': 8, 'costPrecision': 4,
+        'minPriceLimit': '0.0001', 'maxPriceLimit': None,
+        'minQuantityLimit': '0.00001', 'maxQuantityLimit': '1000.00000000',
+        'minCostLimit': '1.0000', 'maxCostLimit': None,
+        'takerFee': '0.00100000', 'makerFee': '0.00000000',
+    }
+
+
+DEFAULT_MARKETS = [
+    make_market('BTCUSDC', 'BTC', 'USDC', market_id='10000'),
+    make_market('ETHUSDC', 'ETH', 'USDC', market_id='10001'),
+    make_market('BTC-USDC-PERP', 'BTC', 'USDC', perpetual=True, market_id='20000'),
+]
+DEFAULT_PRICES = {'BTCUSDC': '63000', 'ETHUSDC': '3000', 'BTC-USDC-PERP': '63000'}
+DEFAULT_BALANCES = {'USDC': '1000000', 'BTC': '100', 'ETH': '1000'}
+
+
+# Error answered to a request, with the errorCode the client maps to its exceptions
+class SimulatedError(Exception):
+
+    def __init__(self, code, message=None, status=400):
+        super(SimulatedError, self).__init__(message or code)
+        self.code = code
+        self.status = status
+
+    def body(self):
+        return {'errorCode': self.code, 'errorCodeName': self.code, 'message': str(self)}
+
+
+# Resting orders of one market, best first on each side. The synthetic liquidity seeded around the reference
+# price stands for the rest of the market: fills take it like any resting order, so orders larger than the
+# depth are only partly filled, and replenish() restores the seeded levels
+class OrderBook:
+
+    def __init__(self, market, price, depth, level_quantity):
+        self.market = market
+        self.tick = Decimal(1).scaleb(-market['pricePrecision'])
+        self.step = Decimal(1).scaleb(-market['quantityPrecision'])
+        self.reference = Decimal(price)
+        self.sides = {'BUY': ([], []), 'SELL': ([], [])}
+        self.sequence = itertools.count()
+        # Synthetic entries by (side, price)
+        self.synthetic = {}
+        spread = max((self.reference * Decimal('0.0001')).quantize(self.tick), self.tick)
+        for level in range(depth):
+            quantity = Decimal(level_quantity) * (1 + level % 5)
+            self.add('BUY', self.reference - spread * (level + 1), quantity)
+            self.add('SELL', self.reference + spread * (level + 1), quantity)
+        self.replenished_at = milliseconds()
+
+    # Adds a resting entry: [price, remaining, account order or None for synthetic liquidity, synthetic size]
+    def add(self, side, price, quantity, order=None):
+        keys, entries = self.sides[side]
+        key = (-price if side == 'BUY' else price, next(self.sequence))
+        index = bisect.bisect(keys, key)
+        entry = [price, quantity, order, None if order is not None else quantity]
+        keys.insert(index, key)
+        entries.insert(index, entry)
+        if order is None:
+            self.synthetic[(side, price)] = entry
+        return entry
+
+    def remove(self, side, entry):
+        keys, entries = self.sides[side]
+        index = next(i for i, candidate in enumerate(entries) if candidate is entry)
+        del keys[index]
+        del entries[index]
+
+    # Fills of a taker order as (entry, quantity, price), best prices first, without changing the book
+    def quote(self, side, price, quantity):
+        fills = []
+        for entry in self.sides['SELL' if side == 'BUY' else 'BUY'][1]:
+            if quantity <= 0 or (price is not None and (entry[0] > price if side == 'BUY' else entry[0] < price)):
+                break
+            filled = min(quantity, entry[1])
+            fills.append((entry, filled, entry[0]))
+            quantity -= filled
+        return fills
+
+    def execute(self, side, fills):
+        maker_side = 'SELL' if side == 'BUY' else 'BUY'
+        for entry, quantity, price in fills:
+            entry[1] -= quantity
+            if entry[1] <= 0:
+                self.remove(maker_side, entry)
+
+    # Tops the synthetic levels back up to their seeded size
+    def replenish(self):
+        for (side, price), entry in list(self.synthetic.items()):
+            if entry[1] <= 0:
+                self.add(side, price, entry[3])
+            else:
+                entry[1] = entry[3]
+        self.replenished_at = milliseconds()
+
+    def best(self, side):
+        entries = self.sides[side][1]
+        return (entries[0][0], entries[0][1]) if entries else (None, None)
+
+    def levels(self, side, depth):
+        levels = []
+        for price, quantity, order, size in self.sides[side][1]:
+            if levels and levels[-1][0] == price:
+                levels[-1][1] += quantity
+            elif len(levels) == depth:
+                break
+            else:
+                levels.append([price, quantity])
+        return levels
+
+
+# Local stand-in for the Bullish REST API, for load and latency tests without network access. It serves the
+# endpoints of ImplicitAPI for one trading account:
+#   - HMAC login, checking the signature of the login request, and JWTs expiring after `token_ttl` ms
+#   - signed order creation, matched against the order books of the markets (price-time priority, LIMIT and
+#     MARKET orders, GTC / IOC / FOK), updating balances, trades and derivatives positions. The `depth` levels of
+#     synthetic liquidity seeded on each side are used up by fills, and restored every `replenish_interval` ms
+#     (never when None)
+#   - _nextPage / _previousPage cursor pagination of orders, trades and wallet transactions
+#   - order books, tickers and public trades from the matching engine, and deterministic synthetic candles
+# Faults can be injected at any time through attributes:
+#   - `latency`: milliseconds added to every response, or a function returning them (e.g. for tail latencies)
+#   - `error_rate` and `error_code`: share of requests failing with that code, drawn from `seed`
+#   - fail(): errors answered to the next requests
+#   - `rate_limits`: token buckets per budget ('public', 'private'), as options['rateLimits'] of the client.
+#     Requests over budget are answered with a 429. Every response reports the budget left
+# Clients point at it through the 'LOCAL' environment, see configure()
+class ApiSimulator:
+
+    def __init__(self, api_key='key', secret='secret', account_id='111000000000001', markets=None, prices=None,
+                 balances=None, depth=20, level_quantity='1', latency=0, error_rate=0, error_code='EXCHANGE_OFFLINE',
+                 rate_limits=None, token_ttl=60 * 60 * 1000, seed=None, replenish_interval=1000, host='127.0.0.1',
+                 port=0):
+        self.api_key = api_key
+        self.account_id = account_id
+        self.signer = Signer(secret)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.rate_limits = rate_limits
+        self.token_ttl = token_ttl
+        self.replenish_interval = replenish_interval
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.markets = {market['symbol']: market for market in (markets or DEFAULT_MARKETS)}
+        prices = prices or DEFAULT_PRICES
+        self.books = {
+            symbol: OrderBook(market, prices[symbol], depth, level_quantity) for symbol, market in self.markets.items()
+        }
+        self.assets = self._make_assets()
+        self.balances = {
+            asset: {'available': Decimal(quantity), 'locked': Decimal(0)}
+            for asset, quantity in (balances or DEFAULT_BALANCES).items()
+        }
+        self.orders = []
+        self.orders_by_id = {}
+        self.trades = []
+        self.public_trades = {symbol: collections.deque(maxlen=PUBLIC_TRADE_COUNT) for symbol in self.markets}
+        self.positions = {}
+        self.tokens = {}
+        self.last_client_order_id = 0
+        self.ids = itertools.count(int(time.time() * 1000) * 1000)
+        self.injected = collections.deque()
+        self.buckets = {}
+        # Requests served, by (method, path) of the endpoint
+        self.requests = collections.Counter()
+        handler = type('RequestHandler', (RequestHandler,), {'simulator': self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return 'http://%s:%d' % (host, port)
+
+    # Base URLs of the APIs, for exchange.urls['local']
+    @property
+    def urls(self):
+        return {
+            'public': self.url + '/trading-api/v1',
+            'publicV2': self.url + '/trading-api/v2',
+            'private': self.url + '/trading-api/v1',
+            'privateV2': self.url + '/trading-api/v2',
+        }
+
+    # Points `exchange` at the simulator, with its credentials
+    def configure(self, exchange):
+        exchange.urls['local'] = self.urls
+        exchange.environment = 'LOCAL'
+        exchange.apiKey = self.api_key
+        exchange.secret = self.signer.secret
+        exchange.account_id = self.account_id
+        return exchange
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    # Answers the next `count` requests (to `path` only, if set) with an error
+    def fail(self, code, status=400, count=1, path=None):
+        with self.lock:
+            for _ in range(count):
+                self.injected.append((path, SimulatedError(code, 'Injected error', status)))
+
+    ## Request handling
+
+    # Returns (status, headers, body) for a request. Latency is added outside the lock, so that slow
+    # responses do not hold other requests back
+    def handle(self, method, url, headers, body):
+        delay = self.latency() if callable(self.latency) else self.latency
+        if delay:
+            time.sleep(delay / 1000)
+        parsed = urlparse(url)
+        params = dict(parse_qsl(parsed.query))
+        budget = 'private' if headers.get('Authorization') else 'public'
+        with self.lock:
+            allowed, limit_headers = self._take_budget(budget)
+            if not allowed:
+                return 429, limit_headers, {'message': 'Too many requests'}
+            try:
+                handler, path_params, private, endpoint = self._route(method, parsed.path)
+                self.requests[endpoint] += 1
+                self._raise_injected(parsed.path)
+                if private:
+                    self._check_token(headers)
+                result = getattr(self, handler)(dict(params, **path_params), headers, body, parsed.path)
+                return 200, limit_headers, result
+            except SimulatedError as e:
+                return e.status, limit_headers, e.body()
+
+    def _route(self, method, path):
+        match = BASE_PATH.match(path)
+        if match is None:
+            raise SimulatedError('NOT_FOUND', 'Unknown path ' + path, 404)
+        relative = path[match.end():]
+        for route_method, route_path, pattern, handler, private in ROUTE_PATTERNS:
+            route = pattern.match(relative)
+            if route is not None and route_method == method:
+                return handler, route.groupdict(), private, (method, route_path)
+        raise SimulatedError('NOT_FOUND', 'Unknown endpoint %s %s' % (method, path), 404)
+
+    def _raise_injected(self, path):
+        for index, (injected_path, error) in enumerate(self.injected):
+            if injected_path is None or injected_path in path:
+                del self.injected[index]
+                raise error
+        if self.error_rate and self.random.random() < self.error_rate:
+            raise SimulatedError(self.error_code, 'Simulated error', 503 if self.error_code == 'EXCHANGE_OFFLINE' else 400)
+
+    def _take_budget(self, budget):
+        if not self.rate_limits or budget not in self.rate_limits:
+            return True, {}
+        bucket = self.buckets.get(budget)
+        if bucket is None:
+            limit = self.rate_limits[budget]
+            bucket = self.buckets[budget] = TokenBucket(limit['capacity'], limit['refillRate'])
+        delay = bucket.try_take(1)
+        if delay > 0:
+            return False, {'x-ratelimit-remaining': '0', 'x-ratelimit-reset': '%.3f' % delay, 'retry-after': '%.3f' % delay}
+        return True, {'x-ratelimit-remaining': str(int(bucket.tokens)), 'x-ratelimit-reset': '%.3f' % (1 / bucket.refill_rate)}
+
+    def _check_token(self, headers):
+        authorization = headers.get('Authorization') or ''
+        expires_at = self.tokens.get(authorization[len('Bearer '):])
+        if expires_at is None or expires_at <= milliseconds():
+            raise SimulatedError('CLIENT_NOT_LOGGED_IN', 'Client not logged in', 401)
+
+    def _check_account(self, params):
+        account_id = params.get('tradingAccountId')
+        if account_id is not None and account_id != self.account_id:
+            raise SimulatedError('UNKNOWN_ACCOUNT', 'Unknown trading account ' + account_id)
+
+    def _get_book(self, symbol):
+        if symbol not in self.books:
+            raise SimulatedError('MARKET_NOT_SUPPORTED', 'Market not supported: %s' % symbol)
+        return self.books[symbol]
+
+    ## Public endpoints
+
+    def get_markets(self, params, headers, body, path):
+        return list(self.markets.values())
+
+    def get_assets(self, params, headers, body, path):
+        return self.assets
+
+    def get_nonce(self, params, headers, body, path):
+        now = milliseconds()
+        return {'lowerBound': now * 1000, 'upperBound': (now + 24 * 60 * 60 * 1000) * 1000}
+
+    def get_time(self, params, headers, body, path):
+        now = milliseconds()
+        return {'timestamp': now, 'datetime': iso8601(now)}
+
+    def get_order_book(self, params, headers, body, path):
+        book = self._get_book(params['symbol'])
+        depth = int(params.get('depth', 100))
+        now = milliseconds()
+        return {
+            'bids': [self._level(book, price, quantity) for price, quantity in book.levels('BUY', depth)],
+            'asks': [self._level(book, price, quantity) for price, quantity in book.levels('SELL', depth)],
+            'datetime': iso8601(now),
+            'timestamp': str(now),
+            'sequenceNumber': next(book.sequence),
+        }
+
+    def _level(self, book, price, quantity):
+        return {'price': self._price(book, price), 'priceLevelQuantity': self._quantity(book, quantity)}
+
+    def get_ticker(self, params, headers, body, path):
+        book = self._get_book(params['symbol'])
+        trades = self.public_trades[params['symbol']]
+        bid, bid_quantity = book.best('BUY')
+        ask, ask_quantity = book.best('SELL')
+        last = Decimal(trades[-1]['price']) if trades else book.reference
+        base_volume = sum((Decimal(trade['quantity']) for trade in trades), Decimal(0))
+        quote_volume = sum((Decimal(trade['quantity']) * Decimal(trade['price']) for trade in trades), Decimal(0))
+        now = milliseconds()
+        return {
+            'createdAtDatetime': iso8601(now), 'createdAtTimestamp': str(now),
+            'high': self._price(book, max(last, book.reference)), 'low': self._price(book, min(last, book.reference)),
+            'bestBid': self._price(book, bid), 'bidVolume': self._quantity(book, bid_quantity),
+            'bestAsk': self._price(book, ask), 'askVolume': self._quantity(book, ask_quantity),
+            'vwap': self._price(book, quote_volume / base_volume if base_volume else last),
+            'open': self._price(book, book.reference), 'close': self._price(book, last), 'last': self._price(book, last),
+            'change': self._price(book, last - book.reference),
+            'percentage': '%.2f' % ((last / book.reference - 1) * 100),
+            'average': self._price(book, (last + book.reference) / 2),
+            'baseVolume': self._quantity(book, base_volume), 'quoteVolume': self._price(book, quote_volume),
+        }
+
+    def get_market_trades(self, params, headers, body, path):
+        self._get_book(params['symbol'])
+        return list(reversed(self.public_trades[params['symbol']]))
+
+    # Candles of the buckets started in [createdAtDatetime[gte], createdAtDatetime[lte]] and before now, oldest first.
+    # They are drawn around the reference price from a generator seeded by the symbol and bucket, so that the same
+    # candle is returned every time
+    def get_candles(self, params, headers, body, path):
+        book = self._get_book(params['symbol'])
+        if params.get('timeBucket') not in TIME_BUCKETS or 'createdAtDatetime[gte]' not in params or 'createdAtDatetime[lte]' not in params:
+            raise SimulatedError('INVALID_CANDLE_REQUEST', 'timeBucket, createdAtDatetime[gte] and createdAtDatetime[lte] are required')
+        step = TIME_BUCKETS[params['timeBucket']] * 1000
+        since = parse8601(params['createdAtDatetime[gte]'])
+        until = min(parse8601(params['createdAtDatetime[lte]']), milliseconds())
+        candles = []
+        for start in range(-(-since // step) * step, until + 1, step):
+            generator = random.Random('%s:%s:%d' % (params['symbol'], params['timeBucket'], start))
+            open_price, close = (book.reference * Decimal(1 + generator.uniform(-0.01, 0.01)) for _ in range(2))
+            candles.append({
+                'open': self._price(book, open_price),
+                'high': self._price(book, max(open_price, close) * Decimal(1 + generator.uniform(0, 0.002))),
+                'low': self._price(book, min(open_price, close) * Decimal(1 - generator.uniform(0, 0.002))),
+                'close': self._price(book, close),
+                'volume': self._quantity(book, Decimal(generator.uniform(0.1, 10))),
+                'createdAtTimestamp': str(start),
+                'createdAtDatetime': iso8601(start),
+            })
+        return candles
+
+    def login(self, params, headers, body, path):
+        signature = self.signer.sign_login(headers.get('BX-TIMESTAMP', ''), headers.get('BX-NONCE', ''), path)
+        if headers.get('BX-PUBLIC-KEY') != self.api_key or headers.get('BX-SIGNATURE') != signature:
+            raise SimulatedError('EosUserNotExistsException', 'Invalid API key or signature', 401)
+        expires_at = milliseconds() + self.token_ttl
+        token = make_token({'sub': self.api_key, 'exp': expires_at // 1000, 'jti': next(self.ids)})
+        self.tokens[token] = expires_at
+        return {'authorizer': self.api_key, 'ownerAuthorizer': self.api_key, 'token': token}
+
+    ## Private endpoints
+
+    def get_trading_accounts(self, params, headers, body, path):
+        return [{
+            'tradingAccountId': self.account_id, 'tradingAccountName': 'Simulated account',
+            'tradingAccountDescription': 'Local API simulator', 'isBorrowing': 'false', 'isLending': 'false',
+            'isPrimaryAccount': 'true', 'rateLimitToken': 'simulated-' + self.account_id,
+        }]
+
+    def get_balances(self, params, headers, body, path):
+        self._check_account(params)
+        now = milliseconds()
+        return [{
+            'tradingAccountId': self.account_id, 'assetId': self._asset_id(asset), 'assetSymbol': asset,
+            'availableQuantity': format_quantity(balance['available']), 'borrowedQuantity': '0.00000000',
+            'lockedQuantity': format_quantity(balance['locked']), 'loanedQuantity': '0.00000000', 'updatedAtDatetime': iso8601(now), 'updatedAtTimestamp': str(now),
+        } for asset, balance in sorted(self.balances.items())]
+
+    def get_positions(self, params, headers, body, path):
+        self._check_account(params)
+        positions = [position for symbol, position in sorted(self.positions.items()) if position['quantity'] != 0]
+        if 'symbol' in params:
+            positions = [position for position in positions if position['symbol'] == params['symbol']]
+        return [self._format_position(position) for position in positions]
+
+    def get_orders(self, params, headers, body, path):
+        self._check_account(params)
+        orders = self.orders
+        if 'status' in params:
+            orders = [order for order in orders if order['status'] == params['status']]
+        return self._paginate(orders, 'orderId', params, path)
+
+    def get_order(self, params, headers, body, path):
+        self._check_account(params)
+        order = self.orders_by_id.get(params['id'])
+        if order is None:
+            raise SimulatedError('UNKNOWN_ORDER', 'Unknown order ' + params['id'], 404)
+        return order
+
+    def get_trades(self, params, headers, body, path):
+        self._check_account(params)
+        return self._paginate(self.trades, 'tradeId', params, path)
+
+    def get_wallet_transactions(self, params, headers, body, path):
+        return self._paginate([], 'custodyTransactionId', params, path)
+
+    def get_amm_instructions(self, params, headers, body, path):
+        self._check_account(params)
+        return []
+
+    def get_amm_instruction(self, params, headers, body, path):
+        raise SimulatedError('UNKNOWN_ORDER', 'Unknown AMM instruction ' + params['instructionid'], 404)
+
+    # Items newest first, filtered by symbol and createdAtTimestamp, in pages of _pageSize items. Cursors are the
+    # id of the last item of a page (next) or of the first one (previous), so that new items do not shift pages
+    def _paginate(self, items, id_key, params, path):
+        page_size = int(params.get('_pageSize', DEFAULT_PAGE_SIZE))
+        if page_size not in PAGE_SIZES:
+            raise SimulatedError('INVALID_PAGE_SIZE', '_pageSize must be one of %s' % (PAGE_SIZES,))
+        since = int(params.get('createdAtTimestamp[gte]', 0))
+        until = int(params.get('createdAtTimestamp[lte]', 1 << 62))
+        selected = [
+            item for item in reversed(items)
+            if ('symbol' not in params or item.get('symbol') == params['symbol'])
+            and since <= int(item['createdAtTimestamp']) <= until
+        ]
+        if '_nextPage' in params:
+            cursor = int(params['_nextPage'])
+            page = [item for item in selected if int(item[id_key]) < cursor][:page_size]
+        elif '_previousPage' in params:
+            cursor = int(params['_previousPage'])
+            page = [item for item in selected if int(item[id_key]) > cursor][-page_size:]
+        else:
+            page = selected[:page_size]
+        if params.get('_metaData') != 'true':
+            return page
+        query = {key: value for key, value in params.items() if key not in ('_nextPage', '_previousPage')}
+        has_next = bool(page) and int(page[-1][id_key]) > int(selected[-1][id_key])
+        has_previous = bool(page) and int(page[0][id_key]) < int(selected[0][id_key])
+        return {
+            'data': page,
+            'links': {
+                'next': path + '?' + urlencode(dict(query, _nextPage=page[-1][id_key])) if has_next else None,
+                'previous': path + '?' + urlencode(dict(query, _previousPage=page[0][id_key])) if has_previous else None,
+            },
+        }
+
+    ## Matching engine
+
+    def create_order(self, params, headers, body, path):
+        self._check_signature(headers, body, path)
+        command = json.loads(body or '{}')
+        if command.get('tradingAccountId') != self.account_id:
+            raise SimulatedError('ACCOUNT_MISMATCH', 'Unknown trading account %s' % command.get('tradingAccountId'))
+        book = self._get_book(command.get('symbol'))
+        side, order_type, time_in_force, quantity, price = self._parse_command(book, command)
+        client_order_id = int(command.get('clientOrderId') or 0)
+        if client_order_id <= self.last_client_order_id:
+            raise SimulatedError('STRICTLY_INCREASING_ORDER_ID', 'clientOrderId must be greater than %d' % self.last_client_order_id)
+        if self.replenish_interval is not None and milliseconds() - book.replenished_at >= self.replenish_interval:
+            book.replenish()
+        fills = book.quote(side, price, quantity)
+        filled = sum((fill[1] for fill in fills), Decimal(0))
+        if time_in_force == 'FOK' and filled < quantity:
+            raise SimulatedError('QUANTITY_REMAINING__FOK_LIMIT_ORDER', 'Not enough liquidity to fill the order')
+        resting = quantity - filled if order_type == 'LIMIT' and time_in_force == 'GTC' else Decimal(0)
+        self._reserve_funds(book, side, fills, resting, price)
+        self.last_client_order_id = client_order_id
+        order = self._add_order(book, command, side, order_type, time_in_force, quantity, price)
+        book.execute(side, fills)
+        for entry, fill_quantity, fill_price in fills:
+            self._fill(book, order, side, fill_quantity, fill_price, True)
+            if entry[2] is not None:
+                self._fill(book, entry[2], entry[2]['side'], fill_quantity, fill_price, False)
+            self._add_public_trade(book, side, fill_quantity, fill_price)
+        if resting > 0:
+            book.add(side, price, resting, order)
+        elif order['status'] == 'OPEN':
+            order['status'] = 'CLOSED' if filled == quantity else 'CANCELLED'
+            order['statusReason'] = 'Executed' if filled == quantity else 'Not fully filled, remaining quantity cancelled'
+        return {'message': 'Command acknowledged - CreateOrder', 'requestId': order['orderId'],
+                'orderId': order['orderId'], 'clientOrderId': order['clientOrderId']}
+
+    def _check_signature(self, headers, body, path):
+        expected = self.signer.sign_post(headers.get('BX-TIMESTAMP', ''), headers.get('BX-NONCE', ''), path, body or '')
+        if headers.get('BX-SIGNATURE') != expected:
+            raise SimulatedError('INVALID_SIGNATURE', 'Invalid request signature', 401)
+
+    def _parse_command(self, book, command):
+        side = command.get('side')
+        order_type = {'LMT': 'LIMIT', 'MKT': 'MARKET'}.get(command.get('type'), command.get('type'))
+        time_in_force = command.get('timeInForce') or 'GTC'
+        if side not in ('BUY', 'SELL') or order_type not in ('LIMIT', 'MARKET') or time_in_force not in ('GTC', 'IOC', 'FOK'):
+            raise SimulatedError('MALFORMED_ORDER', 'Unsupported side, type or timeInForce')
+        quantity = parse_decimal(command.get('quantity'))
+        if quantity is None or quantity <= 0:
+            raise SimulatedError('QUANTITY_MUST_BE_POSITIVE', 'Quantity must be positive')
+        if quantity % book.step != 0:
+            raise SimulatedError('BAD_PRICE_OR_QUANTITY', 'Quantity must be a multiple of %s' % book.step)
+        self._check_range(book.market, 'QuantityLimit', quantity)
+        price = None
+        if order_type == 'LIMIT':
+            price = parse_decimal(command.get('price'))
+            if price is None or price <= 0:
+                raise SimulatedError('PRICE_MUST_BE_POSITIVE', 'Price must be positive')
+            if price % book.tick != 0:
+                raise SimulatedError('PRICE_MUST_BE_OF_TICK_SIZE', 'Price must be a multiple of %s' % book.tick)
+            self._check_range(book.market, 'CostLimit', price * quantity)
+        return side, order_type, time_in_force, quantity, price
+
+    def _check_range(self, market, limit, value):
+        minimum = parse_decimal(market.get('min' + limit))
+        maximum = parse_decimal(market.get('max' + limit))
+        if (minimum is not None and value < minimum) or (maximum is not None and value > maximum):
+            raise SimulatedError('ORDER_SIZE_OUTSIDE_VALID_RANGE', '%s is outside [%s, %s]' % (value, minimum, maximum))
+
+    # Spot orders need the quote (buys) or base (sells) of their fills and resting quantity. Perpetuals are not margined
+    def _reserve_funds(self, book, side, fills, resting, price):
+        if book.market['marketType'] != 'SPOT':
+            return
+        if side == 'BUY':
+            asset, code = book.market['quoteSymbol'], 'NOT_ENOUGH_FUNDS__BUY_LIMIT_ORDER'
+            needed = sum((quantity * fill_price for entry, quantity, fill_price in fills), Decimal(0)) + resting * (price or 0)
+        else:
+            asset, code = book.market['baseSymbol'], 'NOT_ENOUGH_FUNDS__SELL_LIMIT_ORDER'
+            needed = sum((fill[1] for fill in fills), Decimal(0)) + resting
+        balance = self._balance(asset)
+        if needed > balance['available']:
+            raise SimulatedError(code, '%s %s needed, %s available' % (needed, asset, balance['available']))
+        if resting > 0:
+            locked = resting * price if side == 'BUY' else resting
+            balance['available'] -= locked
+            balance['locked'] += locked
+
+    def _add_order(self, book, command, side, order_type, time_in_force, quantity, price):
+        now = milliseconds()
+        order = {
+            'orderId': str(next(self.ids)), 'clientOrderId': str(command.get('clientOrderId')), 'symbol': command['symbol'],
+            'price': self._price(book, price) if price is not None else None, 'avgPrice': None, 'stopPrice': None,
+            'quantity': self._quantity(book, quantity), 'quantityFilled': self._quantity(book, Decimal(0)),
+            'baseFee': self._quantity(book, Decimal(0)), 'quoteFee': self._price(book, Decimal(0)),
+            'side': side, 'type': order_type, 'timeInForce': time_in_force, 'status': 'OPEN', 'statusReason': 'Ok',
+            'createdAtDatetime': iso8601(now), 'createdAtTimestamp': str(now),
+        }
+        self.orders.append(order)
+        self.orders_by_id[order['orderId']] = order
+        return order
+
+    # Books a fill of an account order, as taker or as maker
+    def _fill(self, book, order, side, quantity, price, taker):
+        market = book.market
+        fee = quantity * price * Decimal(market['takerFee' if taker else 'makerFee'])
+        filled = Decimal(order['quantityFilled'])
+        average = Decimal(order['avgPrice'] or 0)
+        order['avgPrice'] = self._price(book, (average * filled + price * quantity) / (filled + quantity))
+        order['quantityFilled'] = self._quantity(book, filled + quantity)
+        order['quoteFee'] = self._price(book, Decimal(order['quoteFee']) + fee)
+        if order['quantityFilled'] == order['quantity']:
+            order['status'], order['statusReason'] = 'CLOSED', 'Executed'
+        self._balance(market['quoteSymbol'])['available'] -= fee
+        if market['marketType'] == 'SPOT':
+            self._settle_spot(market, order, side, quantity, price, taker)
+        else:
+            self._update_position(book, side, quantity, price)
+        now = milliseconds()
+        self.trades.append({
+            'tradeId': str(next(self.ids)), 'orderId': order['orderId'], 'symbol': market['symbol'],
+            'price': self._price(book, price), 'quantity': self._quantity(book, quantity), 'side': side, 'isTaker': taker,
+            'baseFee': self._quantity(book, Decimal(0)), 'quoteFee': self._price(book, fee),
+            'createdAtDatetime': iso8601(now), 'createdAtTimestamp': str(now),
+        })
+
+    def _settle_spot(self, market, order, side, quantity, price, taker):
+        base, quote = self._balance(market['baseSymbol']), self._balance(market['quoteSymbol'])
+        if side == 'BUY':
+            base['available'] += quantity
+            if taker:
+                quote['available'] -= quantity * price
+            else:
+                quote['locked'] -= quantity * price
+        else:
+            quote['available'] += quantity * price
+            if taker:
+                base['available'] -= quantity
+            else:
+                base['locked'] -= quantity
+
+    def _update_position(self, book, side, quantity, price):
+        symbol = book.market['symbol']
+        position = self.positions.setdefault(symbol, {'symbol': symbol, 'quantity': Decimal(0), 'entryNotional': Decimal(0),
+                                                      'realizedPnl': Decimal(0), 'book': book})
+        signed = quantity if side == 'BUY' else -quantity
+        current = position['quantity']
+        if current == 0 or (current > 0) == (signed > 0):
+            position['entryNotional'] += quantity * price
+        else:
+            closed = min(quantity, abs(current))
+            entry_price = position['entryNotional'] / abs(current)
+            position['realizedPnl'] += (price - entry_price) * closed * (1 if current > 0 else -1)
+            position['entryNotional'] -= entry_price * closed
+            if quantity > closed:
+                position['entryNotional'] = (quantity - closed) * price
+        position['quantity'] = current + signed
+        if position['quantity'] == 0:
+            position['entryNotional'] = Decimal(0)
+
+    def _format_position(self, position):
+        book = position['book']
+        quantity = position['quantity']
+        bid, ask = book.best('BUY')[0], book.best('SELL')[0]
+        mark = (bid + ask) / 2 if bid is not None and ask is not None else book.reference
+        notional = abs(quantity) * mark
+        pnl = (notional - position['entryNotional']) * (1 if quantity > 0 else -1)
+        updated_at = milliseconds()
+        return {
+            'tradingAccountId': self.account_id, 'symbol': position['symbol'], 'side': 'BUY' if quantity > 0 else 'SELL',
+            'quantity': self._quantity(book, abs(quantity)), 'notional': self._price(book, notional),
+            'entryNotional': self._price(book, position['entryNotional']), 'mtmPnl': self._price(book, pnl),
+            'reportedMtmPnl': self._price(book, pnl), 'reportedFundingPnl': self._price(book, Decimal(0)),
+            'realizedPnl': self._price(book, position['realizedPnl']),
+            'createdAtDatetime': iso8601(updated_at), 'createdAtTimestamp': str(updated_at),
+            'updatedAtDatetime': iso8601(updated_at), 'updatedAtTimestamp': str(updated_at),
+        }
+
+    def _add_public_trade(self, book, side, quantity, price):
+        now = milliseconds()
+        self.public_trades[book.market['symbol']].append({
+            'tradeId': str(next(self.ids)), 'symbol': book.market['symbol'], 'price': self._price(book, price),
+            'quantity': self._quantity(book, quantity), 'side': side, 'isTaker': True,
+            'createdAtDatetime': iso8601(now), 'createdAtTimestamp': str(now),
+        })
+
+    def _balance(self, asset):
+        return self.balances.setdefault(asset, {'available': Decimal(0), 'locked': Decimal(0)})
+
+    def _make_assets(self):
+        symbols = []
+        for market in self.markets.values():
+            for asset in (market['baseSymbol'], market['quoteSymbol']):
+                if asset not in symbols:
+                    symbols.append(asset)
+        return [{'assetId': str(index + 1), 'symbol': asset, 'precision': 8, 'minFee': '0.00000000'}
+                for index, asset in enumerate(symbols)]
+
+    def _asset_id(self, asset):
+        return next((item['assetId'] for item in self.assets if item['symbol'] == asset), None)
+
+    def _price(self, book, value):
+        return None if value is None else format_quantity(value, book.tick)
+
+    def _quantity(self, book, value):
+        return None if value is None else format_quantity(value, book.step)
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    # Keeps connections open, as the client's pooled sessions expect
+    protocol_version = 'HTTP/1.1'
+    simulator = None
+
+    def do_GET(self):
+        self.respond()
+
+    def do_POST(self):
+        self.respond()
+
+    def respond(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length).decode('utf-8') if length else None
+        status, headers, payload = self.simulator.handle(self.command, self.path, self.headers, body)
+        content = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_token(claims):
+    def encode(value):
+        return base64.urlsafe_b64encode(json.dumps(value, separators=(',', ':')).encode('utf-8')).rstrip(b'=').decode('ascii')
+    return encode({'alg': 'HS256', 'typ': 'JWT'}) + '.' + encode(claims) + '.' + encode('simulated')
+
+
+def format_quantity(value, step=Decimal('0.00000001')):
+    return '{:f}'.format(Decimal(value).quantize(step))
+
+
+def parse_decimal(value):
+    if value is None:
+        return None
+    try:
+        return Decimal(str(value))
+    except InvalidOperation:
+        return None
+
+
+def milliseconds():
+    return int(time.time() * 1000)
+
+
+def iso8601(timestamp):
+    return datetime.fromtimestamp(timestamp / 1000, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.') + '%03dZ' % (timestamp % 1000)
+
+
+def parse8601(value):
+    return int(datetime.strptime(value.replace('Z', '+0000'), '%Y-%m-%dT%H:%M:%S.%f%z').timestamp() * 1000)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Local stand-in for the Bullish REST API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0, help='milliseconds added to every response')
+    parser.add_argument('--error-rate', type=float, default=0, help='share of requests answered with an error')
+    parser.add_argument('--rate-limit', type=float, default=None, help='requests per second allowed per budget')
+    args = parser.parse_args(argv)
+    rate_limits = None
+    if args.rate_limit:
+        limit = {'capacity': args.rate_limit, 'refillRate': args.rate_limit}
+        rate_limits = {'public': limit, 'private': limit}
+    simulator = ApiSimulator(host=args.host, port=args.port, latency=args.latency, error_rate=args.error_rate,
+                             rate_limits=rate_limits)
+    print('Serving the Bullish API on %s (apiKey %s, secret %s, account %s)' % (
+        simulator.url, simulator.api_key, simulator.signer.secret, simulator.account_id))
+    try:
+        simulator.thread.join()
+    except KeyboardInterrupt:
+        simulator.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+from operator import itemgetter, mul
+
+
+# Parses levels of the form {'price': ..., 'priceLevelQuantity': ...} into two float arrays, in bulk
+def parse_levels(levels, price_key='price', amount_key='priceLevelQuantity'):
+    prices = array('d', map(float, map(itemgetter(price_key), levels)))
+    amounts = array('d', map(float, map(itemgetter(amount_key), levels)))
+    return prices, amounts
+
+
+# An order book held as contiguous float arrays instead of lists of [price, amount] pairs.
+# Levels are kept in the order sent by the API, best price first, so the book is never sorted again.
+# The depth queries run on cumulative sums computed once per side, with a binary search for the size
+class ArrayOrderBook:
+
+    def __init__(self, symbol, bid_prices, bid_amounts, ask_prices, ask_amounts, timestamp=None, datetime=None, nonce=None):
+        self.symbol = symbol
+        self.prices = {'bids': bid_prices, 'asks': ask_prices}
+        self.amounts = {'bids': bid_amounts, 'asks': ask_amounts}
+        self.timestamp = timestamp
+        self.datetime = datetime
+        self.nonce = nonce
+        self.cumulative_amounts = {}
+        self.cumulative_costs = {}
+
+    def best_bid(self):
+        return self.prices['bids'][0] if self.prices['bids'] else None
+
+    def best_ask(self):
+        return self.prices['asks'][0] if self.prices['asks'] else None
+
+    def spread(self):
+        if not self.prices['bids'] or not self.prices['asks']:
+            return None
+        return self.prices['asks'][0] - self.prices['bids'][0]
+
+    def mid(self):
+        if not self.prices['bids'] or not self.prices['asks']:
+            return None
+        return (self.prices['asks'][0] + self.prices['bids'][0]) / 2
+
+    # Amount available at each level and every better one
+    def cumulative_depth(self, side):
+        if side not in self.cumulative_amounts:
+            self.cumulative_amounts[side] = array('d', accumulate(self.amounts[side]))
+        return self.cumulative_amounts[side]
+
+    # Worst price reached when filling `size` against `side`, or None when the book is not deep enough
+    def price_for_size(self, side, size):
+        index = self._fill_index(side, size)
+        return self.prices[side][index] if index is not None else None
+
+    # Average price paid when filling `size` against `side`, or None when the book is not deep enough
+    def vwap(self, side, size):
+        if size <= 0:
+            return None
+        index = self._fill_index(side, size)
+        if index is None:
+            return None
+        if side not in self.cumulative_costs:
+            self.cumulative_costs[side] = array('d', accumulate(map(mul, self.prices[side], self.amounts[side])))
+        depth = self.cumulative_depth(side)
+        filled = depth[index - 1] if index > 0 else 0.0
+        cost = self.cumulative_costs[side][index - 1] if index > 0 else 0.0
+        return (cost + (size - filled) * self.prices[side][index]) / size
+
+    # Same shape as the order books returned by fetch_order_book
+    def to_dict(self, limit=None):
+        return {
+            'symbol': self.symbol,
+            'bids': [[price, amount] for price, amount in zip(self.prices['bids'][:limit], self.amounts['bids'][:limit])],
+            'asks': [[price, amount] for price, amount in zip(self.prices['asks'][:limit], self.amounts['asks'][:limit])],
+            'timestamp': self.timestamp,
+            'datetime': self.datetime,
+            'nonce': self.nonce,
+        }
+
+    def _fill_index(self, side, size):
+        depth = self.cumulative_depth(side)
+        index = bisect_left(depth, size)
+        return index if index < len(depth) else None
@@ -0,0 +1,3 @@
+from .bullish import bullish
+
+__all__ = ["bullish"]
@@ -0,0 +1,459 @@
+import asyncio
+import logging
+
+from ccxt.base.errors import BadRequest, AuthenticationError
+from ccxt.base.types import Num, OrderSide, OrderType, OrderRequest, Str, Int, List
+from ccxt.async_support.base.exchange import Exchange
+from ..bullish import bullish as bullish_sync, MAX_PAGE_SIZE, CREATE_ORDER_PATH
+from ..session_manager import AsyncSessionManager
+from ..rate_limiter import AsyncThrottle
+
+
+# Request building, signing, error handling and response parsing are inherited from the
+# synchronous client. Only the methods performing I/O are redefined here as coroutines.
+# Exchange has to come first so its async transport (fetch, fetch2, load_markets) wins in the MRO.
+class bullish(Exchange, bullish_sync):
+
+    def __init__(self, config={}):
+        super(bullish, self).__init__(config)
+        self.session_manager = AsyncSessionManager(self)
+        # Created on first use, in the running loop
+        self.metadata_reload_lock = None
+
+    # Replaces ccxt's Throttler, so that requests draw from the buckets of the rate limiter shared with the sync client
+    def init_rest_rate_limiter(self):
+        self.throttle = AsyncThrottle(self)
+
+    async def close(self):
+        for refresh in self.metadata_refreshes.values():
+            refresh.cancel()
+        self.session_manager.close()
+        self.close_streams()
+        self.nonce_generator.close()
+        await super(bullish, self).close()
+
+    ##### public APIs ######
+
+    async def load_market_symbol_mappings(self):
+        if self.symbols_bullish_to_unified is not None and self.symbols_unified_to_bullish is not None:
+            return
+        self._build_market_symbol_mappings(await self._fetch_metadata('markets', self.publicGetMarkets))
+
+    async def fetch_currencies(self, params={}):
+        if self.safe_bool(params, 'reload') != True and self.cached_currencies is not None:
+            return self.cached_currencies
+        response = await self._fetch_metadata('assets', self.publicGetAssets, params)
+        list_of_currencies = list(map(self.parse_currency, response))
+        self.cached_currencies = {currency['code']: currency for currency in list_of_currencies}
+        return self.cached_currencies
+
+    async def fetch_markets(self, params={}):
+        response = await self._fetch_metadata('markets', self.publicGetMarkets, params)
+        self._build_market_symbol_mappings(response)
+        return list(map(self.parse_market, response))
+
+    # Stale entries are refreshed by a task of the running loop
+    async def _fetch_metadata(self, name, method, params={}):
+        cache, key = self._get_metadata_cache(name)
+        if cache is None or self.omit(params, ['reload']):
+            return await method(params)
+        cached = None if self.safe_bool(params, 'reload') else cache.load(key)
+        if cached is None:
+            payload = await method(self.omit(params, ['reload']))
+            cache.store(key, payload)
+            return payload
+        payload, stale = cached
+        refresh = self.metadata_refreshes.get(key)
+        if stale and (refresh is None or refresh.done()):
+            self.metadata_refreshes[key] = asyncio.ensure_future(self._refresh_metadata(cache, key, method))
+        return payload
+
+    async def _refresh_metadata(self, cache, key, method):
+        try:
+            if cache.store(key, await method()):
+                if self.metadata_reload_lock is None:
+                    self.metadata_reload_lock = asyncio.Lock()
+                # load_markets(True) would join the load still flagged as reloading, which served the stale entry,
+                # so the markets are reloaded here directly
+                async with self.metadata_reload_lock:
+                    self.cached_currencies = None
+                    await self.load_markets_helper(True)
+        except Exception as e:
+            self.log("Refreshing the cached %s failed: %s" % (key, e), logging.WARN)
+
+    async def fetch_trades(self, symbol: str, since: Int = None, limit: Int = None, params={}):
+        if since is not None:
+            raise BadRequest("[fetch_trades] The `since` parameter is not supported for this exchange")
+        if limit is not None:
+            raise BadRequest("[fetch_trades] The `limit` parameter is not supported for this exchange")
+        await self.load_market_symbol_mappings()
+        columns, params = self._parse_format_params(params)
+        response = await self.publicGetMarketTradesBySymbol(self.extend({
+            'symbol': self.to_bullish_symbol(symbol)
+        }, params))
+        if columns:
+            from ..columns import trade_columns
+            return trade_columns(response, self.to_unified_symbol)
+        return self.parse_trades_fast(response)
+
+    async def fetch_ticker(self, symbol: str, params={}):
+        await self.load_market_symbol_mappings()
+        response = await self.publicGetMarketTickerBySymbol(self.extend({
+            'symbol': self.to_bullish_symbol(symbol)
+        }, params))
+        return self.parse_ticker(response, symbol)
+
+    async def fetch_tickers(self, symbols: List[str] = None, params={}):
+        if symbols is None:
+            await self.load_markets()
+            symbols = self.symbols
+        concurrency, partial, params = self._parse_fetch_tickers_params(params)
+        await self.load_market_symbol_mappings()
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+        async def fetch_ticker_or_error(symbol):
+            async with semaphore:
+                try:
+                    return await self.fetch_ticker(symbol, params)
+                except Exception as e:
+                    return e
+
+        results = await asyncio.gather(*[fetch_ticker_or_error(symbol) for symbol in symbols])
+        return self._collect_tickers(symbols, results, partial)
+
+    async def fetch_ohlcv(self, symbol: str, timeframe='1m', since: Int = None, limit: Int = None, params={}):
+        await self.load_market_symbol_mappings()
+        columns, params = self._parse_format_params(params)
+        if timeframe not in self.timeframes:
+            candles = await self._fetch_resampled_ohlcv(symbol, timeframe, since, limit, params)
+            return self._candles_to_columns(candles) if columns else candles
+        if self.options['ohlcvCacheDir'] is not None:
+            candles = await self._fetch_ohlcv_through_cache(symbol, timeframe, since, limit, params)
+            return self._candles_to_columns(candles) if columns else candles
+        request = self._make_ohlcv_request(symbol, timeframe, since, limit)
+        response = await self.publicGetMarketCandleBySymbol(self.extend(request, params))
+        if columns:
+            from ..columns import candle_columns
+            return candle_columns(response)
+        return list(map(self.parse_ohlcv, response))
+
+    async def _fetch_resampled_ohlcv(self, symbol: str, timeframe: str, since: Int = None, limit: Int = None, params={}):
+        base, buckets, open_since, fetch_range = self._make_resample_request(symbol, timeframe, since, limit)
+        candles = []
+        if fetch_range is not None:
+            candles = await self.fetch_ohlcv_range(symbol, base, fetch_range[0], fetch_range[1], params)
+        return self._resample_ohlcv(symbol, timeframe, buckets, open_since, candles)
+
+    async def _fetch_ohlcv_through_cache(self, symbol: str, timeframe='1m', since: Int = None, limit: Int = None, params={}):
+        since, until, open_since = self._make_cached_ohlcv_bounds(timeframe, since, limit)
+        candles = (await self.fetch_cached_ohlcv(symbol, timeframe, since, until, params)).to_list()
+        if open_since is not None:
+            request = self._make_ohlcv_request(symbol, timeframe, open_since, 1)
+            response = await self.publicGetMarketCandleBySymbol(self.extend(request, params))
+            candles.extend(candle for candle in map(self.parse_ohlcv, response) if candle[0] >= open_since)
+        return candles
+
+    async def fetch_cached_ohlcv(self, symbol: str, timeframe='1m', since: Int = None, until: Int = None, params={}):
+        await self.load_market_symbol_mappings()
+        cache, key, since, until = self._prepare_cached_ohlcv(symbol, timeframe, since, until)
+        for start, end in cache.missing_ranges(key, timeframe, since, until):
+            cache.store(key, timeframe, start, end, await self.fetch_ohlcv_range(symbol, timeframe, start, end, params))
+        return cache.load(key, timeframe, since, until)
+
+    async def fetch_ohlcv_range(self, symbol: str, timeframe='1m', since: Int = None, until: Int = None, params={}):
+        return (await self.fetch_ohlcv_ranges([symbol], timeframe, since, until, params))[symbol]
+
+    async def fetch_ohlcv_ranges(self, symbols: List[str], timeframe='1m', since: Int = None, until: Int = None, params={}):
+        await self.load_market_symbol_mappings()
+        chunks, until, concurrency, rate_limit, params = self._make_ohlcv_range_requests(symbols, timeframe, since, until, params)
+        semaphore = asyncio.Semaphore(concurrency)
+        pace = self._make_pacer(rate_limit)
+
+        async def fetch_chunk(chunk):
+            async with semaphore:
+                await pace()
+                return await self.publicGetMarketCandleBySymbol(self.extend(chunk[1], params))
+
+        responses = await asyncio.gather(*[fetch_chunk(chunk) for chunk in chunks])
+        return self._merge_ohlcv_ranges(symbols, timeframe, since, until, chunks, responses)
+
+    async def fetch_order_book(self, symbol: str, limit: Int = None, params={}):
+        await self.load_market_symbol_mappings()
+        arrays, params = self._parse_order_book_params(params)
+        request = self._make_order_book_request(symbol, limit, params)
+        response = await self.publicGetOrderBookForSymbol(self.extend(request, params))
+        parser = self._parse_array_order_book if arrays else self._parse_order_book
+        return parser(
+            response,
+            self.to_unified_symbol(symbol),
+            timestamp=int(self.safe_value(response, 'timestamp', 0))
+        )
+
+    # The stream runs on its own thread, so only the wait for the next update is moved off the event loop
+    async def watch_order_book(self, symbol: str, limit: Int = None, params={}):
+        await self.load_market_symbol_mappings()
+        return await asyncio.get_running_loop().run_in_executor(None, bullish_sync.watch_order_book, self, symbol, limit, params)
+
+    # The private socket authenticates with the current token, which is obtained here and then kept
+    # valid by the session manager for the reconnections
+    async def watch_orders(self, symbol: Str = None, since: Int = None, limit: Int = None, params={}):
+        await self.load_market_symbol_mappings()
+        await self.login()
+        return await asyncio.get_running_loop().run_in_executor(None, bullish_sync.watch_orders, self, symbol, since, limit, params)
+
+    async def watch_my_trades(self, symbol: Str = None, since: Int = None, limit: Int = None, params={}):
+        await self.load_market_symbol_mappings()
+        await self.login()
+        return await asyncio.get_running_loop().run_in_executor(None, bullish_sync.watch_my_trades, self, symbol, since, limit, params)
+
+    async def watch_balance(self, params={}):
+        await self.login()
+        return await asyncio.get_running_loop().run_in_executor(None, bullish_sync.watch_balance, self, params)
+
+    async def fetch_server_nonce(self, params={}):
+        response = await self.publicGetNonce(params)
+        return response["lowerBound"]
+
+    async def fetch_time(self, params={}):
+        return await self.publicGetTime(params)
+
+    ### Login ########
+
+    async def login(self, params={}):
+        if not self.session_manager.is_valid():
+            self.check_required_credentials()
+            self.log("New login credentials required")
+            await self.session_manager.refresh(params)
+        return self.creds
+
+    async def fetch2(self, path, api='public', method='GET', params={}, headers=None, body=None, config={}):
+        if not self._is_private_api(api):
+            return await self._fetch2(path, api, method, params, headers, body, config)
+        await self.login()
+        try:
+            return await self._fetch2(path, api, method, params, headers, body, config)
+        except AuthenticationError:
+            self.log("Session was rejected, logging in again before replaying the request", logging.WARN)
+            self.session_manager.invalidate()
+            await self.login()
+            return await self._fetch2(path, api, method, params, headers, body, config)
+
+    async def _fetch2(self, path, api='public', method='GET', params={}, headers=None, body=None, config={}):
+        if self.enableRateLimit:
+            await self.throttle(self.calculate_rate_limiter_cost(api, method, path, params, config), self._rate_limit_budget(api))
+        self.lastRestRequestTimestamp = self.milliseconds()
+        request = self.sign(path, api, method, params, headers, body)
+        self.last_request_headers = request['headers']
+        self.last_request_body = request['body']
+        self.last_request_url = request['url']
+        return await self.fetch(request['url'], request['method'], request['headers'], request['body'])
+
+    ### Private APIs ########
+
+    async def fetch_accounts(self, params={}):
+        response = await self.privateGetTradingAccounts(params)
+        return self._set_rate_limit_token(list(map(self.parse_account, response)))
+
+    async def fetch_balance(self, params={}):
+        response = await self.privateGetAccountAssets(params)
+        return self._parse_balances(response)
+
+    async def create_order(self, symbol: str, type: OrderType, side: OrderSide, amount: float, price: Num = None, params={}):
+        await self.load_market_symbol_mappings()
+        if self.options['preTradeValidation'] is not None:
+            await self.load_markets()
+        request = self._make_create_order_request(symbol, type, side, amount, price, params)
+        reservation = self._reserve_order_funds(symbol, side, request)
+        try:
+            return await self.privateV2PostOrder(self.extend(request, params))
+        except Exception:
+            self._release_order_funds(reservation)
+            raise
+
+    # The connections are pooled by the aiohttp session
+    async def create_orders(self, orders: List[OrderRequest], params={}):
+        await self.load_market_symbol_mappings()
+        concurrency, params = self._parse_create_orders_params(params)
+        if self.options['preTradeValidation'] is not None:
+            await self.load_markets()
+        await self.login()
+        requests, reservations = self._sign_create_orders(orders, params)
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+        async def send_or_error(request):
+            if isinstance(request, Exception):
+                return request
+            async with semaphore:
+                try:
+                    return await self._send_signed_order(request)
+                except Exception as e:
+                    return e
+
+        results = await asyncio.gather(*[send_or_error(request) for request in requests])
+        return self._collect_create_orders(results, reservations)
+
+    async def _send_signed_order(self, request):
+        if self.enableRateLimit:
+            await self.throttle(self.calculate_rate_limiter_cost('privateV2', 'POST', CREATE_ORDER_PATH, {}), 'private')
+        self.lastRestRequestTimestamp = self.milliseconds()
+        return await self.fetch(request['url'], request['method'], request['headers'], request['body'])
+
+    async def fetch_my_trades(self, symbol: Str = None, since: Int = None, limit: Int = None, params={}):
+        await self.load_market_symbol_mappings()
+        paginated_request = self._make_paginated_private_request(self.to_bullish_symbol(symbol), since, limit, params)
+        columns, params = self._parse_format_params(params)
+        response = await self.privateGetMyTrades(self.extend(paginated_request, params))
+        if columns:
+            from ..columns import trade_columns
+            return trade_columns(self._parse_page(response)[0], self.to_unified_symbol)
+        return self._parse_paginated_batch(response, self.parse_trades_fast)
+
+    async def fetch_orders(self, symbol: Str = None, since: Int = None, limit: Int = None, params={}):
+        await self.load_market_symbol_mappings()
+        paginated_request = self._make_paginated_private_request(self.to_bullish_symbol(symbol), since, limit, params)
+        response = await self.privateGetOrders(self.extend(paginated_request, params))
+        return self._parse_paginated_batch(response, self.parse_orders_fast)
+
+    async def fetch_order(self, id: str, symbol: Str = None, params={}):
+        if symbol is not None:
+            raise BadRequest("[fetch_order] The `symbol` parameter is not supported for this exchange")
+        await self.load_market_symbol_mappings()
+        bullish_request = {
+            "tradingAccountId": self.account_id,
+            "id": id,
+        }
+        response = await self.private_get_order_by_id(self.extend(bullish_request, params))
+        return self.parse_order(response)
+
+    async def fetch_deposits_withdrawals(self, code: Str = None, since: Int = None, limit: Int = None, params={}):
+        if code is not None:
+            raise BadRequest("[fetch_deposits_withdrawals] The `code` parameter is not supported for this exchange")
+        paginated_request = self._make_paginated_wallet_request(since, limit, params)
+        response = await self.privateGetWalletTransactions(paginated_request)
+        return self._parse_paginated_response(response, self.parse_depositwithdrawal)
+
+    ## Auto-pagination
+
+    async def iter_orders(self, symbol: Str = None, since: Int = None, limit: Int = None, params={}):
+        await self.load_market_symbol_mappings()
+        paginated_request = self._make_paginated_private_request(self.to_bullish_symbol(symbol), since, MAX_PAGE_SIZE, params)
+        async for order in self._iter_paginated(self.privateGetOrders, self.extend(paginated_request, params), self.parse_order, limit):
+            yield order
+
+    async def iter_my_trades(self, symbol: Str = None, since: Int = None, limit: Int = None, params={}):
+        await self.load_market_symbol_mappings()
+        paginated_request = self._make_paginated_private_request(self.to_bullish_symbol(symbol), since, MAX_PAGE_SIZE, params)
+        async for trade in self._iter_paginated(self.privateGetMyTrades, self.extend(paginated_request, params), self.parse_trade, limit):
+            yield trade
+
+    async def iter_raw_orders(self, symbol: Str = None, since: Int = None, limit: Int = None, params={}):
+        await self.load_market_symbol_mappings()
+        paginated_request = self._make_paginated_private_request(self.to_bullish_symbol(symbol), since, MAX_PAGE_SIZE, params)
+        async for order in self._iter_paginated(self.privateGetOrders, self.extend(paginated_request, params), lambda order: order, limit):
+            yield order
+
+    async def iter_raw_my_trades(self, symbol: Str = None, since: Int = None, limit: Int = None, params={}):
+        await self.load_market_symbol_mappings()
+        paginated_request = self._make_paginated_private_request(self.to_bullish_symbol(symbol), since, MAX_PAGE_SIZE, params)
+        async for trade in self._iter_paginated(self.privateGetMyTrades, self.extend(paginated_request, params), lambda trade: trade, limit):
+            yield trade
+
+    async def iter_deposits_withdrawals(self, code: Str = None, since: Int = None, limit: Int = None, params={}):
+        if code is not None:
+            raise BadRequest("[iter_deposits_withdrawals] The `code` parameter is not supported for this exchange")
+        paginated_request = self._make_paginated_wallet_request(since, MAX_PAGE_SIZE, params)
+        async for transaction in self._iter_paginated(self.privateGetWalletTransactions, paginated_request, self.parse_depositwithdrawal, limit):
+            yield transaction
+
+    async def _iter_paginated(self, method, request, parser, limit: Int = None):
+        count = 0
+        next_response = asyncio.ensure_future(method(request))
+        try:
+            while next_response is not None:
+                items, next_page = self._parse_page(await next_response)
+                next_response = None
+                if next_page is not None and (limit is None or count + len(items) < limit):
+                    next_response = asyncio.ensure_future(method(self.extend(request, {'_nextPage': next_page})))
+                for item in items:
+                    if limit is not None and count >= limit:
+                        return
+                    yield parser(item)
+                    count += 1
+        finally:
+            if next_response is not None:
+                next_response.cancel()
+
+    ## Backfill
+
+    async def backfill_orders(self, symbol: Str = None, since: Int = None, until: Int = None, params={}):
+        await self.load_market_symbol_mappings()
+        return await self._backfill(self.privateGetOrders, self.parse_order, symbol, since, until, params)
+
+    async def backfill_my_trades(self, symbol: Str = None, since: Int = None, until: Int = None, params={}):
+        await self.load_market_symbol_mappings()
+        return await self._backfill(self.privateGetMyTrades, self.parse_trade, symbol, since, until, params)
+
+    async def _backfill(self, method, parser, symbol: Str = None, since: Int = None, until: Int = None, params={}):
+        request, windows, concurrency, rate_limit = self._make_backfill_request(symbol, since, until, params)
+        semaphore = asyncio.Semaphore(concurrency)
+        pace = self._make_pacer(rate_limit)
+
+        async def fetch_window(window):
+            window_request = self.extend(request, window)
+            items = []
+            async with semaphore:
+                while window_request is not None:
+                    await pace()
+                    page, next_page = self._parse_page(await method(window_request))
+                    items.extend(page)
+                    window_request = self.extend(window_request, {'_nextPage': next_page}) if next_page else None
+            return items
+
+        pages = await asyncio.gather(*[fetch_window(window) for window in windows])
+        return self._merge_backfill(pages, parser)
+
+    def _make_pacer(self, rate_limit: int):
+        next_request_at = [0]
+
+        async def pace():
+            now = self.milliseconds()
+            delay = next_request_at[0] - now
+            next_request_at[0] = max(now, next_request_at[0]) + rate_limit
+            if delay > 0:
+                await self.sleep(delay)
+
+        return pace
+
+    async def fetch_amm_instructions(self, symbol: Str = None, params={}):
+        bullish_request = {
+            "tradingAccountId": self.account_id,
+        }
+        if symbol is not None:
+            await self.load_market_symbol_mappings()
+            bullish_request['symbol'] = self.to_bullish_symbol(symbol)
+        return await self.privateGetAMMInstructions(self.extend(bullish_request, params))
+
+    async def fetch_amm_instruction(self, instructionId: str, symbol: Str = None, params={}):
+        if symbol is not None:
+            raise BadRequest("[fetch_order] The `symbol` parameter is not supported for this exchange")
+        bullish_request = {
+            "tradingAccountId": self.account_id,
+            "instructionId": instructionId,
+        }
+        return await self.private_get_amm_instructions_by_instruction_id(self.extend(bullish_request, params))
+
+    async def fetch_positions(self, symbols: List[str] = None, params={}):
+        self.log("Warning - only Derivative positions are available")
+        await self.load_market_symbol_mappings()
+        response = await self.privateGetDerivativesPositions(params)
+        return self.parse_positions(response, symbols, params)
+
+    async def fetch_position(self, symbol: str, params={}):
+        self.log("Warning - only Derivative positions are available")
+        await self.load_market_symbol_mappings()
+        response = await self.privateGetDerivativesPositions(self.extend({
+            'symbol': self.to_bullish_symbol(symbol)
+        }, params))
+        positions = self.parse_positions(response, None, params)
+        position_map = {position['symbol']: position for position in positions}
+        return self.safe_value(position_map, symbol)
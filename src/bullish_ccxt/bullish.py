@@ -1,17 +1,31 @@
-import hmac
-import json
+import copy
+import hashlib
+import os
+import threading
+import time
 import urllib.parse
-from datetime import datetime, timezone
-from hashlib import sha256
-from abstract.bullish import ImplicitAPI
+from concurrent.futures import ThreadPoolExecutor
+from .abstract.bullish import ImplicitAPI
+from .session_manager import SessionManager
+from .rate_limiter import RateLimiter
+from .signer import Signer
+from .nonce_generator import NonceGenerator
 import logging
 
-from ccxt.base.errors import BadRequest, PermissionDenied, BadSymbol, OrderNotFillable, NotSupported, \
+from ccxt.base.errors import BadRequest, BadSymbol, OrderNotFillable, NotSupported, \
     ExchangeNotAvailable, ExchangeError, OrderNotFound, AuthenticationError, InsufficientFunds
-from ccxt.base.types import Num, OrderSide, Market, OrderType, Str, Int, List
+from ccxt.base.types import Num, OrderSide, Market, OrderType, OrderRequest, Str, Int, List
 from ccxt.base.exchange import Exchange
 
 HMAC_LOGIN_PATH = "users/hmac/login"
+CREATE_ORDER_PATH = 'orders'
+# Keys of self.urls holding the endpoints of the non production environments
+ENVIRONMENT_URLS = {'DEV': 'dev', 'UAT': 'uat', 'LOCAL': 'local'}
+MAX_PAGE_SIZE = 100
+# Filled quantity of orders which do not report one, shared by parse_order and the fast parsers
+DEFAULT_QUANTITY_FILLED = 0.0
+# Values of options['recordInfo'], as records.INFO_MODES, which is only imported once compactRecords is used
+RECORD_INFO_MODES = ('keep', 'lazy', 'drop')
 
 class bullish(Exchange, ImplicitAPI):
     user_id = None
@@ -25,28 +39,68 @@ class bullish(Exchange, ImplicitAPI):
     creds = None
     last_pagination_metadata = None
 
-    # Mapping of symbols from Bullish and back
-    # Presence of mapping here does not imply existance of trading market
+    # Mapping of symbols from Bullish and back, built from the listed markets.
+    # Symbols of markets listed later are parsed and added on demand
     symbols_bullish_to_unified = None
     symbols_unified_to_bullish = None
+    quote_symbols = None
 
     cached_currencies = None
 
-    environment = 'PROD' # DEV/UAT to trigger the internal DEV/UAT environment 
+    environment = 'PROD' # DEV/UAT to trigger the internal DEV/UAT environment, LOCAL for api_simulator.ApiSimulator 
+
+    # Errors of the symbols left out of the last partial fetch_tickers call
+    last_tickers_errors = None
+    # Errors of the last create_orders call, by index of the order
+    last_create_orders_errors = None
+    # Connections kept open per host by the HTTP session, raised by create_orders to its concurrency
+    connection_pool_size = 10
+    # Candles missing from the last fetch_ohlcv_range(s), per symbol, as [start, end) ranges
+    last_ohlcv_gaps = None
+    # Closed candles stored on disk, when options['ohlcvCacheDir'] is set
+    candle_cache = None
+    # Assets and markets stored on disk, when options['metadataCacheDir'] is set
+    metadata_cache = None
+    # Signer keyed with the current secret, see _get_signer
+    signer = None
+    # Pre-trade checks of the markets and balances loaded last, when options['preTradeValidation'] is set
+    order_validator = None
+
+    def __init__(self, config={}):
+        super(bullish, self).__init__(config)
+        self.rate_limiter = RateLimiter(self.options['rateLimits'])
+        self.path_params = {}
+        self.nonce_generator = NonceGenerator(self.options['nonceFile'])
+        # Background refreshes of stale metadata cache entries, by entry
+        self.metadata_refreshes = {}
+        self.metadata_reload_lock = threading.Lock()
+        self.session_manager = SessionManager(self)
+        self.streams = {}
+        # Closed candles of the timeframes resampled locally, per (symbol, timeframe) and start timestamp
+        self.resampled_ohlcv = {}
+
+    # Static metadata, built once for the sync and async clients. Every call returns a copy of it
+    description = None
 
     def describe(self):
+        if bullish.description is None:
+            bullish.description = self._describe()
+        return copy.deepcopy(bullish.description)
+
+    def _describe(self):
         # Define metadata
         return self.deep_extend(super(bullish, self).describe(), {
             'id': 'bullish',
             'name': 'Bullish',
             'countries': ['HK', 'SG'],
             'version': 'v0.1',
-            'rateLimit': 6000,  # 100 request per second
+            'rateLimit': 10,  # milliseconds between requests, see options['rateLimits'] for the budgets actually applied
             'timeout': 10000,
             'has': {
                 'cancelAllOrders': False,
                 'cancelOrder': False,
                 'createOrder': True,
+                'createOrders': True,
                 'fetchAccounts': True,
                 'fetchCurrencies': True,
                 'fetchBalance': True,
@@ -64,6 +118,10 @@ class bullish(Exchange, ImplicitAPI):
                 'fetchTickers': True,
                 'fetchTime': True,
                 'fetchTrades': False,
+                'watchOrderBook': True,
+                'watchOrders': True,
+                'watchMyTrades': True,
+                'watchBalance': True,
                 'fetchWithdrawals': False,
                 'withdraw': False,
             },
@@ -82,12 +140,20 @@ class bullish(Exchange, ImplicitAPI):
                     'publicV2': 'https://api.exchange.bullish.com/trading-api/v2',
                     'private': 'https://api.exchange.bullish.com/trading-api/v1',
                     'privateV2': 'https://api.exchange.bullish.com/trading-api/v2',
+                    'ws': {
+                        'public': 'wss://api.exchange.bullish.com/trading-api/v1/market-data/orderbook',
+                        'private': 'wss://api.exchange.bullish.com/trading-api/v1/private-data',
+                    },
                 },
                 'test': { # this is triggered by setting sandbox mode (set_sandbox_mode) to true
                     'public': 'https://api.simnext.bullish-test.com/trading-api/v1',
                     'publicV2': 'https://api.simnext.bullish-test.com/trading-api/v2',
                     'private': 'https://api.simnext.bullish-test.com/trading-api/v1',
                     'privateV2': 'https://api.simnext.bullish-test.com/trading-api/v2',
+                    'ws': {
+                        'public': 'wss://api.simnext.bullish-test.com/trading-api/v1/market-data/orderbook',
+                        'private': 'wss://api.simnext.bullish-test.com/trading-api/v1/private-data',
+                    },
                 },
                 'doc': 'https://api.exchange.bullish.com/docs/api/rest/trading-api'
             },
@@ -164,6 +230,58 @@ class bullish(Exchange, ImplicitAPI):
             'options': {
                 'defaultTimeInForce': 'GTC',
                 'defaultAggregation': 10,
+                # maximum number of tickers requested at the same time by fetch_tickers
+                'fetchTickersConcurrency': 10,
+                # orders sent at the same time by create_orders
+                'createOrdersConcurrency': 10,
+                # check new orders against the market rules and the last balances before sending them: 'reject' fails
+                # the orders the exchange would reject, 'round' moves their price and amount to the precision first
+                'preTradeValidation': None,
+                # candles per request and requests in flight for fetch_ohlcv_range(s)
+                'ohlcvChunkSize': 100,
+                'ohlcvConcurrency': 4,
+                # directory in which closed candles are cached per environment by fetch_ohlcv and fetch_cached_ohlcv, None to disable
+                'ohlcvCacheDir': None,
+                # directory in which assets and markets are cached across processes, None to disable, and
+                # milliseconds after which they are refreshed in the background
+                'metadataCacheDir': None,
+                'metadataCacheTtl': 60 * 60 * 1000,
+                # time windows fetched at the same time by backfill_orders and backfill_my_trades
+                'backfillConcurrency': 4,
+                # minimum milliseconds between two requests of a backfill, on top of the client rate limit
+                'backfillRateLimit': 0,
+                # 'columns' to return fetch_ohlcv, fetch_trades and fetch_my_trades as typed arrays, overridden by params['format']
+                'defaultFormat': 'rows',
+                # return ArrayOrderBook instances from fetch_order_book, overridden by params['arrays']
+                'orderBookArrays': False,
+                # parse orders, trades, tickers, positions and balances into slotted records instead of dicts
+                'compactRecords': False,
+                # raw payload kept in 'info': 'keep', 'drop', or 'lazy' (JSON string decoded on access, compactRecords only)
+                'recordInfo': 'keep',
+                # token buckets applied when enableRateLimit is set, in requests and requests per second
+                'rateLimits': {
+                    'public': {'capacity': 50, 'refillRate': 50},
+                    'private': {'capacity': 100, 'refillRate': 100},
+                },
+                # cost of the endpoints counting for more than one request, as {'GET orders': 2}
+                'rateLimitCosts': {},
+                # response headers reporting the budget left, and the time at which it is reset
+                'rateLimitHeaders': {'remaining': 'x-ratelimit-remaining', 'reset': 'x-ratelimit-reset'},
+                # milliseconds without requests after a 429 that carries no Retry-After or reset header
+                'rateLimitBackoff': 1000,
+                # file keeping the last clientOrderId / BX-NONCE handed out, shared by the processes trading
+                # on the same account and read back on restart. None keeps it in memory
+                'nonceFile': None,
+                # milliseconds before a dropped WebSocket connection is opened again
+                'wsReconnectDelay': 1000,
+                # orders or trades queued per topic until watch_orders / watch_my_trades hand them out. Once full,
+                # the oldest are dropped and counted in the stream's dropped_updates
+                'wsMaxPendingUpdates': 10000,
+                # JWT session lifecycle, in milliseconds
+                'sessionAutoRefresh': True,
+                'sessionRefreshMargin': 5 * 60 * 1000,  # refresh ahead of the token expiry
+                'sessionRetryInterval': 30 * 1000,  # retry a failed background refresh after
+                'sessionTtl': 24 * 60 * 60 * 1000,  # assumed lifetime of tokens without an exp claim
                 # reverse/forward lookup maps
                 'sideMap': {
                     'SELL': 'SELL',
@@ -189,49 +307,95 @@ class bullish(Exchange, ImplicitAPI):
     
     ##### public APIs ######
 
-    def load_market_symbol_mappings(self): 
+    def load_market_symbol_mappings(self):
         if self.symbols_bullish_to_unified is not None and self.symbols_unified_to_bullish is not None:
             return
-        available_currencies = self.fetch_currencies()
-        available_symbols = available_currencies.keys()
+        self._build_market_symbol_mappings(self._fetch_metadata('markets', self.publicGetMarkets))
 
-        self.symbols_bullish_to_unified = {}
-        self.symbols_unified_to_bullish = {}
+    # The maps are built aside and swapped in once complete, as other threads may be reading the current ones
+    def _build_market_symbol_mappings(self, markets):
+        bullish_to_unified = {}
+        unified_to_bullish = {}
+        quote_symbols = set()
+        for market in markets:
+            base = self.safe_string(market, 'baseSymbol')
+            quote = self.safe_string(market, 'quoteSymbol')
+            bullish_symbol = self.safe_string(market, 'symbol')
+            if base is None or quote is None or bullish_symbol is None:
+                continue
+            unified_symbol = base + '/' + quote
+            if self.safe_string(market, 'marketType') == 'PERPETUAL':
+                unified_symbol += ':' + quote
+            quote_symbols.add(quote)
+            bullish_to_unified[bullish_symbol] = unified_symbol
+            unified_to_bullish[unified_symbol] = bullish_symbol
+        # Longest first, so that e.g. USDC is matched before USD when splitting unknown symbols
+        self.quote_symbols = sorted(quote_symbols, key=len, reverse=True)
+        self.symbols_bullish_to_unified, self.symbols_unified_to_bullish = bullish_to_unified, unified_to_bullish
 
-        for left in available_symbols:
-            for right in available_symbols:
-                left = left.upper()
-                right = right.upper()
-                if left != right:
-                    bullish_pair_spot = left + right
-                    unified_pair_spot = left + '/' + right
-                    bullish_pair_perp = left + "-" + right + "-PERP"
-                    unified_pair_perp = left + '/' + right + ":" + right
+    def _add_symbol_mapping(self, bullish_symbol, unified_symbol):
+        self.symbols_bullish_to_unified[bullish_symbol] = unified_symbol
+        self.symbols_unified_to_bullish[unified_symbol] = bullish_symbol
 
-                    self.symbols_bullish_to_unified[bullish_pair_spot] = unified_pair_spot
-                    self.symbols_unified_to_bullish[unified_pair_spot] = bullish_pair_spot
+    # BTC/USDC -> BTCUSDC, BTC/USDC:USDC -> BTC-USDC-PERP
+    def _parse_unified_symbol(self, unified_symbol):
+        if '/' not in unified_symbol:
+            return None
+        base, rest = unified_symbol.split('/', 1)
+        if ':' in rest:
+            quote = rest.split(':', 1)[0]
+            return base + '-' + quote + '-PERP'
+        return base + rest
 
-                    self.symbols_bullish_to_unified[bullish_pair_perp] = unified_pair_perp
-                    self.symbols_unified_to_bullish[unified_pair_perp] = bullish_pair_perp
+    # BTCUSDC -> BTC/USDC, BTC-USDC-PERP -> BTC/USDC:USDC
+    def _parse_bullish_symbol(self, bullish_symbol):
+        if bullish_symbol.endswith('-PERP'):
+            parts = bullish_symbol.split('-')
+            if len(parts) != 3:
+                return None
+            return parts[0] + '/' + parts[1] + ':' + parts[1]
+        for quote in self.quote_symbols or []:
+            if len(bullish_symbol) > len(quote) and bullish_symbol.endswith(quote):
+                return bullish_symbol[:-len(quote)] + '/' + quote
+        return None
 
     def to_bullish_symbol(self, unified_symbol):
-        self.load_market_symbol_mappings()
-        return self.safe_string(self.symbols_unified_to_bullish, unified_symbol, unified_symbol)
+        if unified_symbol is None:
+            return None
+        if self.symbols_unified_to_bullish is None:
+            self.load_market_symbol_mappings()
+        bullish_symbol = self.symbols_unified_to_bullish.get(unified_symbol)
+        if bullish_symbol is None:
+            bullish_symbol = self._parse_unified_symbol(unified_symbol)
+            if bullish_symbol is None:
+                return unified_symbol
+            self._add_symbol_mapping(bullish_symbol, unified_symbol)
+        return bullish_symbol
 
     def to_unified_symbol(self, bullish_symbol):
-        self.load_market_symbol_mappings()
-        return self.safe_string(self.symbols_bullish_to_unified, bullish_symbol, bullish_symbol)
+        if bullish_symbol is None:
+            return None
+        if self.symbols_bullish_to_unified is None:
+            self.load_market_symbol_mappings()
+        unified_symbol = self.symbols_bullish_to_unified.get(bullish_symbol)
+        if unified_symbol is None:
+            unified_symbol = self._parse_bullish_symbol(bullish_symbol)
+            if unified_symbol is None:
+                return bullish_symbol
+            self._add_symbol_mapping(bullish_symbol, unified_symbol)
+        return unified_symbol
 
     def fetch_currencies(self, params={}):
         if self.safe_bool(params, 'reload') != True and self.cached_currencies is not None:
             return self.cached_currencies
-        response = self.publicGetAssets(params)
+        response = self._fetch_metadata('assets', self.publicGetAssets, params)
         list_of_currencies = list(map(self.parse_currency, response))
         self.cached_currencies = {currency['code']: currency for currency in list_of_currencies} 
         return self.cached_currencies
     
     def fetch_markets(self, params={}):
-        response = self.publicGetMarkets(params)
+        response = self._fetch_metadata('markets', self.publicGetMarkets, params)
+        self._build_market_symbol_mappings(response)
         return list(map(self.parse_market, response))
     
     def fetch_trades(self, symbol: str, since: Int = None, limit: Int = None, params={}):
@@ -239,10 +403,14 @@ class bullish(Exchange, ImplicitAPI):
             raise BadRequest("[fetch_trades] The `since` parameter is not supported for this exchange")
         if limit is not None:
             raise BadRequest("[fetch_trades] The `limit` parameter is not supported for this exchange")
+        columns, params = self._parse_format_params(params)
         response = self.publicGetMarketTradesBySymbol(self.extend({
             'symbol': self.to_bullish_symbol(symbol)
         }, params))
-        return list(map(self.parse_trade, response))
+        if columns:
+            from .columns import trade_columns
+            return trade_columns(response, self.to_unified_symbol)
+        return self.parse_trades_fast(response)
     
     def fetch_ticker(self, symbol: str, params={}):
         response = self.publicGetMarketTickerBySymbol(self.extend({
@@ -250,50 +418,153 @@ class bullish(Exchange, ImplicitAPI):
         }, params))
         return self.parse_ticker(response, symbol)
     
+    # Tickers are fetched by up to params['concurrency'] threads (defaults to options['fetchTickersConcurrency']).
+    # With params['partial'] set, symbols that fail are left out of the result and their errors are
+    # kept in self.last_tickers_errors, instead of failing the whole batch.
     def fetch_tickers(self, symbols: List[str] = None, params={}):
         if symbols is None:
             self.load_markets()
             symbols = self.symbols
-        tickers = list(map(self.fetch_ticker, symbols))
-        return {ticker['symbol']: ticker for ticker in tickers} 
+        concurrency, partial, params = self._parse_fetch_tickers_params(params)
+        self.load_market_symbol_mappings()
+
+        def fetch_ticker_or_error(symbol):
+            try:
+                return self.fetch_ticker(symbol, params)
+            except Exception as e:
+                return e
+
+        if concurrency <= 1 or len(symbols) <= 1:
+            results = list(map(fetch_ticker_or_error, symbols))
+        else:
+            with ThreadPoolExecutor(max_workers=min(concurrency, len(symbols))) as executor:
+                results = list(executor.map(fetch_ticker_or_error, symbols))
+        return self._collect_tickers(symbols, results, partial)
     
     def fetch_ohlcv(self, symbol: str, timeframe='1m', since: Int = None, limit: Int = None, params={}):
+        columns, params = self._parse_format_params(params)
         if timeframe not in self.timeframes:
-            raise BadRequest("[fetch_ohlcv] timeframe '%s' is not supported" % timeframe)
-        request = {
-            'symbol': self.to_bullish_symbol(symbol),
-            'timeBucket': self.timeframes[timeframe],
-        }
-        if since is None:
-            if limit is None:
-                limit = 500
-            duration = self.parse_timeframe(timeframe) * 1000
-            since = self.milliseconds() - duration * limit
-
-        end = self.sum(since, limit * self.parse_timeframe(timeframe) * 1000)
-        request['createdAtDatetime[gte]'] = self.iso8601(since)
-        request['createdAtDatetime[lte]'] = self.iso8601(end)    
-
+            candles = self._fetch_resampled_ohlcv(symbol, timeframe, since, limit, params)
+            return self._candles_to_columns(candles) if columns else candles
+        if self.options['ohlcvCacheDir'] is not None:
+            candles = self._fetch_ohlcv_through_cache(symbol, timeframe, since, limit, params)
+            return self._candles_to_columns(candles) if columns else candles
+        request = self._make_ohlcv_request(symbol, timeframe, since, limit)
         response = self.publicGetMarketCandleBySymbol(self.extend(request, params))
+        if columns:
+            from .columns import candle_columns
+            return candle_columns(response)
         return list(map(self.parse_ohlcv, response))
+
+    # Timeframes that are a multiple of a native one are aggregated from the coarsest native timeframe dividing them.
+    # Closed candles are kept in resampled_ohlcv, so that repeated calls only fetch the candle still open
+    def _fetch_resampled_ohlcv(self, symbol: str, timeframe: str, since: Int = None, limit: Int = None, params={}):
+        base, buckets, open_since, fetch_range = self._make_resample_request(symbol, timeframe, since, limit)
+        candles = []
+        if fetch_range is not None:
+            candles = self.fetch_ohlcv_range(symbol, base, fetch_range[0], fetch_range[1], params)
+        return self._resample_ohlcv(symbol, timeframe, buckets, open_since, candles)
+
+    # Closed candles come from the cache, and only the candle still open is always fetched
+    def _fetch_ohlcv_through_cache(self, symbol: str, timeframe='1m', since: Int = None, limit: Int = None, params={}):
+        since, until, open_since = self._make_cached_ohlcv_bounds(timeframe, since, limit)
+        candles = self.fetch_cached_ohlcv(symbol, timeframe, since, until, params).to_list()
+        if open_since is not None:
+            request = self._make_ohlcv_request(symbol, timeframe, open_since, 1)
+            response = self.publicGetMarketCandleBySymbol(self.extend(request, params))
+            candles.extend(candle for candle in map(self.parse_ohlcv, response) if candle[0] >= open_since)
+        return candles
+
+    # Closed candles of [since, until), as columns memory-mapped from the cache in options['ohlcvCacheDir'].
+    # Only the parts of the range not fetched yet go to the network
+    def fetch_cached_ohlcv(self, symbol: str, timeframe='1m', since: Int = None, until: Int = None, params={}):
+        cache, key, since, until = self._prepare_cached_ohlcv(symbol, timeframe, since, until)
+        for start, end in cache.missing_ranges(key, timeframe, since, until):
+            cache.store(key, timeframe, start, end, self.fetch_ohlcv_range(symbol, timeframe, start, end, params))
+        return cache.load(key, timeframe, since, until)
+
+    # Fetches the candles of [since, until), split in chunks of options['ohlcvChunkSize'] candles fetched concurrently
+    def fetch_ohlcv_range(self, symbol: str, timeframe='1m', since: Int = None, until: Int = None, params={}):
+        return self.fetch_ohlcv_ranges([symbol], timeframe, since, until, params)[symbol]
+
+    # Same as fetch_ohlcv_range for several symbols, with the chunks of every symbol sharing one worker pool
+    def fetch_ohlcv_ranges(self, symbols: List[str], timeframe='1m', since: Int = None, until: Int = None, params={}):
+        chunks, until, concurrency, rate_limit, params = self._make_ohlcv_range_requests(symbols, timeframe, since, until, params)
+        pace = self._make_pacer(rate_limit)
+
+        def fetch_chunk(chunk):
+            pace()
+            return self.publicGetMarketCandleBySymbol(self.extend(chunk[1], params))
+
+        with ThreadPoolExecutor(max_workers=max(min(concurrency, len(chunks)), 1)) as executor:
+            responses = list(executor.map(fetch_chunk, chunks))
+        return self._merge_ohlcv_ranges(symbols, timeframe, since, until, chunks, responses)
     
     def fetch_order_book(self, symbol: str, limit: Int = None, params={}):
-        if limit is not None:
-            raise NotSupported('fetch_order_book() with limit is not supported')
-        request = {
-            'symbol': self.to_bullish_symbol(symbol),
-            'aggregationFactor': params['aggregationFactor'] if 'aggregationFactor' in params else self.options[
-                'defaultAggregation'],
-            'depth': params['depth'] if 'depth' in params else 100
-        }
+        arrays, params = self._parse_order_book_params(params)
+        request = self._make_order_book_request(symbol, limit, params)
         response = self.publicGetOrderBookForSymbol(self.extend(request, params))
-        to_rt = self._parse_order_book(
+        parser = self._parse_array_order_book if arrays else self._parse_order_book
+        to_rt = parser(
             response,
             self.to_unified_symbol(symbol),
             timestamp=int(self.safe_value(response, 'timestamp', 0))
         )
         return to_rt
     
+    # Blocks until the book of `symbol` changes, and returns a copy of it. The book itself is maintained
+    # on a background WebSocket connection from the snapshot and the updates that follow it
+    def watch_order_book(self, symbol: str, limit: Int = None, params={}):
+        # Streams are imported on first use, as they load the WebSocket client and ccxt's async order books
+        from .order_book_stream import OrderBookStream
+        stream = self._get_stream('orderBook', OrderBookStream, self._get_ws_url('public'))
+        return stream.watch(self.to_bullish_symbol(symbol), limit, self.safe_integer(params, 'timeout', self.timeout) / 1000)
+
+    def un_watch_order_book(self, symbol: str, params={}):
+        if 'orderBook' in self.streams:
+            self.streams['orderBook'].unwatch(self.to_bullish_symbol(symbol))
+
+    def watch_orders(self, symbol: Str = None, since: Int = None, limit: Int = None, params={}):
+        from .private_stream import ORDERS_TOPIC
+        orders = self._watch_private_updates(ORDERS_TOPIC, symbol, limit, params)
+        return self.filter_by_since_limit(list(map(self.parse_order, orders)), since, limit)
+
+    def watch_my_trades(self, symbol: Str = None, since: Int = None, limit: Int = None, params={}):
+        from .private_stream import TRADES_TOPIC
+        trades = self._watch_private_updates(TRADES_TOPIC, symbol, limit, params)
+        return self.filter_by_since_limit(list(map(self.parse_trade, trades)), since, limit)
+
+    def watch_balance(self, params={}):
+        stream = self._get_private_stream()
+        return self._parse_balances(stream.watch_balance(self.safe_integer(params, 'timeout', self.timeout) / 1000))
+
+    def _watch_private_updates(self, topic, symbol: Str = None, limit: Int = None, params={}):
+        stream = self._get_private_stream()
+        timeout = self.safe_integer(params, 'timeout', self.timeout) / 1000
+        return stream.watch_updates(topic, self.to_bullish_symbol(symbol), limit, timeout)
+
+    def _get_private_stream(self):
+        from .private_stream import PrivateStream
+        return self._get_stream('private', PrivateStream, self._get_ws_url('private'))
+
+    # WebSocket endpoint of the current environment, resolved as sign() resolves the REST ones
+    def _get_ws_url(self, name):
+        urls = self.urls.get(ENVIRONMENT_URLS.get(self.environment, 'api')) or {}
+        ws = urls.get('ws') or {}
+        if name not in ws:
+            raise NotSupported(self.id + " has no '%s' WebSocket endpoint for the %s environment" % (name, self.environment))
+        return ws[name]
+
+    def close_streams(self):
+        for stream in self.streams.values():
+            stream.close()
+        self.streams = {}
+
+    def _get_stream(self, key, stream_class, url):
+        if key not in self.streams:
+            self.streams[key] = stream_class(self, url, self.options['wsReconnectDelay'])
+        return self.streams[key]
+
     def fetch_server_nonce(self, params={}):
         response = self.publicGetNonce(params)
         nonce = response["lowerBound"]
@@ -304,67 +575,102 @@ class bullish(Exchange, ImplicitAPI):
     
     ### Login ########
 
+    # Expired tokens are replaced here, while tokens about to expire are refreshed in the background
+    # by the session manager. Rejected tokens are replaced and the request replayed once by fetch2()
     def login(self, params={}):
         self.log("Attempting to access private API. Checking if session is also logged in")
-        if not self.creds:
+        if not self.session_manager.is_valid():
             self.check_required_credentials()
             self.log("New login credentials required")
-            self.creds = self.publicGetHmacLogin(params)
+            self.session_manager.refresh(params)
         else:
             self.log("Login credentials present")
-        
-        if self.creds and self.creds.get('token'):
-            # Only print this for non-server environments
-            # TODO: handle case where JWT token expired - for the case of long running clients
-            self.log("Login Successfully obtained", self.creds)
-        else:
-            raise PermissionDenied("Login unsuccessful. Please check apiKey and secret")
+        # Only print this for non-server environments
+        self.log("Login Successfully obtained", self.creds)
         return self.creds
     
     ### Private APIs ########
 
+    # Strictly increasing across threads (and processes sharing options['nonceFile']), used for the
+    # clientOrderId of new orders and the BX-NONCE of signed requests
     def local_nonce(self):
-        return str(int(datetime.now(timezone.utc).timestamp() * 1_000_000))
+        return str(self.nonce_generator.next())
     
     def fetch_accounts(self, params={}):
         response = self.privateGetTradingAccounts(params)
-        return list(map(self.parse_account, response))
+        return self._set_rate_limit_token(list(map(self.parse_account, response)))
     
     def fetch_balance(self, params={}):
         response = self.privateGetAccountAssets(params)
-        balances = list(map(self.parse_balance, response))
-        return {balance['asset']: balance for balance in balances} 
+        return self._parse_balances(response)
     
     def create_order(self, symbol: str, type: OrderType, side: OrderSide, amount: float, price: Num = None, params={}):
-        next_nonce = self.local_nonce()
-        time_in_force = params.get('timeInForce', self.options["defaultTimeInForce"])
-        request = {
-            "symbol": self.to_bullish_symbol(symbol), 
-            "commandType": "V3CreateOrder",
-            "side": self.options['sideMap'][side],
-            "type": self.options['typeMap'][type],
-            "timeInForce": time_in_force,
-            "quantity": str(amount),
-            "clientOrderId": next_nonce,
-            "tradingAccountId": self.account_id,
-        }
-        if price is not None:
-            request['price'] = str(price)
-        return self.privateV2PostOrder(self.extend(request, params))
+        if self.options['preTradeValidation'] is not None:
+            self.load_markets()
+        request = self._make_create_order_request(symbol, type, side, amount, price, params)
+        reservation = self._reserve_order_funds(symbol, side, request)
+        try:
+            return self.privateV2PostOrder(self.extend(request, params))
+        except Exception:
+            self._release_order_funds(reservation)
+            raise
+
+    # Orders are given as {'symbol', 'type', 'side', 'amount', 'price', 'params'}. Their commands are all built and
+    # signed first, in input order, so that their clientOrderIds increase in that order. They are then sent by up to
+    # params['concurrency'] threads (defaults to options['createOrdersConcurrency']) over pooled connections, within
+    # the private rate budget. Sending them one at a time (concurrency 1) also keeps them in order on the wire.
+    # The responses are returned in input order, with the error of an order in place of its response. These errors
+    # are also kept in self.last_create_orders_errors, by index
+    def create_orders(self, orders: List[OrderRequest], params={}):
+        concurrency, params = self._parse_create_orders_params(params)
+        if self.options['preTradeValidation'] is not None:
+            self.load_markets()
+        # sign() would otherwise log in while signing the first order
+        self.login()
+        requests, reservations = self._sign_create_orders(orders, params)
+        self._ensure_connection_pool(concurrency)
+
+        def send_or_error(request):
+            if isinstance(request, Exception):
+                return request
+            try:
+                return self._send_signed_order(request)
+            except Exception as e:
+                return e
+
+        if concurrency <= 1 or len(requests) <= 1:
+            results = list(map(send_or_error, requests))
+        else:
+            with ThreadPoolExecutor(max_workers=min(concurrency, len(requests))) as executor:
+                results = list(executor.map(send_or_error, requests))
+        return self._collect_create_orders(results, reservations)
+
+    # Same as fetch2 for requests signed ahead of time
+    def _send_signed_order(self, request):
+        if self.enableRateLimit:
+            self.throttle(self.calculate_rate_limiter_cost('privateV2', 'POST', CREATE_ORDER_PATH, {}), 'private')
+        self.lastRestRequestTimestamp = self.milliseconds()
+        return self.fetch(request['url'], request['method'], request['headers'], request['body'])
+
+    def _ensure_connection_pool(self, size):
+        if size > self.connection_pool_size:
+            from requests.adapters import HTTPAdapter
+            self.session.mount('https://', HTTPAdapter(pool_maxsize=size))
+            self.connection_pool_size = size
     
     def fetch_my_trades(self, symbol: Str = None, since: Int = None, limit: Int = None, params={}):
         paginated_request = self._make_paginated_private_request(self.to_bullish_symbol(symbol), since, limit, params)
+        columns, params = self._parse_format_params(params)
         response = self.privateGetMyTrades(self.extend(paginated_request, params))
-        self.last_pagination_metadata = self._parse_pagination_metadata(self.safe_dict(response, 'links'))
-        self.log("Pagination datadata updated.", self.last_pagination_metadata)
-        return list(map(self.parse_trade, self.safe_list(response, 'data')))
+        if columns:
+            from .columns import trade_columns
+            return trade_columns(self._parse_page(response)[0], self.to_unified_symbol)
+        return self._parse_paginated_batch(response, self.parse_trades_fast)
     
     def fetch_orders(self, symbol: Str = None, since: Int = None, limit: Int = None, params={}):
         paginated_request = self._make_paginated_private_request(self.to_bullish_symbol(symbol), since, limit, params)
         response = self.privateGetOrders(self.extend(paginated_request, params))
-        self.last_pagination_metadata = self._parse_pagination_metadata(self.safe_dict(response, 'links'))
-        self.log("Pagination datadata updated.", self.last_pagination_metadata)
-        return list(map(self.parse_order, self.safe_list(response, 'data')))
+        return self._parse_paginated_batch(response, self.parse_orders_fast)
     
     def fetch_order(self, id: str, symbol: Str = None, params={}):
         if symbol is not None:
@@ -381,10 +687,93 @@ class bullish(Exchange, ImplicitAPI):
             raise BadRequest("[fetch_deposits_withdrawals] The `code` parameter is not supported for this exchange")
         paginated_request = self._make_paginated_wallet_request(since, limit, params)
         response = self.privateGetWalletTransactions(paginated_request)
-        self.last_pagination_metadata = self._parse_pagination_metadata(self.safe_dict(response, 'links'))
-        self.log("Pagination datadata updated.", self.last_pagination_metadata)
-        return list(map(self.parse_depositwithdrawal, self.safe_list(response, 'data')))
+        return self._parse_paginated_response(response, self.parse_depositwithdrawal)
     
+    ## Auto-pagination
+    # These walk the _nextPage cursors with the largest page size, fetching the next page in
+    # the background while the current one is consumed. Iteration stops once `limit` items are yielded
+
+    def iter_orders(self, symbol: Str = None, since: Int = None, limit: Int = None, params={}):
+        paginated_request = self._make_paginated_private_request(self.to_bullish_symbol(symbol), since, MAX_PAGE_SIZE, params)
+        return self._iter_paginated(self.privateGetOrders, self.extend(paginated_request, params), self.parse_order, limit)
+
+    def iter_my_trades(self, symbol: Str = None, since: Int = None, limit: Int = None, params={}):
+        paginated_request = self._make_paginated_private_request(self.to_bullish_symbol(symbol), since, MAX_PAGE_SIZE, params)
+        return self._iter_paginated(self.privateGetMyTrades, self.extend(paginated_request, params), self.parse_trade, limit)
+
+    # Same as iter_orders and iter_my_trades, yielding the payloads as received, such as for OrderTracker
+    def iter_raw_orders(self, symbol: Str = None, since: Int = None, limit: Int = None, params={}):
+        paginated_request = self._make_paginated_private_request(self.to_bullish_symbol(symbol), since, MAX_PAGE_SIZE, params)
+        return self._iter_paginated(self.privateGetOrders, self.extend(paginated_request, params), lambda order: order, limit)
+
+    def iter_raw_my_trades(self, symbol: Str = None, since: Int = None, limit: Int = None, params={}):
+        paginated_request = self._make_paginated_private_request(self.to_bullish_symbol(symbol), since, MAX_PAGE_SIZE, params)
+        return self._iter_paginated(self.privateGetMyTrades, self.extend(paginated_request, params), lambda trade: trade, limit)
+
+    def iter_deposits_withdrawals(self, code: Str = None, since: Int = None, limit: Int = None, params={}):
+        if code is not None:
+            raise BadRequest("[iter_deposits_withdrawals] The `code` parameter is not supported for this exchange")
+        paginated_request = self._make_paginated_wallet_request(since, MAX_PAGE_SIZE, params)
+        return self._iter_paginated(self.privateGetWalletTransactions, paginated_request, self.parse_depositwithdrawal, limit)
+
+    def _iter_paginated(self, method, request, parser, limit: Int = None):
+        count = 0
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            next_response = executor.submit(method, request)
+            while next_response is not None:
+                items, next_page = self._parse_page(next_response.result())
+                next_response = None
+                if next_page is not None and (limit is None or count + len(items) < limit):
+                    next_response = executor.submit(method, self.extend(request, {'_nextPage': next_page}))
+                for item in items:
+                    if limit is not None and count >= limit:
+                        return
+                    yield parser(item)
+                    count += 1
+
+    ## Backfill
+    # The [since, until) range is split into params['windows'] time windows (defaults to the concurrency),
+    # each one paginated on its own worker. Results are merged in timestamp order, without duplicates
+
+    def backfill_orders(self, symbol: Str = None, since: Int = None, until: Int = None, params={}):
+        return self._backfill(self.privateGetOrders, self.parse_order, symbol, since, until, params)
+
+    def backfill_my_trades(self, symbol: Str = None, since: Int = None, until: Int = None, params={}):
+        return self._backfill(self.privateGetMyTrades, self.parse_trade, symbol, since, until, params)
+
+    def _backfill(self, method, parser, symbol: Str = None, since: Int = None, until: Int = None, params={}):
+        request, windows, concurrency, rate_limit = self._make_backfill_request(symbol, since, until, params)
+        pace = self._make_pacer(rate_limit)
+
+        def fetch_window(window):
+            window_request = self.extend(request, window)
+            items = []
+            while window_request is not None:
+                pace()
+                page, next_page = self._parse_page(method(window_request))
+                items.extend(page)
+                window_request = self.extend(window_request, {'_nextPage': next_page}) if next_page else None
+            return items
+
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(windows))) as executor:
+            pages = list(executor.map(fetch_window, windows))
+        return self._merge_backfill(pages, parser)
+
+    # Returns a function spacing the calls made to it by at least `rate_limit` milliseconds, across threads
+    def _make_pacer(self, rate_limit: int):
+        lock = threading.Lock()
+        next_request_at = [0]
+
+        def pace():
+            with lock:
+                now = self.milliseconds()
+                delay = next_request_at[0] - now
+                next_request_at[0] = max(now, next_request_at[0]) + rate_limit
+            if delay > 0:
+                time.sleep(delay / 1000)
+
+        return pace
+
     def fetch_amm_instructions(self, symbol: Str = None, params={}):
         bullish_request = {
             "tradingAccountId": self.account_id,
@@ -411,6 +800,319 @@ class bullish(Exchange, ImplicitAPI):
     def _is_public_api(self, api: str) -> bool:
         return api == 'public' or api == 'publicV2'
     
+    def _make_ohlcv_request(self, symbol: str, timeframe='1m', since: Int = None, limit: Int = None):
+        if timeframe not in self.timeframes:
+            raise BadRequest("[fetch_ohlcv] timeframe '%s' is not supported" % timeframe)
+        request = {
+            'symbol': self.to_bullish_symbol(symbol),
+            'timeBucket': self.timeframes[timeframe],
+        }
+        if since is None:
+            if limit is None:
+                limit = 500
+            duration = self.parse_timeframe(timeframe) * 1000
+            since = self.milliseconds() - duration * limit
+
+        end = self.sum(since, limit * self.parse_timeframe(timeframe) * 1000)
+        request['createdAtDatetime[gte]'] = self.iso8601(since)
+        request['createdAtDatetime[lte]'] = self.iso8601(end)
+        return request
+
+    # Splits [since, until) of every symbol into requests of at most `chunkSize` candles, as (symbol, request) pairs
+    def _make_ohlcv_range_requests(self, symbols: List[str], timeframe='1m', since: Int = None, until: Int = None, params={}):
+        if since is None:
+            raise BadRequest("[fetch_ohlcv_range] The `since` parameter is required")
+        if until is None:
+            until = self.milliseconds()
+        chunk_size = max(self.safe_integer(params, 'chunkSize', self.options['ohlcvChunkSize']), 1)
+        concurrency = max(self.safe_integer(params, 'concurrency', self.options['ohlcvConcurrency']), 1)
+        rate_limit = self.safe_integer(params, 'rateLimit', self.options['backfillRateLimit'])
+        params = self.omit(params, ['chunkSize', 'concurrency', 'rateLimit'])
+        step = chunk_size * self.parse_timeframe(timeframe) * 1000
+        chunks = []
+        for symbol in symbols:
+            for start in range(since, until, step):
+                request = self._make_ohlcv_request(symbol, timeframe, start, chunk_size)
+                request['createdAtDatetime[lte]'] = self.iso8601(min(start + step, until) - 1)
+                chunks.append((symbol, request))
+        return chunks, until, concurrency, rate_limit, params
+
+    # Merges the chunks of every symbol in time order, and records the candles missing in last_ohlcv_gaps
+    def _merge_ohlcv_ranges(self, symbols: List[str], timeframe, since: int, until: int, chunks, responses):
+        candles = {symbol: {} for symbol in symbols}
+        for (symbol, _), response in zip(chunks, responses):
+            for candle in map(self.parse_ohlcv, response):
+                if candle[0] is not None and since <= candle[0] < until:
+                    candles[symbol].setdefault(candle[0], candle)
+        duration = self.parse_timeframe(timeframe) * 1000
+        result = {}
+        gaps = {}
+        for symbol in symbols:
+            result[symbol] = [candles[symbol][timestamp] for timestamp in sorted(candles[symbol])]
+            gaps[symbol] = self._find_ohlcv_gaps(result[symbol], duration, since, until)
+        self.last_ohlcv_gaps = gaps
+        return result
+
+    def _find_ohlcv_gaps(self, candles, duration: int, since: int, until: int):
+        gaps = []
+        expected = -(-since // duration) * duration
+        for candle in candles:
+            if candle[0] > expected:
+                gaps.append([expected, candle[0]])
+            expected = candle[0] + duration
+        if expected < until:
+            gaps.append([expected, until])
+        return gaps
+
+    def _resample_base_timeframe(self, timeframe: str):
+        duration = self.parse_timeframe(timeframe)
+        divisors = [native for native in self.timeframes
+                    if self.parse_timeframe(native) < duration and duration % self.parse_timeframe(native) == 0]
+        if not divisors:
+            raise BadRequest("[fetch_ohlcv] timeframe '%s' is not supported" % timeframe)
+        return max(divisors, key=self.parse_timeframe)
+
+    # Returns the native timeframe to aggregate, the start of the buckets to return, the start of the bucket still open,
+    # and the range of native candles to fetch, if any. Buckets start on multiples of their duration
+    def _make_resample_request(self, symbol: str, timeframe: str, since: Int = None, limit: Int = None):
+        base = self._resample_base_timeframe(timeframe)
+        duration = self.parse_timeframe(timeframe) * 1000
+        now = self.milliseconds()
+        if limit is None:
+            limit = 500
+        if since is None:
+            since = now - duration * limit
+        first = -(-since // duration) * duration
+        open_since = now // duration * duration
+        buckets = [bucket for bucket in range(first, first + limit * duration, duration) if bucket <= open_since]
+        cached = self.resampled_ohlcv.get((symbol, timeframe), {})
+        missing = [bucket for bucket in buckets if bucket == open_since or bucket not in cached]
+        fetch_range = (missing[0], missing[-1] + duration) if missing else None
+        return base, buckets, open_since, fetch_range
+
+    # Buckets are aggregated over the columns of the native candles, and cached once closed
+    def _resample_ohlcv(self, symbol: str, timeframe: str, buckets, open_since: int, candles):
+        from .columns import candle_rows_to_columns, resample_candle_columns
+        resampled = resample_candle_columns(candle_rows_to_columns(candles), self.parse_timeframe(timeframe) * 1000)
+        cached = self.resampled_ohlcv.setdefault((symbol, timeframe), {})
+        result = []
+        for bucket in buckets:
+            candle = cached.get(bucket)
+            if candle is None:
+                # The last bucket is partial until it closes
+                candle = resampled.get(bucket)
+                if candle is not None and bucket < open_since:
+                    cached[bucket] = candle
+            if candle is not None:
+                result.append(list(candle))
+        return result
+
+    # Responses of the reference data endpoints, served from options['metadataCacheDir'] when it is set. Stale
+    # entries are still returned, and refreshed by a background thread which reloads the markets if they changed.
+    # Requests with params other than reload are not cached, and reload skips the cached entry
+    def _fetch_metadata(self, name, method, params={}):
+        cache, key = self._get_metadata_cache(name)
+        if cache is None or self.omit(params, ['reload']):
+            return method(params)
+        cached = None if self.safe_bool(params, 'reload') else cache.load(key)
+        if cached is None:
+            payload = method(self.omit(params, ['reload']))
+            cache.store(key, payload)
+            return payload
+        payload, stale = cached
+        refresh = self.metadata_refreshes.get(key)
+        if stale and (refresh is None or not refresh.is_alive()):
+            refresh = self.metadata_refreshes[key] = threading.Thread(target=self._refresh_metadata, args=(cache, key, method), daemon=True)
+            refresh.start()
+        return payload
+
+    # Refreshes of the assets and the markets reload the markets one at a time
+    def _refresh_metadata(self, cache, key, method):
+        try:
+            if cache.store(key, method()):
+                with self.metadata_reload_lock:
+                    self.cached_currencies = None
+                    self.load_markets(True)
+        except Exception as e:
+            self.log("Refreshing the cached %s failed: %s" % (key, e), logging.WARN)
+
+    # The cache, and the name of the entry for the current environment
+    def _get_metadata_cache(self, name):
+        if self.options['metadataCacheDir'] is None:
+            return None, None
+        if self.metadata_cache is None or self.metadata_cache.directory != self.options['metadataCacheDir']:
+            from .metadata_cache import MetadataCache
+            self.metadata_cache = MetadataCache(self.options['metadataCacheDir'], self.options['metadataCacheTtl'])
+        self.metadata_cache.ttl = self.options['metadataCacheTtl']
+        return self.metadata_cache, name + '-' + self._environment_key()
+
+    # Short name of the current environment, from the URL of its public API
+    def _environment_key(self):
+        base_url = self.urls[ENVIRONMENT_URLS.get(self.environment, 'api')]['public']
+        return hashlib.sha256(base_url.encode('utf-8')).hexdigest()[:16]
+
+    def _prepare_cached_ohlcv(self, symbol: str, timeframe='1m', since: Int = None, until: Int = None):
+        if self.options['ohlcvCacheDir'] is None:
+            raise NotSupported("[fetch_cached_ohlcv] options['ohlcvCacheDir'] is not set")
+        if since is None:
+            raise BadRequest("[fetch_cached_ohlcv] The `since` parameter is required")
+        if timeframe not in self.timeframes:
+            raise BadRequest("[fetch_cached_ohlcv] timeframe '%s' is not supported" % timeframe)
+        # Every environment has its own entries
+        directory = os.path.join(self.options['ohlcvCacheDir'], self._environment_key())
+        if self.candle_cache is None or self.candle_cache.directory != directory:
+            from .candle_cache import CandleCache
+            self.candle_cache = CandleCache(directory)
+        duration = self.parse_timeframe(timeframe) * 1000
+        # Candles start on multiples of their duration, and the last one is still open
+        closed_until = self.milliseconds() // duration * duration
+        since = -(-since // duration) * duration
+        until = closed_until if until is None else min(-(-until // duration) * duration, closed_until)
+        return self.candle_cache, self.to_bullish_symbol(symbol), since, until
+
+    # Same range as fetch_ohlcv without cache, split into the closed candles [since, until) and the open one, if any
+    def _make_cached_ohlcv_bounds(self, timeframe='1m', since: Int = None, limit: Int = None):
+        duration = self.parse_timeframe(timeframe) * 1000
+        if limit is None:
+            limit = 500
+        if since is None:
+            since = self.milliseconds() - duration * limit
+        end = since + limit * duration
+        open_since = self.milliseconds() // duration * duration
+        return since, min(end + 1, open_since), open_since if end >= open_since else None
+
+    def _make_order_book_request(self, symbol: str, limit: Int = None, params={}):
+        if limit is not None:
+            raise NotSupported('fetch_order_book() with limit is not supported')
+        return {
+            'symbol': self.to_bullish_symbol(symbol),
+            'aggregationFactor': params['aggregationFactor'] if 'aggregationFactor' in params else self.options[
+                'defaultAggregation'],
+            'depth': params['depth'] if 'depth' in params else 100
+        }
+
+    def _make_create_order_request(self, symbol: str, type: OrderType, side: OrderSide, amount: float, price: Num = None, params={}):
+        if self.options['preTradeValidation'] is not None:
+            amount, price = self._validate_order(symbol, side, amount, price)
+        next_nonce = self.local_nonce()
+        time_in_force = params.get('timeInForce', self.options["defaultTimeInForce"])
+        request = {
+            "symbol": self.to_bullish_symbol(symbol), 
+            "commandType": "V3CreateOrder",
+            "side": self.options['sideMap'][side],
+            "type": self.options['typeMap'][type],
+            "timeInForce": time_in_force,
+            "quantity": str(amount),
+            "clientOrderId": next_nonce,
+            "tradingAccountId": self.account_id,
+        }
+        if price is not None:
+            request['price'] = str(price)
+        return request
+
+    def _validate_order(self, symbol: str, side: OrderSide, amount: float, price: Num = None):
+        mode = self.options['preTradeValidation']
+        if mode not in ('reject', 'round'):
+            raise BadRequest(self.id + " preTradeValidation must be None, 'reject' or 'round'")
+        return self._get_order_validator().validate(symbol, side, amount, price, mode == 'round')
+
+    # Takes the funds of a validated order out of the free balances checked by the next orders, until it is
+    # acknowledged or rejected. Returns the reservation to release when it is not acknowledged
+    def _reserve_order_funds(self, symbol: str, side: OrderSide, request):
+        if self.options['preTradeValidation'] is None or self.order_validator is None:
+            return None
+        price = request.get('price')
+        return self.order_validator.reserve(symbol, side, float(request['quantity']), None if price is None else float(price))
+
+    def _release_order_funds(self, reservation):
+        if reservation is not None:
+            self.order_validator.release(reservation)
+
+    def _get_order_validator(self):
+        if self.order_validator is None:
+            from .order_validator import OrderValidator
+            self.order_validator = OrderValidator(self.exceptions['exact'])
+        if self.markets and self.order_validator.markets is not self.markets:
+            self.order_validator.load_markets(self.markets)
+        return self.order_validator
+
+    def _parse_fetch_tickers_params(self, params={}):
+        concurrency = self.safe_integer(params, 'concurrency', self.options['fetchTickersConcurrency'])
+        partial = self.safe_bool(params, 'partial', False)
+        return concurrency, partial, self.omit(params, ['concurrency', 'partial'])
+
+    def _parse_create_orders_params(self, params={}):
+        concurrency = self.safe_integer(params, 'concurrency', self.options['createOrdersConcurrency'])
+        return concurrency, self.omit(params, ['concurrency'])
+
+    # Signed create order requests, or the error raised while building one, and the funds reserved by each order
+    def _sign_create_orders(self, orders: List[OrderRequest], params={}):
+        requests = []
+        reservations = []
+        for order in orders:
+            reservation = None
+            try:
+                order_params = self.extend(params, self.safe_dict(order, 'params', {}))
+                request = self._make_create_order_request(order['symbol'], order['type'], order['side'], order['amount'],
+                                                          self.safe_value(order, 'price'), order_params)
+                signed = self.sign(CREATE_ORDER_PATH, 'privateV2', 'POST', self.extend(request, order_params))
+                reservation = self._reserve_order_funds(order['symbol'], order['side'], request)
+                requests.append(signed)
+            except Exception as e:
+                requests.append(e)
+            reservations.append(reservation)
+        return requests, reservations
+
+    # Releases the funds of the orders which were not acknowledged
+    def _collect_create_orders(self, results, reservations):
+        self.last_create_orders_errors = {index: result for index, result in enumerate(results) if isinstance(result, Exception)}
+        for index in self.last_create_orders_errors:
+            self._release_order_funds(reservations[index])
+        return results
+
+    def _parse_format_params(self, params={}):
+        columns = self.safe_string(params, 'format', self.options['defaultFormat']) == 'columns'
+        return columns, self.omit(params, ['format'])
+
+    def _candles_to_columns(self, candles):
+        from .columns import candle_rows_to_columns
+        return candle_rows_to_columns(candles)
+
+    def _parse_order_book_params(self, params={}):
+        arrays = self.safe_bool(params, 'arrays', self.options['orderBookArrays'])
+        return arrays, self.omit(params, ['arrays'])
+
+    def _make_backfill_request(self, symbol: Str = None, since: Int = None, until: Int = None, params={}):
+        if since is None:
+            raise BadRequest("[backfill] The `since` parameter is required")
+        if until is None:
+            until = self.milliseconds()
+        concurrency = max(self.safe_integer(params, 'concurrency', self.options['backfillConcurrency']), 1)
+        window_count = max(self.safe_integer(params, 'windows', concurrency), 1)
+        rate_limit = self.safe_integer(params, 'rateLimit', self.options['backfillRateLimit'])
+        params = self.omit(params, ['concurrency', 'windows', 'rateLimit'])
+        request = self.extend(self._make_paginated_private_request(self.to_bullish_symbol(symbol), None, MAX_PAGE_SIZE, params), params)
+        windows = []
+        for start, end in self._split_time_range(since, until, window_count):
+            windows.append({'createdAtTimestamp[gte]': start, 'createdAtTimestamp[lte]': end - 1})
+        return request, windows, concurrency, rate_limit
+
+    # Splits [since, until) into at most `count` contiguous windows of (almost) equal length
+    def _split_time_range(self, since: int, until: int, count: int):
+        count = max(min(count, until - since), 1)
+        step = (until - since) / count
+        bounds = [since + int(step * i) for i in range(count)] + [until]
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def _merge_backfill(self, pages, parser):
+        merged = {}
+        for page in pages:
+            for item in page:
+                parsed = parser(item)
+                if parsed['id'] not in merged:
+                    merged[parsed['id']] = parsed
+        return sorted(merged.values(), key=lambda item: (item['timestamp'] or 0, item['id']))
+
     def _conform_page_size(self, limit):
         if limit <= 5:
             page_size = 5
@@ -466,12 +1168,14 @@ class bullish(Exchange, ImplicitAPI):
         return request
 
     def sign(self, path, api='public', method='GET', params={}, headers=None, body=None):
-        request = "/" + self.implode_params(path, params)
-        signing_path = urllib.parse.urlparse(self.urls['api'][api] + request).path
-        
-        query = self.keysort(self.omit(params, self.extract_params(path)))
+        path_params = self._get_path_params(path)
+        request = "/" + (self.implode_params(path, params) if path_params else path)
+        query = self.keysort(self.omit(params, path_params))
         if self._is_private_api(api):
-            creds = self.login()
+            creds = self.creds
+            # The async client logs in from fetch2() instead, as sign() itself cannot await
+            if self.synchronous and not self.session_manager.is_valid():
+                creds = self.login()
             if method == 'GET':
                 headers = {
                     'Accept': 'application/json',
@@ -482,15 +1186,12 @@ class bullish(Exchange, ImplicitAPI):
                 }
                 request += '?' + self.urlencode(query)
             if method == 'POST':
+                # Serialized once: the signature covers the exact body sent
                 body = self.json(query)
-                body_string = json.dumps(query, separators=(",", ":"))
-                secret_bytes = bytes(self.secret, 'utf-8')
-                nonce = str(self.nonce())
+                signer = self._get_signer()
                 next_nonce = self.local_nonce()
-                timestamp = str(int(datetime.now(timezone.utc).timestamp() * 1000))
-                payload = timestamp + next_nonce + "POST" + signing_path + body_string
-                digest = sha256(payload.encode("utf-8")).hexdigest().encode('utf-8')
-                signature = hmac.new(secret_bytes, digest, sha256).hexdigest()
+                timestamp = str(self.milliseconds())
+                signature = signer.sign_post(timestamp, next_nonce, signer.signing_path(self.urls['api'][api], request), body)
                 headers = {
                     "Content-type": "application/json",
                     "Authorization": 'Bearer ' + self.safe_string(creds, 'token'),
@@ -498,8 +1199,9 @@ class bullish(Exchange, ImplicitAPI):
                     "BX-TIMESTAMP": timestamp,
                     "BX-NONCE": next_nonce,
                     'BM-AUTH-APIKEY': self.apiKey,
-                    "BX-RATELIMIT-TOKEN": f"{self.rate_limit_token}"
                 }
+                if self.rate_limit_token is not None:
+                    headers["BX-RATELIMIT-TOKEN"] = self.rate_limit_token
 
         elif self._is_public_api(api):
             if query and method == 'GET':
@@ -507,10 +1209,10 @@ class bullish(Exchange, ImplicitAPI):
 
             # Special case to handle login using the HMAC flow    
             if HMAC_LOGIN_PATH == path:
+                signer = self._get_signer()
                 nonce = str(self.nonce())
-                ts = str(int(datetime.now(timezone.utc).timestamp() * 1000))
-                message = ts + nonce + "GET" + signing_path
-                signature = hmac.new(bytes(self.secret, 'utf-8'), message.encode("utf-8"), sha256).hexdigest()
+                ts = str(self.milliseconds())
+                signature = signer.sign_login(ts, nonce, signer.signing_path(self.urls['api'][api], request))
                 headers = {
                     'BX-PUBLIC-KEY': self.apiKey,
                     'BX-NONCE': nonce,
@@ -518,14 +1220,22 @@ class bullish(Exchange, ImplicitAPI):
                     'BX-TIMESTAMP': ts
                 }
         # This gives the ability to switch from PROD to UAT/DEV accounts
-        url_key = 'api'
-        if self.environment == 'DEV':
-            url_key = 'dev'
-        if self.environment == 'UAT':
-            url_key = 'uat'
-        url = self.urls[url_key][api] + request
+        url = self.urls[ENVIRONMENT_URLS.get(self.environment, 'api')][api] + request
         return {'url': url, 'method': method, 'body': body, 'headers': headers}
 
+    # Names of the {placeholders} of an endpoint path, parsed once per endpoint
+    def _get_path_params(self, path):
+        path_params = self.path_params.get(path)
+        if path_params is None:
+            path_params = self.path_params[path] = self.extract_params(path)
+        return path_params
+
+    # The signer is keyed once, and again only if the secret is changed
+    def _get_signer(self):
+        if self.signer is None or self.signer.secret != self.secret:
+            self.signer = Signer(self.secret)
+        return self.signer
+
 
     ### Response parsing
     ####################    
@@ -537,6 +1247,43 @@ class bullish(Exchange, ImplicitAPI):
         }
     
 
+    def _collect_tickers(self, symbols: List[str], results, partial=False):
+        tickers = {}
+        errors = {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                if not partial:
+                    raise result
+                errors[symbol] = result
+            else:
+                tickers[result['symbol']] = result
+        self.last_tickers_errors = errors
+        return tickers
+
+    def _parse_balances(self, response):
+        balances = {balance['asset']: balance for balance in map(self.parse_balance, response)}
+        if self.options['preTradeValidation'] is not None:
+            self._get_order_validator().update_balances(balances)
+        return balances
+
+    def _parse_paginated_response(self, response, parser):
+        self.last_pagination_metadata = self._parse_pagination_metadata(self.safe_dict(response, 'links'))
+        self.log("Pagination datadata updated.", self.last_pagination_metadata)
+        return list(map(parser, self.safe_list(response, 'data')))
+
+    # Same as _parse_paginated_response, with the items of the page parsed at once by a batch parser
+    def _parse_paginated_batch(self, response, parser):
+        return parser(self._parse_paginated_response(response, lambda item: item))
+
+    # Returns the raw items of a page, and the cursor of the next page if there is one
+    def _parse_page(self, response):
+        items = self.safe_list(response, 'data', [])
+        self.last_pagination_metadata = self._parse_pagination_metadata(self.safe_dict(response, 'links'))
+        next_page = self.safe_string(self.last_pagination_metadata['next'], '_nextPage')
+        if not items:
+            next_page = None
+        return items, next_page
+
     def _linkToParams(self, link):
         if link is None:
             return None
@@ -558,7 +1305,7 @@ class bullish(Exchange, ImplicitAPI):
 
     
     def parse_ticker(self, ticker, symbol):
-        return {
+        return self._make_record('ticker', {
             'symbol': symbol,
             'timestamp': self.safe_integer(ticker, 'createdAtTimestamp'),
             'datetime': self.safe_string(ticker, 'createdAtDatetime'),
@@ -579,7 +1326,45 @@ class bullish(Exchange, ImplicitAPI):
             'baseVolume': self.safe_float(ticker, 'baseVolume'),
             'quoteVolume': self.safe_float(ticker, 'quoteVolume'),
             'info': ticker,
-        }
+        })
+
+    # Batch versions of parse_order, parse_trade and parse_ticker producing the same structures, see fast_parsers
+    def parse_orders_fast(self, orders):
+        from .fast_parsers import parse_orders_fast
+        return self._make_records('order', parse_orders_fast(self, orders))
+
+    def parse_trades_fast(self, trades):
+        from .fast_parsers import parse_trades_fast
+        return self._make_records('trade', parse_trades_fast(self, trades))
+
+    def parse_tickers_fast(self, tickers, symbols: List[str]):
+        from .fast_parsers import parse_tickers_fast
+        return self._make_records('ticker', parse_tickers_fast(self, tickers, symbols))
+
+    # Applies options['compactRecords'] and options['recordInfo'] to a parsed structure
+    def _make_record(self, kind, values):
+        compact, info_mode = self._parse_record_options()
+        if compact:
+            from .records import make_record
+            return make_record(kind, values, info_mode)
+        if info_mode == 'drop':
+            values['info'] = None
+        return values
+
+    def _make_records(self, kind, values):
+        compact, info_mode = self._parse_record_options()
+        if not compact and info_mode == 'keep':
+            return values
+        return [self._make_record(kind, value) for value in values]
+
+    def _parse_record_options(self):
+        compact = self.options['compactRecords']
+        info_mode = self.options['recordInfo']
+        if info_mode not in RECORD_INFO_MODES:
+            raise BadRequest(self.id + ' recordInfo must be one of ' + ', '.join(RECORD_INFO_MODES))
+        if info_mode == 'lazy' and not compact:
+            raise NotSupported(self.id + " recordInfo 'lazy' requires compactRecords")
+        return compact, info_mode
 
     def parse_ohlcv(self, ohlcv, market=None):
         return [
@@ -663,7 +1448,7 @@ class bullish(Exchange, ImplicitAPI):
             taker_or_maker = 'taker'
         else:
             taker_or_maker = "maker"
-        return {
+        return self._make_record('trade', {
             'id': self.safe_string(trade, 'tradeId'),
             'datetime': self.safe_string(trade, 'createdAtDatetime', None),
             'timestamp': self.safe_integer(trade, 'createdAtTimestamp', None),
@@ -675,8 +1460,17 @@ class bullish(Exchange, ImplicitAPI):
             'cost': amount * price,
             'takerOrMaker': taker_or_maker,
             'info': trade,
-        }
+        })
     
+    # Private requests carry the rate limit token of the trading account in use, once the accounts were fetched
+    def _set_rate_limit_token(self, accounts):
+        if self.rate_limit_token is None:
+            for account in accounts:
+                if account['code'] is not None and (self.account_id is None or account['id'] == self.account_id):
+                    self.rate_limit_token = account['code']
+                    break
+        return accounts
+
     def parse_account(self, account):
         return {
             'id': self.safe_string(account, 'tradingAccountId'),
@@ -687,7 +1481,7 @@ class bullish(Exchange, ImplicitAPI):
         }
     
     def parse_balance(self, balance):
-        return {
+        return self._make_record('balance', {
             'asset': self.safe_string(balance, 'assetSymbol'),
             'datetime': self.safe_string(balance, 'updatedAtDatetime'),
             'timestamp': self.safe_integer(balance, 'updatedAtTimestamp'),
@@ -695,14 +1489,15 @@ class bullish(Exchange, ImplicitAPI):
             'used': self.safe_number(balance, 'lockedQuantity'),
             'accountId': self.safe_string(balance, 'tradingAccountId'),
             'info': balance,
-        }
+        })
     
     def parse_order(self, order, market: Market = None):
         fee = self.safe_number(order, 'baseFee', 0.0) + self.safe_number(order, 'quoteFee', 0.0)
         avg_price = self.safe_number(order, 'avgPrice', self.safe_number(order, 'price', 0.0))
         quantity = self.safe_number(order, 'quantity', 0.0)
+        filled = self.safe_number(order, 'quantityFilled', DEFAULT_QUANTITY_FILLED)
         cost = avg_price * quantity
-        return {
+        return self._make_record('order', {
             'id': self.safe_string(order, 'orderId'),
             'clientOrderId': self.safe_string(order, 'clientOrderId'),
             'datetime': self.safe_string(order, 'createdAtDatetime'),
@@ -715,9 +1510,9 @@ class bullish(Exchange, ImplicitAPI):
             'side': self.parse_side(self.safe_string(order, 'side')),
             'price': self.safe_number(order, 'price'),
             'average': avg_price,
-            'amount': self.safe_number(order, 'quantity', 0.0),
-            'filled': self.safe_number(order, 'quantityFilled', '0.0'),
-            'remaining': self.safe_number(order, 'quantity', 0.0) - self.safe_number(order, 'quantityFilled', '0.0'),
+            'amount': quantity,
+            'filled': filled,
+            'remaining': quantity - filled,
             'stopPrice': self.safe_number(order, 'stopPrice'),
             'takeProfitPrice': self.safe_number(order, 'takeProfitPrice'),
             'cost': cost,
@@ -728,8 +1523,13 @@ class bullish(Exchange, ImplicitAPI):
                 'rate': None,
             },
             'info': order,
-        }
+        })
     
+    # ccxt copies every position into a new dict while extending it with params, so records are made afterwards
+    def parse_positions(self, positions, symbols: List[str] = None, params={}):
+        parsed = super(bullish, self).parse_positions(positions, symbols, params)
+        return [self._make_record('position', position) for position in parsed]
+
     def parse_position(self, position, market: Market = None):
         return {
             'symbol': self.to_unified_symbol(self.safe_string(position, 'symbol')),
@@ -745,9 +1545,11 @@ class bullish(Exchange, ImplicitAPI):
     
     def parse_order_status(self, status):
         statuses = {
+            'OPEN': 'open',
             'NEW': 'open',
             'LIVE': 'open',
             'PARTIAL': 'open',
+            'CLOSED': 'closed',
             'FILLED': 'closed',
             'REJECTED': 'closed',
             'CANCELLED': 'canceled',
@@ -822,6 +1624,14 @@ class bullish(Exchange, ImplicitAPI):
             'nonce': self.safe_integer(orderbook, 'sequenceNumber'),
         }
 
+    # The levels are parsed in bulk into float arrays, and kept in the order sent by the API (best first)
+    def _parse_array_order_book(self, orderbook: object, symbol: str, timestamp: Int = None):
+        from .array_order_book import ArrayOrderBook, parse_levels
+        bid_prices, bid_amounts = parse_levels(self.safe_list(orderbook, 'bids', []))
+        ask_prices, ask_amounts = parse_levels(self.safe_list(orderbook, 'asks', []))
+        return ArrayOrderBook(symbol, bid_prices, bid_amounts, ask_prices, ask_amounts, timestamp,
+                              self.iso8601(timestamp), self.safe_integer(orderbook, 'sequenceNumber'))
+
     def _parse_bids_asks(self, bidasks, priceKey: str, amountKey: str):
         bidasks = self.to_array(bidasks)
         result = []
@@ -834,6 +1644,52 @@ class bullish(Exchange, ImplicitAPI):
         amount = self.safe_number(bidask, amountKey)
         return [price, amount]
     
+    def fetch2(self, path, api='public', method='GET', params={}, headers=None, body=None, config={}):
+        try:
+            return self._fetch2(path, api, method, params, headers, body, config)
+        except AuthenticationError:
+            if not self._is_private_api(api):
+                raise
+            self.log("Session was rejected, logging in again before replaying the request", logging.WARN)
+            self.session_manager.invalidate()
+            return self._fetch2(path, api, method, params, headers, body, config)
+
+    # Exchange.fetch2, throttled by the budget of the api instead of the single ccxt rateLimit
+    def _fetch2(self, path, api='public', method='GET', params={}, headers=None, body=None, config={}):
+        if self.enableRateLimit:
+            self.throttle(self.calculate_rate_limiter_cost(api, method, path, params, config), self._rate_limit_budget(api))
+        self.lastRestRequestTimestamp = self.milliseconds()
+        request = self.sign(path, api, method, params, headers, body)
+        self.last_request_headers = request['headers']
+        self.last_request_body = request['body']
+        self.last_request_url = request['url']
+        return self.fetch(request['url'], request['method'], request['headers'], request['body'])
+
+    ### Rate limiting #####
+
+    # fetch_tickers and the range fetches call in from several threads, which all draw from the same buckets
+    def throttle(self, cost=None, budget='public'):
+        delay = self.rate_limiter.reserve(budget, 1 if cost is None else cost)
+        if delay > 0:
+            time.sleep(delay)
+
+    def calculate_rate_limiter_cost(self, api, method, path, params, config={}):
+        cost = self.safe_number(config, 'cost')
+        if cost is None:
+            cost = self.safe_number(self.options['rateLimitCosts'], method + ' ' + path, 1)
+        return cost
+
+    def _rate_limit_budget(self, api):
+        return 'private' if self._is_private_api(api) else 'public'
+
+    def on_rest_response(self, code, reason, url, method, response_headers, response_body, request_headers, request_body):
+        if self.enableRateLimit and response_headers is not None:
+            # Only private requests are sent with a session token
+            budget = 'private' if 'Authorization' in (request_headers or {}) else 'public'
+            headers = {str(name).lower(): value for name, value in response_headers.items()}
+            self.rate_limiter.on_response(budget, code, headers, self.options['rateLimitHeaders'], self.options['rateLimitBackoff'] / 1000)
+        return super(bullish, self).on_rest_response(code, reason, url, method, response_headers, response_body, request_headers, request_body)
+
     ### Error handling #####
     
     def handle_errors(self, statusCode, statusText, url, method, responseHeaders, responseBody, response, requestHeaders, requestBody):
@@ -0,0 +1,161 @@
+import json
+import mmap
+import os
+import shutil
+import threading
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: entries are only locked between the threads of a process
+    fcntl = None
+
+from .columns import CANDLE_COLUMNS as COLUMNS, CandleColumns
+
+INDEX_FILE = 'range.json'
+LOCK_FILE = 'lock'
+
+
+# Closed candles stored on disk per (symbol, timeframe) with one file per column, in native byte order. The index
+# records the time ranges [since, until) fetched, the number of candles stored and the generation of the column
+# files. Candles missing from a fetched range were not returned by the exchange and are not requested again.
+# Candles following all the stored ones are appended to the column files, others are merged into a new generation,
+# as the files of the current one may still be mapped by earlier loads. Processes sharing the directory read and
+# update an entry under an exclusive lock on its lock file
+class CandleCache:
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.lock = threading.Lock()
+
+    def covered_ranges(self, symbol, timeframe):
+        return [tuple(covered) for covered in self._read_index(self._path(symbol, timeframe))['ranges']]
+
+    # Parts of [since, until) not covered yet
+    def missing_ranges(self, symbol, timeframe, since, until):
+        ranges = []
+        for start, end in self.covered_ranges(symbol, timeframe):
+            if since >= until or start >= until:
+                break
+            if since < start:
+                ranges.append((since, start))
+            since = max(since, end)
+        if since < until:
+            ranges.append((since, until))
+        return ranges
+
+    # Adds the candles fetched for the closed range [since, until), which is covered even when it has no candle
+    def store(self, symbol, timeframe, since, until, candles):
+        path = self._path(symbol, timeframe)
+        candles = [candle for candle in candles if since <= candle[0] < until]
+        os.makedirs(path, exist_ok=True)
+        with self._locked(path):
+            index = self._read_index(path)
+            count = index['count']
+            generation = index['generation']
+            data = os.path.join(path, str(generation))
+            views = self._map(data, count) if count and candles else None
+            if views is not None and candles[0][0] > views['timestamp'][-1] and self._is_intact(data, count):
+                self._append(data, candles)
+                count += len(candles)
+            elif candles:
+                merged = {}
+                if views is not None:
+                    merged.update((row[0], list(row)) for row in zip(*(views[name] for name, _ in COLUMNS)))
+                merged.update((candle[0], candle) for candle in candles)
+                generation += 1
+                self._write(os.path.join(path, str(generation)), [merged[timestamp] for timestamp in sorted(merged)])
+                count = len(merged)
+            covered = self._merge(index['ranges'] + [[since, until]])
+            self._write_index(path, {'ranges': covered, 'count': count, 'generation': generation})
+            if generation != index['generation']:
+                # Mappings of the removed files stay valid
+                shutil.rmtree(data, ignore_errors=True)
+
+    # The candles are returned as memoryviews over the memory-mapped files, so that they are not copied
+    def load(self, symbol, timeframe, since, until):
+        path = self._path(symbol, timeframe)
+        views = None
+        if os.path.isdir(path):
+            with self._locked(path):
+                index = self._read_index(path)
+                if index['count']:
+                    views = self._map(os.path.join(path, str(index['generation'])), index['count'])
+        if views is None:
+            return CandleColumns({name: memoryview(array(code)) for name, code in COLUMNS})
+        timestamps = views['timestamp']
+        start = bisect_left(timestamps, since)
+        end = bisect_left(timestamps, until, start)
+        return CandleColumns({name: view[start:end] for name, view in views.items()})
+
+    def _path(self, symbol, timeframe):
+        return os.path.join(self.directory, symbol, timeframe)
+
+    @contextmanager
+    def _locked(self, path):
+        with self.lock:
+            fd = os.open(os.path.join(path, LOCK_FILE), os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                # Closing the file releases the lock
+                os.close(fd)
+
+    def _read_index(self, path):
+        try:
+            with open(os.path.join(path, INDEX_FILE)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'ranges': [], 'count': 0, 'generation': 0}
+
+    def _write_index(self, path, index):
+        temporary = os.path.join(path, INDEX_FILE + '.tmp')
+        with open(temporary, 'w') as f:
+            json.dump(index, f)
+        os.replace(temporary, os.path.join(path, INDEX_FILE))
+
+    # Sorted ranges, with the overlapping and adjacent ones joined
+    def _merge(self, ranges):
+        merged = []
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        return merged
+
+    # The first `count` values of every column. Values appended by a write that was interrupted before the index was
+    # updated are past them
+    def _map(self, data, count):
+        views = {}
+        for name, code in COLUMNS:
+            with open(os.path.join(data, name), 'rb') as f:
+                # The mapping stays valid once the file is closed
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            views[name] = memoryview(mapped)[:count * array(code).itemsize].cast(code)
+        return views
+
+    # Whether the column files hold the indexed candles only, so that more can be appended
+    def _is_intact(self, data, count):
+        return all(os.path.getsize(os.path.join(data, name)) == count * array(code).itemsize for name, code in COLUMNS)
+
+    def _append(self, data, candles):
+        for index, (name, code) in enumerate(COLUMNS):
+            with open(os.path.join(data, name), 'ab') as f:
+                self._column(candles, index, code).tofile(f)
+
+    def _write(self, data, candles):
+        os.makedirs(data, exist_ok=True)
+        for index, (name, code) in enumerate(COLUMNS):
+            with open(os.path.join(data, name), 'wb') as f:
+                self._column(candles, index, code).tofile(f)
+
+    def _column(self, candles, index, code):
+        if code == 'q':
+            return array(code, (candle[index] for candle in candles))
+        # Values missing from the response are stored as NaN
+        return array(code, (float('nan') if candle[index] is None else candle[index] for candle in candles))
@@ -0,0 +1,166 @@
+from array import array
+from bisect import bisect_left
+from operator import methodcaller
+
+# Names and array type codes of the columns, in the order of the rows returned by fetch_ohlcv
+CANDLE_COLUMNS = (
+    ('timestamp', 'q'),
+    ('open', 'd'),
+    ('high', 'd'),
+    ('low', 'd'),
+    ('close', 'd'),
+    ('volume', 'd'),
+)
+TRADE_COLUMNS = (
+    ('timestamp', 'q'),
+    ('id', 'q'),
+    ('order', 'q'),
+    ('price', 'd'),
+    ('amount', 'd'),
+    ('side', 'b'),
+    ('taker', 'b'),
+)
+SIDES = {'BUY': 1, 'SELL': -1}
+
+
+# Rows held as one typed array (or memoryview) per field. to_numpy() wraps them without copying
+class Columns:
+    names = ()
+
+    def __init__(self, columns):
+        self.columns = columns
+
+    def __len__(self):
+        return len(self.columns[self.names[0]])
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def to_numpy(self):
+        import numpy
+        return {name: numpy.asarray(self.columns[name]) for name in self.columns}
+
+
+class CandleColumns(Columns):
+    names = tuple(name for name, _ in CANDLE_COLUMNS)
+
+    # Same rows as returned by fetch_ohlcv
+    def to_list(self):
+        return [list(row) for row in zip(*(self.columns[name] for name in self.names))]
+
+
+# Trades with their sides as 1 (buy) or -1 (sell), and taker as 1 or 0. Symbols are kept as a list of unified symbols
+class TradeColumns(Columns):
+    names = tuple(name for name, _ in TRADE_COLUMNS) + ('symbol',)
+
+
+# Rows without a valid timestamp are skipped, as fetch_ohlcv_range does
+def candle_columns(candles):
+    candles, timestamps = decode_timestamps(candles)
+    columns = {'timestamp': timestamps}
+    columns.update(
+        (name, decode_column(candles, key, code))
+        for (name, code), key in zip(CANDLE_COLUMNS[1:], ('open', 'high', 'low', 'close', 'volume'))
+    )
+    return CandleColumns(columns)
+
+
+# For candles already parsed into rows, such as the ones served by the candle cache. Rows without a timestamp are
+# skipped, as fetch_ohlcv_range does
+def candle_rows_to_columns(candles):
+    candles = [candle for candle in candles if candle[0] is not None]
+    return CandleColumns({
+        name: array(code, [float('nan') if candle[index] is None else candle[index] for candle in candles])
+        for index, (name, code) in enumerate(CANDLE_COLUMNS)
+    })
+
+
+# Trades without a valid timestamp are skipped. Taker is only set by a boolean isTaker, as in parse_trade
+# Aggregates candles sorted by timestamp into buckets of `duration` milliseconds, returned as rows by bucket. Every
+# bucket is a slice of the columns, reduced by the builtins. Missing values are left out, and a bucket without any
+# value for a field has None for it, as parse_ohlcv returns
+def resample_candle_columns(columns, duration):
+    timestamps = columns['timestamp']
+    opens, highs, lows, closes, volumes = (columns[name] for name in CandleColumns.names[1:])
+    resampled = {}
+    start = 0
+    while start < len(timestamps):
+        bucket = timestamps[start] // duration * duration
+        end = bisect_left(timestamps, bucket + duration, start)
+        resampled[bucket] = [
+            bucket,
+            reduce_present(first, opens[start:end]),
+            reduce_present(max, highs[start:end]),
+            reduce_present(min, lows[start:end]),
+            reduce_present(last, closes[start:end]),
+            reduce_present(sum, volumes[start:end]),
+        ]
+        start = end
+    return resampled
+
+
+def first(values):
+    return values[0]
+
+
+def last(values):
+    return values[-1]
+
+
+# Missing values are stored as NaN, which is the only value not equal to itself
+def reduce_present(function, values):
+    total = sum(values)
+    if total == total:
+        return function(values)
+    present = [value for value in values if value == value]
+    return function(present) if present else None
+
+
+def trade_columns(trades, to_unified_symbol):
+    trades, timestamps = decode_timestamps(trades)
+    columns = {'timestamp': timestamps}
+    columns.update(
+        (name, decode_column(trades, key, code))
+        for (name, code), key in zip(TRADE_COLUMNS[1:5], ('tradeId', 'orderId', 'price', 'quantity'))
+    )
+    columns['side'] = array('b', [SIDES.get(side, 0) for side in map(methodcaller('get', 'side'), trades)])
+    columns['taker'] = array('b', [is_taker is True for is_taker in map(methodcaller('get', 'isTaker'), trades)])
+    symbols = {}
+    columns['symbol'] = [symbols[symbol] if symbol in symbols else symbols.setdefault(symbol, to_unified_symbol(symbol))
+                         for symbol in map(methodcaller('get', 'symbol'), trades)]
+    return TradeColumns(columns)
+
+
+# Returns the rows with a timestamp, and their timestamps. Timestamps are converted as safe_integer does
+def decode_timestamps(rows):
+    timestamps = map(methodcaller('get', 'createdAtTimestamp'), rows)
+    try:
+        return rows, array('q', map(int, timestamps))
+    except (TypeError, ValueError):
+        decoded = [(row, integer(row.get('createdAtTimestamp'))) for row in rows]
+        decoded = [(row, timestamp) for row, timestamp in decoded if timestamp is not None]
+        return [row for row, _ in decoded], array('q', [timestamp for _, timestamp in decoded])
+
+
+def integer(value):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+# Converts the `key` field of every row at once. Missing or malformed values are decoded as NaN, or 0 for the ids
+def decode_column(rows, key, code):
+    convert = int if code == 'q' else float
+    try:
+        return array(code, map(convert, map(methodcaller('get', key), rows)))
+    except (TypeError, ValueError):
+        missing = 0 if code == 'q' else float('nan')
+
+        def decode(value):
+            try:
+                return convert(value)
+            except (TypeError, ValueError):
+                return missing
+
+        return array(code, map(decode, map(methodcaller('get', key), rows)))
@@ -0,0 +1,137 @@
+# Batch versions of parse_order, parse_trade and parse_ticker, returning the same structures.
+# Fields are read with dict.get and converted by the functions below, which follow the conversions of
+# safe_string / safe_integer / safe_float / safe_number without their generic checks. Symbols, statuses,
+# sides and types are resolved through the exchange once per distinct value of the batch
+from .bullish import DEFAULT_QUANTITY_FILLED
+
+
+def string(value, default=None):
+    if value is None or value == '':
+        return default
+    return str(value)
+
+
+def integer(value, default=None):
+    if value is None or value == '':
+        return default
+    try:
+        return int(float(value))
+    except (ValueError, TypeError):
+        return default
+
+
+def number(value, default=None):
+    if value is None or value == '':
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+# Lookup table filled on first use of every key
+class Memo(dict):
+
+    def __init__(self, function):
+        super(Memo, self).__init__()
+        self.function = function
+
+    def __missing__(self, key):
+        value = self[key] = self.function(key)
+        return value
+
+
+def parse_orders_fast(exchange, orders):
+    statuses = Memo(exchange.parse_order_status)
+    types = Memo(exchange.parse_order_type)
+    sides = Memo(exchange.parse_side)
+    symbols = Memo(exchange.to_unified_symbol)
+    result = []
+    for order in orders:
+        get = order.get
+        price = number(get('price'))
+        average = number(get('avgPrice'), 0.0 if price is None else price)
+        quantity = number(get('quantity'), 0.0)
+        filled = number(get('quantityFilled'), DEFAULT_QUANTITY_FILLED)
+        result.append({
+            'id': string(get('orderId')),
+            'clientOrderId': string(get('clientOrderId')),
+            'datetime': string(get('createdAtDatetime')),
+            'timestamp': integer(get('createdAtTimestamp')),
+            'lastTradeTimestamp': None,
+            'status': statuses[string(get('status'))],
+            'symbol': symbols[string(get('symbol'))],
+            'type': types[string(get('type'))],
+            'timeInForce': string(get('timeInForce')),
+            'side': sides[string(get('side'))],
+            'price': price,
+            'average': average,
+            'amount': quantity,
+            'filled': filled,
+            'remaining': quantity - filled,
+            'stopPrice': number(get('stopPrice')),
+            'takeProfitPrice': number(get('takeProfitPrice')),
+            'cost': average * quantity,
+            'trades': [],
+            'fee': {
+                'currency': None,
+                'cost': number(get('baseFee'), 0.0) + number(get('quoteFee'), 0.0),
+                'rate': None,
+            },
+            'info': order,
+        })
+    return result
+
+
+def parse_trades_fast(exchange, trades):
+    sides = Memo(exchange.parse_side)
+    symbols = Memo(exchange.to_unified_symbol)
+    result = []
+    for trade in trades:
+        get = trade.get
+        amount = number(get('quantity'), 0.0)
+        price = number(get('price'), 0.0)
+        result.append({
+            'id': string(get('tradeId')),
+            'datetime': string(get('createdAtDatetime')),
+            'timestamp': integer(get('createdAtTimestamp')),
+            'symbol': symbols[string(get('symbol'))],
+            'order': string(get('orderId')),
+            'side': sides[string(get('side'))],
+            'price': price,
+            'amount': amount,
+            'cost': amount * price,
+            'takerOrMaker': 'taker' if get('isTaker') is True else 'maker',
+            'info': trade,
+        })
+    return result
+
+
+# `symbols` lists the unified symbol of every ticker, as they are not part of the ticker payload
+def parse_tickers_fast(exchange, tickers, symbols):
+    result = []
+    for ticker, symbol in zip(tickers, symbols):
+        get = ticker.get
+        result.append({
+            'symbol': symbol,
+            'timestamp': integer(get('createdAtTimestamp')),
+            'datetime': string(get('createdAtDatetime')),
+            'high': number(get('high')),
+            'low': number(get('low')),
+            'bid': number(get('bestBid')),
+            'bidVolume': number(get('bidVolume')),
+            'ask': number(get('bestAsk')),
+            'askVolume': number(get('askVolume')),
+            'vwap': number(get('vwap')),
+            'open': number(get('open')),
+            'close': number(get('close')),
+            'last': number(get('last')),
+            'previousClose': number(get('previousClose')),
+            'change': number(get('change')),
+            'percentage': number(get('percentage')),
+            'average': number(get('average')),
+            'baseVolume': number(get('baseVolume')),
+            'quoteVolume': number(get('quoteVolume')),
+            'info': ticker,
+        })
+    return result
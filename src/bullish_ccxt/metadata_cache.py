@@ -0,0 +1,53 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+# Raw responses of the reference data endpoints (assets, markets) kept on disk, so that new processes load markets
+# without waiting for the API. Each entry records when it was fetched and a hash of its content: a refresh whose
+# content has the same hash only renews the entry, like a 304 answer to an If-None-Match request would.
+# Files are written to a temporary file and renamed over the entry, so processes sharing the directory only ever
+# read complete entries
+class MetadataCache:
+
+    def __init__(self, directory, ttl):
+        self.directory = directory
+        # milliseconds after which an entry is served once more while it is refreshed
+        self.ttl = ttl
+
+    # Returns the payload of the entry and whether it is stale, or None when there is no readable entry
+    def load(self, key):
+        try:
+            with open(self._path(key)) as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        return entry['data'], now() - entry['fetchedAt'] >= self.ttl
+
+    # Stores a fresh payload. Returns False when it is the one already cached
+    def store(self, key, payload):
+        etag = content_hash(payload)
+        try:
+            with open(self._path(key)) as f:
+                changed = json.load(f)['etag'] != etag
+        except (FileNotFoundError, ValueError, KeyError):
+            changed = True
+        os.makedirs(self.directory, exist_ok=True)
+        temporary = '%s.%d.%d.tmp' % (self._path(key), os.getpid(), threading.get_ident())
+        with open(temporary, 'w') as f:
+            json.dump({'fetchedAt': now(), 'etag': etag, 'data': payload}, f, separators=(',', ':'))
+        os.replace(temporary, self._path(key))
+        return changed
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+
+def content_hash(payload):
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+def now():
+    return int(time.time() * 1000)
@@ -0,0 +1,67 @@
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: the file still persists the high-water mark, but is not locked between processes
+    fcntl = None
+
+WIDTH = 20
+
+
+# Strictly increasing nonces, in microseconds since the epoch. A value is the current time, or the last value
+# plus one when the clock did not move forward since (same microsecond, or a step back of the wall clock).
+# With a `path`, the last value is kept in that file: it survives restarts, and processes sharing the file
+# take their values under an exclusive lock on it, so that they never hand out the same value. The file stays
+# open until close(), or until the generator is collected. Writes are not synced to disk, as values lost with
+# the page cache are behind the clock after a reboot anyway
+class NonceGenerator:
+
+    def __init__(self, path=None, clock=time.time):
+        self.path = path
+        self.clock = clock
+        self.last = 0
+        self.lock = threading.Lock()
+        self.fd = None
+        if path is not None:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+
+    def next(self):
+        with self.lock:
+            if self.fd is None:
+                self.last = self._next(self.last)
+                return self.last
+            if fcntl is not None:
+                fcntl.flock(self.fd, fcntl.LOCK_EX)
+            try:
+                self.last = self._next(max(self.last, self._read()))
+                os.lseek(self.fd, 0, os.SEEK_SET)
+                os.write(self.fd, str(self.last).rjust(WIDTH).encode('ascii'))
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self.fd, fcntl.LOCK_UN)
+            return self.last
+
+    # Values handed out afterwards are no longer persisted
+    def close(self):
+        with self.lock:
+            if self.fd is not None:
+                os.close(self.fd)
+                self.fd = None
+
+    def __del__(self):
+        # The descriptor is missing when __init__ failed
+        if getattr(self, 'fd', None) is not None:
+            os.close(self.fd)
+
+    def _next(self, last):
+        return max(int(self.clock() * 1_000_000), last + 1)
+
+    def _read(self):
+        os.lseek(self.fd, 0, os.SEEK_SET)
+        value = os.read(self.fd, WIDTH).strip()
+        return int(value) if value else 0
@@ -0,0 +1,124 @@
+import logging
+
+from ccxt.async_support.base.ws.order_book import OrderBook
+from ccxt.base.errors import RequestTimeout
+
+from .websocket_stream import WebSocketStream
+
+L2_ORDER_BOOK_TOPIC = 'l2Orderbook'
+L2_ORDER_BOOK_DATA_TYPE = 'V1TALevel2'
+
+
+# Maintains L2 order books from the snapshot sent on subscription and the updates that follow it.
+# Every update has to carry the sequence number following the one last applied. On a gap the symbol
+# is re-subscribed, and its updates are dropped until the fresh snapshot arrives
+class OrderBookStream(WebSocketStream):
+
+    def __init__(self, exchange, url, reconnect_delay=1000, ping_interval=30):
+        super(OrderBookStream, self).__init__(exchange, url, reconnect_delay, ping_interval)
+        self.books = {}
+        self.synced = {}
+        # Number of snapshots and updates applied per symbol, and the last one handed out by watch()
+        self.versions = {}
+        self.watched_versions = {}
+
+    # Returns a copy of the book as soon as it changed since the previous call
+    def watch(self, symbol, limit=None, timeout=None):
+        if symbol not in self.subscriptions:
+            self.subscribe(symbol, {'topic': L2_ORDER_BOOK_TOPIC, 'symbol': symbol})
+        watched = self.watched_versions.get(symbol, 0)
+        self.wait_for(lambda: self.synced.get(symbol) and self.versions[symbol] > watched, timeout)
+        with self.condition:
+            self.check_open()
+            if not (self.synced.get(symbol) and self.versions[symbol] > watched):
+                raise RequestTimeout("[watch_order_book] No order book update received for " + symbol)
+            self.watched_versions[symbol] = self.versions[symbol]
+            return self.copy_book(symbol, limit)
+
+    def unwatch(self, symbol):
+        self.unsubscribe(symbol)
+        with self.condition:
+            for state in (self.books, self.synced, self.versions, self.watched_versions):
+                state.pop(symbol, None)
+
+    def copy_book(self, symbol, limit=None):
+        book = self.books[symbol]
+        return {
+            'symbol': self.exchange.to_unified_symbol(symbol),
+            'bids': [list(level) for level in book['bids'][:limit]],
+            'asks': [list(level) for level in book['asks'][:limit]],
+            'timestamp': book['timestamp'],
+            'datetime': book['datetime'],
+            'nonce': book['nonce'],
+        }
+
+    def on_connected(self):
+        # Snapshots are sent again for every subscription
+        for symbol in self.synced:
+            self.synced[symbol] = False
+
+    def handle_message(self, message):
+        if self.exchange.safe_string(message, 'dataType') != L2_ORDER_BOOK_DATA_TYPE:
+            if 'error' in message:
+                self.exchange.log("WebSocket command failed: %s", logging.WARN, message)
+            return
+        data = self.exchange.safe_dict(message, 'data', {})
+        symbol = self.exchange.safe_string(data, 'symbol')
+        if symbol not in self.subscriptions:
+            return
+        message_type = self.exchange.safe_string(message, 'type')
+        if message_type == 'snapshot':
+            self.handle_snapshot(symbol, data)
+        elif message_type == 'update':
+            self.handle_update(symbol, data)
+
+    def handle_snapshot(self, symbol, data):
+        timestamp = self.exchange.safe_integer(data, 'timestamp')
+        snapshot = {
+            'bids': self.parse_levels(self.exchange.safe_list(data, 'bids', [])),
+            'asks': self.parse_levels(self.exchange.safe_list(data, 'asks', [])),
+            'nonce': self.exchange.safe_integer(data, 'sequenceNumber'),
+            'timestamp': timestamp,
+            'symbol': symbol,
+        }
+        if symbol in self.books:
+            self.books[symbol].reset(snapshot)
+        else:
+            self.books[symbol] = OrderBook(snapshot)
+        self.synced[symbol] = True
+        self.versions[symbol] = self.versions.get(symbol, 0) + 1
+
+    def handle_update(self, symbol, data):
+        if not self.synced.get(symbol):
+            return
+        book = self.books[symbol]
+        sequence_number = self.exchange.safe_integer(data, 'sequenceNumber')
+        if sequence_number is None or sequence_number <= book['nonce']:
+            return
+        if sequence_number != book['nonce'] + 1:
+            self.exchange.log("Order book %s skipped from %s to %s, resyncing", logging.WARN,
+                              symbol, book['nonce'], sequence_number)
+            self.resync(symbol)
+            return
+        for price, amount in self.parse_levels(self.exchange.safe_list(data, 'bids', [])):
+            book['bids'].store(price, amount)
+        for price, amount in self.parse_levels(self.exchange.safe_list(data, 'asks', [])):
+            book['asks'].store(price, amount)
+        book['nonce'] = sequence_number
+        book['timestamp'] = self.exchange.safe_integer(data, 'timestamp', book['timestamp'])
+        book['datetime'] = self.exchange.iso8601(book['timestamp'])
+        self.versions[symbol] += 1
+
+    def resync(self, symbol):
+        self.synced[symbol] = False
+        params = self.subscriptions[symbol]
+        self.send_command('unsubscribe', params)
+        self.send_command('subscribe', params)
+
+    # Levels are sent as a flat list of alternating prices and quantities. A quantity of 0 removes the level
+    def parse_levels(self, levels):
+        if levels and isinstance(levels[0], dict):
+            return [[float(level['price']), float(level['priceLevelQuantity'])] for level in levels]
+        if levels and isinstance(levels[0], list):
+            return [[float(price), float(amount)] for price, amount in levels]
+        return [[float(levels[i]), float(levels[i + 1])] for i in range(0, len(levels) - 1, 2)]
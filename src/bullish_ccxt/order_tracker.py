@@ -0,0 +1,131 @@
+from ccxt.base.types import Str, Int
+
+CLOSED_STATUSES = ('CLOSED', 'CANCELLED', 'REJECTED', 'FILLED')
+
+
+# Keeps a local table of open orders, indexed by orderId and clientOrderId, up to date by polling deltas only:
+#   - orders created since the last poll
+#   - orders that traded since the last poll, looked up by id
+#   - every `reconcile_every` polls, the list of open orders, to pick up cancellations made elsewhere
+# Orders are only parsed again when their payload changed. Each change is reported as an event
+# {'type': 'new' | 'fill' | 'status', 'order': ..., 'previous': ...} to the listeners, and returned by refresh().
+# Orders first seen closed are reported as 'new', followed by 'fill' if they traded and 'status'
+class OrderTracker:
+
+    def __init__(self, exchange, symbol: Str = None, since: Int = None, reconcile_every: int = 10, lookback: int = 5000):
+        self.exchange = exchange
+        self.symbol = symbol
+        self.reconcile_every = reconcile_every
+        # Overlap between polls, covering clock skew and orders recorded late by the exchange
+        self.lookback = lookback
+        self.watermark = since
+        self.refresh_count = 0
+        self.orders = {}
+        self.orders_by_client_order_id = {}
+        self.raw_orders = {}
+        # Local time at which recently closed orders were seen closed, so that they are not reported again
+        self.closed_orders = {}
+        self.listeners = []
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def get(self, id: str):
+        return self.orders.get(id)
+
+    def get_by_client_order_id(self, client_order_id: str):
+        return self.orders_by_client_order_id.get(client_order_id)
+
+    def open_orders(self):
+        return list(self.orders.values())
+
+    def refresh(self):
+        started_at = self.exchange.milliseconds()
+        changed = {}
+        reconcile = self.watermark is None or self.refresh_count % self.reconcile_every == 0
+        if reconcile:
+            for order in self._fetch_open_orders():
+                changed[order['orderId']] = order
+        if self.watermark is not None:
+            since = self.watermark - self.lookback
+            for order in self._fetch_orders_since(since):
+                changed[order['orderId']] = order
+            for id in self._fetch_traded_order_ids(since):
+                if id not in changed:
+                    changed[id] = self._fetch_order(id)
+        if reconcile:
+            # Orders no longer listed as open were closed, possibly without trading
+            for id in list(self.orders.keys()):
+                if id not in changed:
+                    changed[id] = self._fetch_order(id)
+        self.watermark = started_at
+        self.refresh_count += 1
+        # Orders closed before the next lookback window cannot be listed again
+        self.closed_orders = {id: closed_at for id, closed_at in self.closed_orders.items()
+                              if closed_at >= started_at - self.lookback}
+
+        events = []
+        for order in changed.values():
+            events.extend(self._apply(order))
+        for event in events:
+            for listener in self.listeners:
+                listener(event)
+        return events
+
+    def _apply(self, raw_order):
+        id = self.exchange.safe_string(raw_order, 'orderId')
+        if id in self.closed_orders or self.raw_orders.get(id) == raw_order:
+            return []
+        previous_raw = self.raw_orders.get(id)
+        previous = self.orders.get(id)
+        order = self.exchange.parse_order(raw_order)
+        events = []
+        if previous is None:
+            events.append({'type': 'new', 'order': order, 'previous': None})
+            if not self._is_open(raw_order):
+                if order['filled']:
+                    events.append({'type': 'fill', 'order': order, 'previous': None})
+                events.append({'type': 'status', 'order': order, 'previous': None})
+        else:
+            if order['filled'] != previous['filled']:
+                events.append({'type': 'fill', 'order': order, 'previous': previous})
+            if self.exchange.safe_string(raw_order, 'status') != self.exchange.safe_string(previous_raw, 'status'):
+                events.append({'type': 'status', 'order': order, 'previous': previous})
+        if self._is_open(raw_order):
+            self.raw_orders[id] = raw_order
+            self.orders[id] = order
+            if order['clientOrderId'] is not None:
+                self.orders_by_client_order_id[order['clientOrderId']] = order
+        else:
+            self._remove(id)
+            self.closed_orders[id] = self.exchange.milliseconds()
+        return events
+
+    def _remove(self, id: str):
+        order = self.orders.pop(id, None)
+        self.raw_orders.pop(id, None)
+        if order is not None and order['clientOrderId'] is not None:
+            self.orders_by_client_order_id.pop(order['clientOrderId'], None)
+
+    def _is_open(self, raw_order):
+        return self.exchange.safe_string(raw_order, 'status') not in CLOSED_STATUSES
+
+    def _fetch_open_orders(self):
+        return list(self.exchange.iter_raw_orders(self.symbol, params={'status': 'OPEN'}))
+
+    def _fetch_orders_since(self, since: int):
+        return list(self.exchange.iter_raw_orders(self.symbol, since))
+
+    def _fetch_traded_order_ids(self, since: int):
+        ids = {}
+        for trade in self.exchange.iter_raw_my_trades(self.symbol, since):
+            id = self.exchange.safe_string(trade, 'orderId')
+            if id is not None:
+                ids[id] = True
+        return list(ids.keys())
+
+    def _fetch_order(self, id: str):
+        return self.exchange.privateGetOrderById({
+            'tradingAccountId': self.exchange.account_id,
+            'id': id,
+        })
@@ -0,0 +1,127 @@
+import math
+
+# Relative tolerance on prices and amounts scaled to their precision, for floats such as 0.1 + 0.2
+TOLERANCE = 1e-12
+
+
+# Rules of a market, taken once from its parsed precision and limits
+class SymbolRules:
+    __slots__ = ('base', 'quote', 'spot', 'price_scale', 'amount_scale', 'min_price', 'max_price',
+                 'min_amount', 'max_amount', 'min_cost', 'max_cost')
+
+    def __init__(self, market):
+        limits = market['limits']
+        self.base = market['base']
+        self.quote = market['quote']
+        self.spot = bool(market['spot'])
+        self.price_scale = scale(market['precision']['price'])
+        self.amount_scale = scale(market['precision']['amount'])
+        self.min_price = limits['price']['min']
+        self.max_price = limits['price']['max']
+        self.min_amount = limits['amount']['min']
+        self.max_amount = limits['amount']['max']
+        self.min_cost = limits['cost']['min']
+        self.max_cost = limits['cost']['max']
+
+
+# Checks orders before they are signed, against the rules of their market and the free balances of the last
+# fetch_balance / watch_balance, so that orders the exchange would reject never leave the process. Each failed check
+# raises the error mapped to the code the exchange would answer with. With `rounding` set, prices are moved to the tick
+# on the passive side (down for buys, up for sells) and amounts rounded down, instead of being rejected.
+# Checking an order does not change the free balances: the client reserves the funds of a spot order once it is
+# signed, releases them when it is not acknowledged, and the next balance snapshot replaces all reservations
+class OrderValidator:
+
+    def __init__(self, exceptions):
+        self.exceptions = exceptions
+        self.markets = None
+        self.rules = {}
+        self.free = None
+        # Incremented by each balance snapshot, so that reservations made before it are not released into it
+        self.generation = 0
+
+    def load_markets(self, markets):
+        self.markets = markets
+        self.rules = {symbol: SymbolRules(market) for symbol, market in markets.items()}
+
+    def update_balances(self, balances):
+        self.free = {asset: balance['free'] for asset, balance in balances.items()}
+        self.generation += 1
+
+    # Returns the amount and price to send. Orders on unknown markets are left to the exchange
+    def validate(self, symbol, side, amount, price=None, rounding=False):
+        rules = self.rules.get(symbol)
+        if rules is None:
+            return amount, price
+        side = side.lower()
+        amount = self.check_step(amount, rules.amount_scale, False, rounding, 'ORDER_SIZE_OUTSIDE_VALID_RANGE')
+        self.check_range(amount, rules.min_amount, rules.max_amount, 'ORDER_SIZE_OUTSIDE_VALID_RANGE')
+        if price is not None:
+            price = self.check_step(price, rules.price_scale, side == 'sell', rounding, 'PRICE_MUST_BE_OF_TICK_SIZE')
+            self.check_range(price, rules.min_price, rules.max_price, 'BAD_PRICE_OR_QUANTITY')
+            self.check_range(amount * price, rules.min_cost, rules.max_cost, 'ORDER_SIZE_OUTSIDE_VALID_RANGE')
+        if rules.spot and self.free is not None:
+            self.check_funds(rules, side, amount, price)
+        return amount, price
+
+    def check_step(self, value, step_scale, up, rounding, code):
+        if step_scale is None:
+            return value
+        scaled = value * step_scale
+        tolerance = TOLERANCE * max(1.0, abs(scaled))
+        steps = math.floor(scaled + tolerance) if not up else math.ceil(scaled - tolerance)
+        if abs(scaled - steps) <= tolerance:
+            return value
+        if not rounding:
+            self.reject(code, '%s is not a multiple of %s' % (value, 1 / step_scale))
+        return steps / step_scale
+
+    def check_range(self, value, minimum, maximum, code):
+        if (minimum is not None and value < minimum) or (maximum is not None and value > maximum):
+            self.reject(code, '%s is outside [%s, %s]' % (value, minimum, maximum))
+
+    def check_funds(self, rules, side, amount, price):
+        funds = self.funds(rules, side, amount, price)
+        if funds is None:
+            return
+        asset, needed, code = funds
+        free = self.free.get(asset) or 0.0
+        if needed > free * (1 + TOLERANCE):
+            self.reject(code, '%s %s needed, %s free' % (needed, asset, free))
+
+    # Takes the funds of a validated spot order out of the free balances. Returns the reservation to release
+    # if the order is not acknowledged, or None when nothing was reserved
+    def reserve(self, symbol, side, amount, price=None):
+        rules = self.rules.get(symbol)
+        if rules is None or not rules.spot or self.free is None:
+            return None
+        funds = self.funds(rules, side.lower(), amount, price)
+        if funds is None:
+            return None
+        asset, needed, _ = funds
+        self.free[asset] = (self.free.get(asset) or 0.0) - needed
+        return self.generation, asset, needed
+
+    def release(self, reservation):
+        if reservation is None:
+            return
+        generation, asset, needed = reservation
+        if generation == self.generation and self.free is not None:
+            self.free[asset] = (self.free.get(asset) or 0.0) + needed
+
+    # The asset an order spends, the quantity of it, and the code of the rejection when it is short
+    def funds(self, rules, side, amount, price):
+        if side == 'buy':
+            # The cost of market buys is not known up front
+            if price is None:
+                return None
+            return rules.quote, amount * price, 'NOT_ENOUGH_FUNDS__BUY_LIMIT_ORDER'
+        return rules.base, amount, 'NOT_ENOUGH_FUNDS__SELL_LIMIT_ORDER'
+
+    def reject(self, code, detail):
+        raise self.exceptions[code]('bullish ' + code + ' (pre-trade check): ' + detail)
+
+
+# Multiplier turning a number of decimals into whole steps
+def scale(precision):
+    return None if precision is None else 10 ** precision
@@ -0,0 +1,129 @@
+import logging
+from collections import OrderedDict, deque
+
+from ccxt.base.errors import RequestTimeout
+
+from .websocket_stream import WebSocketStream
+
+ORDERS_TOPIC = 'orders'
+TRADES_TOPIC = 'trades'
+BALANCE_TOPIC = 'assetAccounts'
+TOPICS_BY_DATA_TYPE = {
+    'V1TAOrder': ORDERS_TOPIC,
+    'V1TATrade': TRADES_TOPIC,
+    'V1TAAssetAccount': BALANCE_TOPIC,
+}
+CLOSED_STATUSES = ('CLOSED', 'CANCELLED', 'REJECTED', 'FILLED')
+# Trade ids remembered to drop the trades sent again in the snapshot following a reconnect
+MAX_SEEN_TRADES = 1000
+
+
+# Streams the orders, trades and asset balances of the trading account over the private data socket,
+# authenticated with the JWT obtained by the HMAC login. Orders and trades are queued as they change
+# until handed out by watch_updates(), while balances are kept as the latest state of every asset.
+# Queues hold up to options['wsMaxPendingUpdates'] updates: when they are not drained, the oldest are dropped
+class PrivateStream(WebSocketStream):
+
+    def __init__(self, exchange, url, reconnect_delay=1000, ping_interval=30):
+        super(PrivateStream, self).__init__(exchange, url, reconnect_delay, ping_interval)
+        self.max_pending = exchange.options['wsMaxPendingUpdates']
+        self.pending = {ORDERS_TOPIC: deque(maxlen=self.max_pending), TRADES_TOPIC: deque(maxlen=self.max_pending)}
+        # Updates dropped from full queues, by topic
+        self.dropped_updates = {ORDERS_TOPIC: 0, TRADES_TOPIC: 0}
+        # Last payload of every open order, so that orders sent again unchanged are not queued twice
+        self.raw_orders = {}
+        self.seen_trades = OrderedDict()
+        self.balances = {}
+        self.balance_version = 0
+        self.watched_balance_version = 0
+
+    # The token is read again on every (re)connection, so that refreshed sessions are picked up
+    def headers(self):
+        try:
+            creds = self.exchange.login() if self.exchange.synchronous else self.exchange.creds
+        except Exception as e:
+            # The connection is rejected and attempted again after the reconnect delay
+            self.exchange.log("WebSocket login failed: %s", logging.WARN, e)
+            return []
+        token = self.exchange.safe_string(creds, 'token')
+        return ['Authorization: Bearer ' + token] if token is not None else []
+
+    # Returns the orders or trades received since the previous call, waiting for at least one
+    def watch_updates(self, topic, symbol=None, limit=None, timeout=None):
+        self.ensure_subscribed(topic)
+
+        def matches(update):
+            return symbol is None or self.exchange.safe_string(update, 'symbol') == symbol
+
+        self.wait_for(lambda: any(matches(update) for update in self.pending[topic]), timeout)
+        with self.condition:
+            self.check_open()
+            updates = []
+            remaining = deque(maxlen=self.max_pending)
+            for update in self.pending[topic]:
+                if matches(update) and (limit is None or len(updates) < limit):
+                    updates.append(update)
+                else:
+                    remaining.append(update)
+            if not updates:
+                raise RequestTimeout("[watch_" + topic + "] No update received")
+            self.pending[topic] = remaining
+            return updates
+
+    # Returns the balances of every asset as soon as one of them changed since the previous call
+    def watch_balance(self, timeout=None):
+        self.ensure_subscribed(BALANCE_TOPIC)
+        watched = self.watched_balance_version
+        self.wait_for(lambda: self.balance_version > watched, timeout)
+        with self.condition:
+            self.check_open()
+            if self.balance_version <= watched:
+                raise RequestTimeout("[watch_balance] No balance update received")
+            self.watched_balance_version = self.balance_version
+            return list(self.balances.values())
+
+    def ensure_subscribed(self, topic):
+        if topic not in self.subscriptions:
+            self.subscribe(topic, {'topic': topic, 'tradingAccountId': self.exchange.account_id})
+
+    def handle_message(self, message):
+        topic = self.exchange.safe_string(TOPICS_BY_DATA_TYPE, self.exchange.safe_string(message, 'dataType'))
+        if topic is None:
+            if 'error' in message:
+                self.exchange.log("WebSocket command failed: %s", logging.WARN, message)
+            return
+        if topic not in self.subscriptions:
+            return
+        data = message.get('data')
+        updates = data if isinstance(data, list) else [data]
+        for update in updates:
+            if isinstance(update, dict):
+                self.handle_update(topic, update)
+
+    def handle_update(self, topic, update):
+        if topic == ORDERS_TOPIC:
+            id = self.exchange.safe_string(update, 'orderId')
+            if self.raw_orders.get(id) == update:
+                return
+            if self.exchange.safe_string(update, 'status') in CLOSED_STATUSES:
+                self.raw_orders.pop(id, None)
+            else:
+                self.raw_orders[id] = update
+            self.queue(ORDERS_TOPIC, update)
+        elif topic == TRADES_TOPIC:
+            id = self.exchange.safe_string(update, 'tradeId')
+            if id in self.seen_trades:
+                return
+            self.seen_trades[id] = True
+            if len(self.seen_trades) > MAX_SEEN_TRADES:
+                self.seen_trades.popitem(last=False)
+            self.queue(TRADES_TOPIC, update)
+        else:
+            self.balances[self.exchange.safe_string(update, 'assetSymbol')] = update
+            self.balance_version += 1
+
+    def queue(self, topic, update):
+        pending = self.pending[topic]
+        if len(pending) == pending.maxlen:
+            self.dropped_updates[topic] += 1
+        pending.append(update)
@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import time
+
+
+# Budget of `capacity` requests refilled at `refill_rate` requests per second. Callers reserve their cost up
+# front and are told how long to wait for it, so the lock is only held for the bookkeeping and the same bucket
+# can be shared by threads (time.sleep) and coroutines (asyncio.sleep). Tokens go negative while requests are
+# queued, which keeps them in the order they were reserved
+class TokenBucket:
+
+    def __init__(self, capacity, refill_rate, clock=time.monotonic):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.clock = clock
+        self.tokens = capacity
+        self.updated_at = clock()
+        # Set after a 429 or when the exchange reports the budget as spent
+        self.paused_until = 0
+        self.lock = threading.Lock()
+
+    # Takes `cost` tokens, and returns the seconds to wait before sending the request
+    def reserve(self, cost=1):
+        with self.lock:
+            now = self._refill()
+            self.tokens -= cost
+            delay = -self.tokens / self.refill_rate if self.tokens < 0 else 0
+            return max(delay, self.paused_until - now, 0)
+
+    # Takes `cost` tokens if they are available, without queueing. Returns the seconds until they would be
+    def try_take(self, cost=1):
+        with self.lock:
+            self._refill()
+            if self.tokens < cost:
+                return (cost - self.tokens) / self.refill_rate
+            self.tokens -= cost
+            return 0
+
+    # Aligns the bucket on the budget left reported by the exchange, and pauses it until
+    # `reset_in` seconds have passed when nothing is left
+    def observe(self, remaining, reset_in=None):
+        with self.lock:
+            now = self._refill()
+            self.tokens = min(self.tokens, remaining)
+            if remaining <= 0 and reset_in:
+                self.paused_until = max(self.paused_until, now + reset_in)
+
+    # Stops handing out tokens for `seconds`, after the exchange rejected a request
+    def back_off(self, seconds):
+        with self.lock:
+            now = self._refill()
+            self.tokens = min(self.tokens, 0)
+            self.paused_until = max(self.paused_until, now + seconds)
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+        self.updated_at = now
+        return now
+
+
+# One bucket per budget ('public' and 'private'), configured by options['rateLimits']
+class RateLimiter:
+
+    def __init__(self, limits, clock=time.monotonic):
+        self.buckets = {
+            name: TokenBucket(limit['capacity'], limit['refillRate'], clock) for name, limit in limits.items()
+        }
+
+    def reserve(self, budget, cost=1):
+        return self.buckets[budget].reserve(cost)
+
+    # Adapts the bucket to the rate limit headers of a response, given as {name: value} with lowercase names
+    def on_response(self, budget, status, headers, header_names, backoff):
+        bucket = self.buckets[budget]
+        remaining = parse_header_number(headers.get(header_names['remaining']))
+        reset_in = parse_reset(headers.get(header_names['reset']), time.time())
+        if status == 429:
+            retry_after = parse_header_number(headers.get('retry-after'))
+            bucket.back_off(next(delay for delay in (retry_after, reset_in, backoff) if delay))
+        elif remaining is not None:
+            bucket.observe(remaining, reset_in)
+
+
+# Stands in for ccxt's async Throttler, which open() hands the event loop to
+class AsyncThrottle:
+
+    def __init__(self, exchange):
+        self.exchange = exchange
+        self.loop = None
+
+    async def __call__(self, cost=None, budget='public'):
+        delay = self.exchange.rate_limiter.reserve(budget, 1 if cost is None else cost)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def parse_header_number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# Seconds until the budget is reset. The header may hold a delay in seconds, or a time in seconds or milliseconds
+def parse_reset(value, now):
+    reset = parse_header_number(value)
+    if reset is None:
+        return None
+    if reset > 1e12:
+        reset = reset / 1000 - now
+    elif reset > 1e9:
+        reset = reset - now
+    return max(reset, 0)
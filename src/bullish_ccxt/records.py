@@ -0,0 +1,76 @@
+import json
+from collections.abc import Mapping
+
+# What is kept of the raw payload in 'info': all of it, all of it encoded as a JSON string and decoded
+# when read, or nothing
+INFO_MODES = ('keep', 'lazy', 'drop')
+
+record_types = {}
+
+
+# A parsed structure held in slots instead of a dict. It reads like the dict it replaces (record['price'],
+# record.get('fee'), iteration, comparison with dicts), and dict(record) converts it back. The fields are
+# also available as attributes, except 'info' which is only decoded on access
+class Record(Mapping):
+    __slots__ = ('_info',)
+    fields = ()
+
+    def __init__(self, values):
+        for name in self.fields:
+            setattr(self, name, values[name])
+
+    @property
+    def info(self):
+        info = self._info
+        return json.loads(info) if isinstance(info, str) else info
+
+    @info.setter
+    def info(self, info):
+        self._info = info
+
+    def __getitem__(self, name):
+        if name not in self.fields:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def __setitem__(self, name, value):
+        if name not in self.fields:
+            raise KeyError(name)
+        setattr(self, name, value)
+
+    def __iter__(self):
+        return iter(self.fields)
+
+    def __len__(self):
+        return len(self.fields)
+
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, dict(self))
+
+
+# Record class for the structures of `kind` with these fields, created on first use
+def record_type(kind, fields):
+    key = (kind, fields)
+    if key not in record_types:
+        name = kind.title() + 'Record'
+        record_types[key] = type(name, (Record,), {
+            '__slots__': tuple(field for field in fields if field != 'info'),
+            'fields': fields,
+        })
+    return record_types[key]
+
+
+# Structures extended with keys that cannot be slots (see parse_positions) are left as dicts
+def make_record(kind, values, info_mode='keep'):
+    if 'info' in values and info_mode != 'keep':
+        values['info'] = encode_info(values['info'], info_mode)
+    fields = tuple(values)
+    if not all(field.isidentifier() and not hasattr(Record, field) for field in fields if field != 'info'):
+        return values
+    return record_type(kind, fields)(values)
+
+
+def encode_info(info, info_mode):
+    if info_mode == 'drop':
+        return None
+    return json.dumps(info, separators=(',', ':'))
@@ -0,0 +1,125 @@
+import asyncio
+import base64
+import json
+import logging
+import threading
+
+from ccxt.base.errors import PermissionDenied
+
+
+# Returns the expiry of a JWT in milliseconds, or None when the token does not carry an exp claim
+def parse_token_expiry(token):
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        return int(claims['exp']) * 1000
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+# Keeps the JWT obtained through the HMAC login valid for the lifetime of the exchange object.
+# Tokens are refreshed by a background timer ahead of their expiry, so that private requests keep
+# using the current token while the next one is obtained.
+class SessionManager:
+
+    def __init__(self, exchange):
+        self.exchange = exchange
+        self.expires_at = None
+        self.timer = None
+        self.lock = threading.Lock()
+
+    def is_valid(self):
+        if not self.exchange.creds:
+            return False
+        return self.expires_at is None or self.exchange.milliseconds() < self.expires_at
+
+    def refresh(self, params={}, force=False):
+        with self.lock:
+            # Another caller may have logged in while this one was waiting for the lock
+            if not force and self.is_valid():
+                return self.exchange.creds
+            return self.on_login(self.exchange.publicGetHmacLogin(params))
+
+    def on_login(self, creds):
+        if not creds or not creds.get('token'):
+            raise PermissionDenied("Login unsuccessful. Please check apiKey and secret")
+        expires_at = parse_token_expiry(creds['token'])
+        if expires_at is None:
+            expires_at = self.exchange.milliseconds() + self.exchange.options['sessionTtl']
+        self.exchange.creds = creds
+        self.expires_at = expires_at
+        self.schedule_refresh(self.refresh_delay())
+        return creds
+
+    def invalidate(self):
+        self.cancel_refresh()
+        self.exchange.creds = None
+        self.expires_at = None
+
+    def close(self):
+        self.cancel_refresh()
+
+    def refresh_delay(self):
+        refresh_at = self.expires_at - self.exchange.options['sessionRefreshMargin']
+        return max(refresh_at - self.exchange.milliseconds(), 0)
+
+    def retry_delay(self):
+        remaining = self.expires_at - self.exchange.milliseconds() if self.expires_at is not None else 0
+        return min(self.exchange.options['sessionRetryInterval'], max(remaining // 2, 0))
+
+    def schedule_refresh(self, delay):
+        self.cancel_refresh()
+        if not self.exchange.options['sessionAutoRefresh']:
+            return
+        self.timer = threading.Timer(delay / 1000, self.background_refresh)
+        self.timer.daemon = True
+        self.timer.start()
+
+    def cancel_refresh(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+    def background_refresh(self):
+        try:
+            self.refresh(force=True)
+            self.exchange.log("Session refreshed in the background")
+        except Exception as e:
+            # The current token stays in use until it expires, after which the next private request logs in again
+            self.exchange.log("Background session refresh failed: %s", logging.WARN, e)
+            if self.is_valid():
+                self.schedule_refresh(self.retry_delay())
+
+
+# Same lifecycle as SessionManager, with the login awaited and the refresh scheduled on the event loop
+class AsyncSessionManager(SessionManager):
+
+    def __init__(self, exchange):
+        super(AsyncSessionManager, self).__init__(exchange)
+        # Created on first use, as locks are bound to the running event loop on older Python versions
+        self.lock = None
+
+    async def refresh(self, params={}, force=False):
+        if self.lock is None:
+            self.lock = asyncio.Lock()
+        async with self.lock:
+            if not force and self.is_valid():
+                return self.exchange.creds
+            return self.on_login(await self.exchange.publicGetHmacLogin(params))
+
+    def schedule_refresh(self, delay):
+        self.cancel_refresh()
+        if not self.exchange.options['sessionAutoRefresh']:
+            return
+        loop = asyncio.get_running_loop()
+        self.timer = loop.call_later(delay / 1000, lambda: asyncio.ensure_future(self.background_refresh()))
+
+    async def background_refresh(self):
+        try:
+            await self.refresh(force=True)
+            self.exchange.log("Session refreshed in the background")
+        except Exception as e:
+            self.exchange.log("Background session refresh failed: %s", logging.WARN, e)
+            if self.is_valid():
+                self.schedule_refresh(self.retry_delay())
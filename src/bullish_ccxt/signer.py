@@ -0,0 +1,33 @@
+import hmac
+from hashlib import sha256
+from urllib.parse import urlparse
+
+
+# Signs requests with an HMAC-SHA256 state keyed once with the API secret. Every signature is computed on a
+# copy of that state, so the key is not hashed again per request. The path component of the base URLs, which
+# takes part in the signed message, is parsed once per URL. As in the URL path, the query string is not signed
+class Signer:
+
+    def __init__(self, secret):
+        self.secret = secret
+        self.keyed = hmac.new(secret.encode('utf-8'), digestmod=sha256)
+        self.base_paths = {}
+
+    def signing_path(self, base_url, request):
+        base_path = self.base_paths.get(base_url)
+        if base_path is None:
+            base_path = self.base_paths[base_url] = urlparse(base_url).path
+        return base_path + request.partition('?')[0]
+
+    # Private POST requests sign the SHA-256 hex digest of the message, which ends with the body as sent
+    def sign_post(self, timestamp, nonce, path, body):
+        digest = sha256((timestamp + nonce + 'POST' + path + body).encode('utf-8')).hexdigest()
+        return self.sign(digest.encode('utf-8'))
+
+    def sign_login(self, timestamp, nonce, path):
+        return self.sign((timestamp + nonce + 'GET' + path).encode('utf-8'))
+
+    def sign(self, message):
+        signature = self.keyed.copy()
+        signature.update(message)
+        return signature.hexdigest()
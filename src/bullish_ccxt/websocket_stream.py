@@ -0,0 +1,161 @@
+import json
+import logging
+import socket
+import threading
+
+import websocket
+from ccxt.base.errors import ExchangeClosedByUser
+
+
+# A WebSocket connection running on a background thread, speaking the Bullish JSON-RPC protocol.
+# Subscriptions are remembered so that they are sent again whenever the connection is (re)established,
+# and the connection is re-opened after `reconnect_delay` milliseconds whenever it drops.
+class WebSocketStream:
+
+    def __init__(self, exchange, url, reconnect_delay=1000, ping_interval=30):
+        self.exchange = exchange
+        self.url = url
+        self.reconnect_delay = reconnect_delay
+        self.ping_interval = ping_interval
+        self.subscriptions = {}
+        # Orders subscribing against (re)connecting, so that each subscription is sent exactly once
+        self.subscriptions_lock = threading.Lock()
+        self.app = None
+        self.thread = None
+        self.closed = False
+        self.stopped = threading.Event()
+        self.connected = threading.Event()
+        # Held while reading or mutating the state maintained from the messages
+        self.condition = threading.Condition()
+        self.request_id = 0
+
+    ## Overridden by the concrete streams
+
+    def handle_message(self, message):
+        pass
+
+    def headers(self):
+        return []
+
+    def on_connected(self):
+        pass
+
+    ## Connection lifecycle
+
+    def connect(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.closed = False
+            self.stopped.clear()
+            self.thread = threading.Thread(target=self.run, name='bullish-ws', daemon=True)
+            self.thread.start()
+
+    def run(self):
+        while not self.closed:
+            self.app = websocket.WebSocketApp(
+                self.url,
+                header=self.headers(),
+                on_open=self._on_open,
+                on_message=self._on_message,
+                on_error=self._on_error,
+                on_close=self._on_close,
+            )
+            self.app.run_forever(ping_interval=self.ping_interval)
+            self.connected.clear()
+            if not self.closed:
+                self.exchange.log("WebSocket disconnected from %s, reconnecting", logging.WARN, self.url)
+                self.stopped.wait(self.reconnect_delay / 1000)
+
+    def close(self):
+        self.closed = True
+        self.stopped.set()
+        if self.app is not None:
+            self.app.keep_running = False
+            self._shutdown(self.app)
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout=5)
+        with self.condition:
+            self.condition.notify_all()
+
+    # Closing the socket from another thread would leave the reader blocked on it. The close frame is sent and the
+    # socket shut down instead, which wakes the reader up to tear the connection down on its own thread
+    def _shutdown(self, app):
+        try:
+            app.sock.send_close()
+            app.sock.sock.shutdown(socket.SHUT_RDWR)
+        except (AttributeError, OSError, websocket.WebSocketException):
+            pass
+
+    def check_open(self):
+        if self.closed:
+            raise ExchangeClosedByUser("WebSocket stream to " + self.url + " was closed")
+
+    def wait_until_connected(self, timeout=None):
+        self.connect()
+        return self.connected.wait(timeout)
+
+    ## Subscriptions
+
+    def subscribe(self, key, params):
+        with self.subscriptions_lock:
+            self.subscriptions[key] = params
+            if self.connected.is_set():
+                self.send_command('subscribe', params)
+        self.connect()
+
+    def unsubscribe(self, key):
+        with self.subscriptions_lock:
+            params = self.subscriptions.pop(key, None)
+            if params is not None and self.connected.is_set():
+                self.send_command('unsubscribe', params)
+
+    def send_command(self, method, params):
+        self.request_id += 1
+        self.send({
+            'jsonrpc': '2.0',
+            'type': 'command',
+            'method': method,
+            'params': params,
+            'id': str(self.request_id),
+        })
+
+    def send(self, message):
+        try:
+            self.app.send(json.dumps(message))
+        except websocket.WebSocketException as e:
+            # The subscription is sent again once reconnected
+            self.exchange.log("WebSocket send failed: %s", logging.WARN, e)
+
+    # Blocks until `predicate` holds on the maintained state, re-checking it after every message
+    def wait_for(self, predicate, timeout=None):
+        with self.condition:
+            return self.condition.wait_for(lambda: self.closed or predicate(), timeout)
+
+    ## websocket-client callbacks
+
+    def _on_open(self, app):
+        # close() may have been called while this connection was being opened
+        if self.closed:
+            app.close()
+            return
+        with self.subscriptions_lock:
+            self.connected.set()
+            with self.condition:
+                self.on_connected()
+            for params in self.subscriptions.values():
+                self.send_command('subscribe', params)
+
+    def _on_message(self, app, raw_message):
+        try:
+            message = json.loads(raw_message)
+        except ValueError:
+            self.exchange.log("Ignoring malformed WebSocket message: %s", logging.WARN, raw_message)
+            return
+        with self.condition:
+            self.handle_message(message)
+            self.condition.notify_all()
+
+    def _on_error(self, app, error):
+        self.exchange.log("WebSocket error: %s", logging.WARN, error)
+
+    def _on_close(self, app, status_code=None, message=None):
+        self.connected.clear()
@@ -0,0 +1,147 @@
+import base64
+import hashlib
+import json
+import socket
+import struct
+import threading
+
+WEBSOCKET_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+
+# A minimal local stand-in for the Bullish WebSocket API, so that streams can be tested without network access.
+# Text frames received from clients are decoded as JSON, recorded in `received` and passed to `handler`,
+# which can reply through `send`. Only what websocket-client needs is implemented: the handshake,
+# masked client frames, ping/pong and close
+class MockWebSocketServer:
+
+    def __init__(self, handler=None):
+        self.handler = handler
+        self.received = []
+        self.request_headers = []
+        self.connections = []
+        self.lock = threading.Lock()
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind(('127.0.0.1', 0))
+        self.listener.listen()
+        self.running = True
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    @property
+    def url(self):
+        return 'ws://127.0.0.1:%d' % self.listener.getsockname()[1]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def stop(self):
+        self.running = False
+        self.listener.close()
+        self.drop_connections()
+
+    def send(self, connection, message):
+        payload = json.dumps(message).encode('utf-8')
+        if len(payload) < 126:
+            header = struct.pack('!BB', 0x81, len(payload))
+        elif len(payload) < 65536:
+            header = struct.pack('!BBH', 0x81, 126, len(payload))
+        else:
+            header = struct.pack('!BBQ', 0x81, 127, len(payload))
+        with self.lock:
+            connection.sendall(header + payload)
+
+    def broadcast(self, message):
+        for connection in list(self.connections):
+            try:
+                self.send(connection, message)
+            except OSError:
+                pass
+
+    def drop_connections(self):
+        for connection in list(self.connections):
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+                connection.close()
+            except OSError:
+                pass
+        self.connections = []
+
+    def _accept(self):
+        while self.running:
+            try:
+                connection, _ = self.listener.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(connection,), daemon=True).start()
+
+    def _serve(self, connection):
+        try:
+            headers = self._handshake(connection)
+            self.request_headers.append(headers)
+            self.connections.append(connection)
+            while self.running:
+                opcode, payload = self._read_frame(connection)
+                if opcode == 0x8:
+                    # Acknowledge the close, as websocket-client waits for the reply before shutting the socket down
+                    with self.lock:
+                        connection.sendall(struct.pack('!BB', 0x88, len(payload)) + payload)
+                    return
+                if opcode == 0x9:
+                    with self.lock:
+                        connection.sendall(struct.pack('!BB', 0x8A, len(payload)) + payload)
+                elif opcode == 0x1:
+                    message = json.loads(payload.decode('utf-8'))
+                    self.received.append(message)
+                    if self.handler is not None:
+                        self.handler(self, connection, message)
+        except (OSError, ConnectionError, ValueError):
+            pass
+        finally:
+            if connection in self.connections:
+                self.connections.remove(connection)
+            connection.close()
+
+    def _handshake(self, connection):
+        request = b''
+        while b'\r\n\r\n' not in request:
+            chunk = connection.recv(4096)
+            if not chunk:
+                raise ConnectionError('Connection closed during handshake')
+            request += chunk
+        headers = {}
+        for line in request.decode('latin-1').split('\r\n')[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+        accept = base64.b64encode(hashlib.sha1((headers['sec-websocket-key'] + WEBSOCKET_GUID).encode()).digest())
+        connection.sendall(
+            b'HTTP/1.1 101 Switching Protocols\r\n'
+            b'Upgrade: websocket\r\n'
+            b'Connection: Upgrade\r\n'
+            b'Sec-WebSocket-Accept: ' + accept + b'\r\n\r\n'
+        )
+        return headers
+
+    def _read_frame(self, connection):
+        first, second = self._read_exactly(connection, 2)
+        opcode = first & 0x0F
+        length = second & 0x7F
+        if length == 126:
+            length = struct.unpack('!H', self._read_exactly(connection, 2))[0]
+        elif length == 127:
+            length = struct.unpack('!Q', self._read_exactly(connection, 8))[0]
+        mask = self._read_exactly(connection, 4) if second & 0x80 else b'\x00\x00\x00\x00'
+        payload = self._read_exactly(connection, length)
+        return opcode, bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+
+    def _read_exactly(self, connection, count):
+        data = b''
+        while len(data) < count:
+            chunk = connection.recv(count - len(data))
+            if not chunk:
+                raise ConnectionError('Connection closed')
+            data += chunk
+        return data
@@ -0,0 +1,139 @@
+import asyncio
+import time
+
+import pytest
+from ccxt.base.errors import BadSymbol, ExchangeNotAvailable, InsufficientFunds, OrderNotFillable, OrderNotFound, RateLimitExceeded
+from ccxt.base.types import Entry
+
+from bullish_ccxt.abstract.bullish import ImplicitAPI
+from bullish_ccxt.api_simulator import ApiSimulator, ROUTES
+from bullish_ccxt.bullish import bullish
+from bullish_ccxt.async_support import bullish as async_bullish
+
+
+@pytest.fixture
+def simulator():
+    with ApiSimulator(seed=1) as simulator:
+        yield simulator
+
+
+def make_exchange(simulator, cls=bullish, config={}):
+    return simulator.configure(cls(dict({'enableRateLimit': False, 'options': {'nonceFile': None}}, **config)))
+
+
+def test_every_endpoint_is_served():
+    entries = {(entry.method, entry.path) for entry in vars(ImplicitAPI).values() if isinstance(entry, Entry)}
+    assert entries == set(ROUTES)
+
+
+def test_orders_are_matched_against_the_book(simulator):
+    exchange = make_exchange(simulator)
+    exchange.load_markets()
+    best_ask = exchange.fetch_order_book('BTC/USDC')['asks'][0]
+
+    taker = exchange.create_order('BTC/USDC', 'limit', 'buy', 0.5, best_ask[0] + 10)
+    order = exchange.fetch_order(taker['orderId'])
+    assert order['filled'] == 0.5 and order['average'] == best_ask[0] and order['info']['status'] == 'CLOSED'
+    assert exchange.fetch_ticker('BTC/USDC')['last'] == best_ask[0]
+
+    # Resting orders lock their funds, and are filled by later takers on the other side
+    maker = exchange.create_order('BTC/USDC', 'limit', 'sell', 0.2, best_ask[0] - 1)
+    assert exchange.fetch_balance()['BTC']['used'] == 0.2
+    exchange.create_order('BTC/USDC', 'market', 'buy', 0.3)
+    assert exchange.fetch_order(maker['orderId'])['filled'] == 0.2
+    # The taker also matched the resting sell of the account
+    assert exchange.fetch_balance()['BTC']['free'] == 100.6 and exchange.fetch_balance()['BTC']['used'] == 0
+
+    for i in range(30):
+        exchange.create_order('ETH/USDC', 'limit', 'buy', 0.01, 2000 + i)
+    orders = list(exchange.iter_orders('ETH/USDC'))
+    assert [order['price'] for order in orders] == [2000.0 + i for i in reversed(range(30))]
+    assert len(exchange.fetch_orders('ETH/USDC', limit=25)) == 25
+
+    exchange.create_order('BTC/USDC:USDC', 'market', 'sell', 0.4)
+    positions = exchange.fetch_positions()
+    assert [(position['symbol'], position['side'], position['contracts']) for position in positions] == [('BTC/USDC:USDC', 'short', 0.4)]
+
+    with pytest.raises(OrderNotFillable):
+        exchange.create_order('BTC/USDC', 'limit', 'buy', 1000, best_ask[0], {'timeInForce': 'FOK'})
+    with pytest.raises(InsufficientFunds):
+        exchange.create_order('BTC/USDC', 'limit', 'buy', 100, best_ask[0] - 100)
+    with pytest.raises(OrderNotFound):
+        exchange.fetch_order('1')
+
+
+def test_fills_are_capped_by_the_book_depth():
+    with ApiSimulator(depth=2, replenish_interval=None) as simulator:
+        exchange = make_exchange(simulator)
+        exchange.load_markets()
+        asks = exchange.fetch_order_book('BTC/USDC')['asks']
+        assert [amount for price, amount in asks] == [1, 2]
+
+        rested = exchange.create_order('BTC/USDC', 'limit', 'buy', 0.1, 60000)
+        partial = exchange.create_order('BTC/USDC', 'limit', 'buy', 5, asks[-1][0], {'timeInForce': 'IOC'})
+        assert exchange.fetch_order_book('BTC/USDC')['asks'] == []
+        missed = exchange.create_order('BTC/USDC', 'market', 'buy', 1)
+        simulator.replenish_interval = 0
+        filled = exchange.create_order('BTC/USDC', 'market', 'buy', 1)
+
+        orders = {order['id']: order for order in exchange.fetch_orders('BTC/USDC')}
+        assert [(orders[response['orderId']]['status'], orders[response['orderId']]['filled'])
+                for response in (rested, partial, missed, filled)] == [('open', 0), ('canceled', 3), ('canceled', 0), ('closed', 1)]
+
+
+def test_expired_sessions_are_renewed(simulator):
+    exchange = make_exchange(simulator)
+    exchange.fetch_balance()
+    simulator.tokens.clear()
+    exchange.fetch_balance()
+    assert simulator.requests[('GET', 'users/hmac/login')] == 2
+
+
+def test_injected_latency_and_errors(simulator):
+    exchange = make_exchange(simulator)
+    simulator.latency = lambda: 50
+    started = time.monotonic()
+    exchange.fetch_time()
+    assert time.monotonic() - started >= 0.05
+    simulator.latency = 0
+
+    simulator.fail('EXCHANGE_OFFLINE', status=503, path='/time')
+    with pytest.raises(ExchangeNotAvailable):
+        exchange.fetch_time()
+    exchange.fetch_time()
+    with pytest.raises(BadSymbol):
+        exchange.publicGetMarketTickerBySymbol({'symbol': 'DOGEUSDC'})
+
+    simulator.error_rate = 1
+    with pytest.raises(ExchangeNotAvailable):
+        exchange.fetch_time()
+
+
+def test_requests_over_the_rate_limit_are_rejected():
+    with ApiSimulator(rate_limits={'public': {'capacity': 2, 'refillRate': 0.1}}) as simulator:
+        exchange = make_exchange(simulator)
+        # Logging in uses the public budget
+        exchange.login()
+        exchange.fetch_time()
+        assert exchange.last_response_headers['x-ratelimit-remaining'] == '0'
+        with pytest.raises(RateLimitExceeded):
+            exchange.fetch_time()
+        # Private requests have their own budget
+        exchange.fetch_balance()
+
+
+def test_async_client(simulator):
+    async def run():
+        exchange = make_exchange(simulator, async_bullish)
+        try:
+            await exchange.load_markets()
+            books = await asyncio.gather(*[exchange.fetch_order_book(symbol) for symbol in exchange.symbols])
+            # Orders are sent one at a time, as their clientOrderIds must reach the exchange in increasing order
+            responses = [await exchange.create_order('BTC/USDC', 'limit', 'buy', 0.01, 60000 + i) for i in range(10)]
+            return books, await exchange.fetch_orders('BTC/USDC'), responses
+        finally:
+            await exchange.close()
+
+    books, orders, responses = asyncio.run(run())
+    assert all(book['bids'] and book['asks'] for book in books)
+    assert {order['id'] for order in orders} == {response['orderId'] for response in responses}
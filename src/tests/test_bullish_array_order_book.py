@@ -0,0 +1,77 @@
+import asyncio
+import pytest
+
+from bullish_ccxt.bullish import bullish
+from bullish_ccxt.async_support import bullish as async_bullish
+from bullish_ccxt import ArrayOrderBook
+from tests import mock_responses
+from tests.schema_utils import matches_schema, orderbook_schema
+
+
+def order_book_response(url):
+    if url.endswith('/markets'):
+        return mock_responses.MARKETS
+    return mock_responses.ORDER_BOOK
+
+
+@pytest.fixture
+def exchange(mocker):
+    exchange = bullish({'enableRateLimit': False})
+    mocker.patch.object(exchange, 'fetch', side_effect=lambda url, *args, **kwargs: order_book_response(url))
+    return exchange
+
+
+def test_fetches_array_order_book_on_request(exchange):
+    book = exchange.fetch_order_book('BTC/USDC', params={'arrays': True})
+    assert isinstance(book, ArrayOrderBook)
+    assert 'arrays' not in exchange.fetch.call_args_list[-1][0][0]
+    assert list(book.prices['bids']) == [63000.0, 62999.0, 62998.0]
+    assert list(book.amounts['asks']) == [1.5, 2.5, 3.5]
+    assert book.nonce == exchange.fetch_order_book('BTC/USDC')['nonce']
+    assert book.to_dict() == exchange.fetch_order_book('BTC/USDC')
+    assert matches_schema(book.to_dict(), orderbook_schema)
+
+
+def test_option_enables_array_order_books(exchange):
+    exchange.options['orderBookArrays'] = True
+    assert isinstance(exchange.fetch_order_book('BTC/USDC'), ArrayOrderBook)
+    assert isinstance(exchange.fetch_order_book('BTC/USDC', params={'arrays': False}), dict)
+
+
+def test_depth_queries(exchange):
+    book = exchange.fetch_order_book('BTC/USDC', params={'arrays': True})
+    assert book.best_bid() == 63000.0
+    assert book.best_ask() == 63001.0
+    assert book.spread() == 1.0
+    assert book.mid() == 63000.5
+    assert list(book.cumulative_depth('asks')) == [1.5, 4.0, 7.5]
+    assert book.price_for_size('asks', 1.5) == 63001.0
+    assert book.price_for_size('asks', 2.0) == 63002.0
+    assert book.price_for_size('bids', 6.0) == 62998.0
+    assert book.price_for_size('bids', 6.5) is None
+    assert book.vwap('asks', 2.0) == pytest.approx((1.5 * 63001.0 + 0.5 * 63002.0) / 2.0)
+    assert book.vwap('bids', 1.0) == 63000.0
+    assert book.vwap('bids', 7.0) is None
+
+
+def test_empty_side():
+    book = ArrayOrderBook('BTC/USDC', *[[]] * 4)
+    assert book.spread() is None
+    assert book.mid() is None
+    assert book.price_for_size('bids', 1.0) is None
+
+
+def test_async_fetch_array_order_book(mocker):
+    async def run():
+        exchange = async_bullish({'enableRateLimit': False})
+
+        async def fetch(url, method='GET', headers=None, body=None):
+            return order_book_response(url)
+
+        mocker.patch.object(exchange, 'fetch', side_effect=fetch)
+        try:
+            return await exchange.fetch_order_book('BTC/USDC', params={'arrays': True})
+        finally:
+            await exchange.close()
+
+    assert asyncio.run(run()).mid() == 63000.5
@@ -0,0 +1,71 @@
+import asyncio
+import pytest
+
+from bullish_ccxt.async_support import bullish as async_bullish
+from tests import mock_responses
+from tests.schema_utils import matches_schema, markets_schema, orderbook_schema, orders_schema, tickers_schema, \
+    candle_schema
+
+
+def route(url):
+    if '/users/hmac/login' in url:
+        return mock_responses.LOGIN
+    if '/assets' in url:
+        return mock_responses.ASSETS
+    if '/orderbook/hybrid' in url:
+        return mock_responses.ORDER_BOOK
+    if '/candle' in url:
+        return mock_responses.CANDLES
+    if '/tick' in url:
+        return mock_responses.TICKER
+    if '/markets' in url:
+        return mock_responses.MARKETS
+    if '/orders' in url:
+        return mock_responses.paginated([mock_responses.ORDER])
+    raise AssertionError("Unexpected url " + url)
+
+
+@pytest.fixture
+def exchange(mocker):
+    exchange = async_bullish({
+        'apiKey': 'key',
+        'secret': 'secret',
+        'account_id': '111000000000001',
+        'enableRateLimit': False,
+    })
+
+    async def fetch(url, method='GET', headers=None, body=None):
+        await asyncio.sleep(0)
+        return route(url)
+
+    mocker.patch.object(exchange, 'fetch', side_effect=fetch)
+    return exchange
+
+
+def test_can_fetch_markets(exchange):
+    ret = asyncio.run(exchange.fetch_markets())
+    assert matches_schema(ret, markets_schema)
+    assert ret[0]['symbol'] == 'BTC/USDC'
+
+
+def test_can_fetch_order_book(exchange):
+    ret = asyncio.run(exchange.fetch_order_book('BTC/USDC'))
+    assert matches_schema(ret, orderbook_schema)
+
+
+def test_can_fetch_ohlcv(exchange):
+    ret = asyncio.run(exchange.fetch_ohlcv('BTC/USDC', timeframe='1m'))
+    assert matches_schema(ret, candle_schema)
+
+
+def test_can_fetch_tickers_concurrently(exchange):
+    ret = asyncio.run(exchange.fetch_tickers(['BTC/USDC', 'ETH/USDC']))
+    assert matches_schema(ret, tickers_schema)
+    assert list(ret.keys()) == ['BTC/USDC', 'ETH/USDC']
+
+
+def test_logs_in_before_signing_private_requests(exchange):
+    ret = asyncio.run(exchange.fetch_orders())
+    assert matches_schema(ret, orders_schema)
+    assert exchange.creds == mock_responses.LOGIN
+    assert exchange.last_request_headers['Authorization'] == 'Bearer ' + mock_responses.LOGIN['token']
@@ -0,0 +1,79 @@
+import asyncio
+import threading
+import time
+
+from bullish_ccxt.bullish import bullish
+from bullish_ccxt.async_support import bullish as async_bullish
+from tests import mock_responses
+from tests.schema_utils import matches_schema, trades_schema
+
+SINCE = 1714521600000
+HOUR = 3600000
+
+# One trade every 10 minutes over 4 hours, listed by the server 2 per page
+TRADES = [
+    dict(mock_responses.TRADE, tradeId=str(1000 + i), createdAtTimestamp=str(SINCE + i * 600000))
+    for i in range(24)
+]
+
+
+def trades_in_window(params):
+    start = params['createdAtTimestamp[gte]']
+    end = params['createdAtTimestamp[lte]']
+    matching = [trade for trade in TRADES if start <= int(trade['createdAtTimestamp']) <= end]
+    offset = int(params.get('_nextPage', 0))
+    next_page = str(offset + 2) if offset + 2 < len(matching) else None
+    # Newest first, as returned by the API
+    return mock_responses.paginated(list(reversed(matching))[offset:offset + 2], next_page)
+
+
+def make_exchange(cls):
+    exchange = cls({'account_id': '111000000000001', 'enableRateLimit': False})
+    exchange.symbols_bullish_to_unified = {'BTCUSDC': 'BTC/USDC'}
+    exchange.symbols_unified_to_bullish = {'BTC/USDC': 'BTCUSDC'}
+    return exchange
+
+
+def test_backfills_windows_concurrently_in_timestamp_order(mocker):
+    exchange = make_exchange(bullish)
+    in_flight = {'current': 0, 'max': 0}
+    lock = threading.Lock()
+
+    def get_trades(params={}):
+        with lock:
+            in_flight['current'] += 1
+            in_flight['max'] = max(in_flight['max'], in_flight['current'])
+        time.sleep(0.02)
+        with lock:
+            in_flight['current'] -= 1
+        return trades_in_window(params)
+
+    mocker.patch.object(exchange, 'privateGetMyTrades', side_effect=get_trades)
+    trades = exchange.backfill_my_trades('BTC/USDC', SINCE, SINCE + 4 * HOUR, {'concurrency': 4})
+    assert matches_schema(trades, trades_schema)
+    assert [trade['id'] for trade in trades] == [trade['tradeId'] for trade in TRADES]
+    assert in_flight['max'] == 4
+
+
+def test_splits_range_into_contiguous_windows():
+    exchange = make_exchange(bullish)
+    windows = exchange._split_time_range(SINCE, SINCE + 10, 3)
+    assert windows == [(SINCE, SINCE + 3), (SINCE + 3, SINCE + 6), (SINCE + 6, SINCE + 10)]
+
+
+def test_removes_duplicates_across_windows(mocker):
+    exchange = make_exchange(bullish)
+    mocker.patch.object(exchange, 'privateGetOrders', return_value=mock_responses.paginated([mock_responses.ORDER]))
+    orders = exchange.backfill_orders(since=SINCE, until=SINCE + HOUR, params={'windows': 3})
+    assert [order['id'] for order in orders] == [mock_responses.ORDER['orderId']]
+
+
+def test_async_backfill(mocker):
+    exchange = make_exchange(async_bullish)
+
+    async def get_trades(params={}):
+        return trades_in_window(params)
+
+    mocker.patch.object(exchange, 'privateGetMyTrades', side_effect=get_trades)
+    trades = asyncio.run(exchange.backfill_my_trades('BTC/USDC', SINCE, SINCE + 4 * HOUR, {'windows': 8, 'concurrency': 2}))
+    assert [trade['id'] for trade in trades] == [trade['tradeId'] for trade in TRADES]
@@ -0,0 +1,20 @@
+from benchmarks import suite
+
+
+def test_benchmarks_run_offline():
+    exchange = suite.make_exchange()
+    benchmarks = suite.make_benchmarks(exchange)
+    results = {name: operation() for name, operation in benchmarks.items()}
+    assert 'BX-SIGNATURE' in results['sign POST orders']['headers']
+    assert results['sign GET orders']['url'].endswith('tradingAccountId=' + suite.ACCOUNT_ID)
+    assert [order['symbol'] for order in results['parse_order x100'][:3]] == ['BTC/USDC', 'ETH/USDC', 'BTC/USDC:USDC']
+    assert len(results['_parse_order_book']['bids']) == 100
+    assert len(exchange.symbols_bullish_to_unified) == 200
+
+
+def test_measure_and_compare_with_baseline():
+    result = suite.measure(lambda: [0] * 1000, duration=0.01, repeats=1)
+    assert result['ops'] > 0 and result['peakBytes'] >= 8000
+    baseline = {'a': {'ops': 100, 'peakBytes': 1000}, 'b': {'ops': 100, 'peakBytes': 1000}, 'c': {'ops': 100, 'peakBytes': 1000}}
+    results = {'a': {'ops': 85, 'peakBytes': 1100}, 'b': {'ops': 75, 'peakBytes': 1000}, 'c': {'ops': 100, 'peakBytes': 1300}, 'new': {'ops': 1, 'peakBytes': 1}}
+    assert suite.find_regressions(results, baseline, 0.2) == ['b', 'c']
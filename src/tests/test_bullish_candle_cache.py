@@ -0,0 +1,166 @@
+import asyncio
+import json
+import os
+import threading
+import pytest
+
+from ccxt.base.errors import NotSupported
+from bullish_ccxt.bullish import bullish
+from bullish_ccxt.async_support import bullish as async_bullish
+from tests import mock_responses
+
+SINCE = 1714521600000
+MINUTE = 60000
+# The candle at minute 30 is still open, and the exchange has no candle at minute 3
+NOW = SINCE + 30 * MINUTE + 15000
+MISSING = (3,)
+
+
+def candle(minute):
+    return dict(mock_responses.CANDLES[0], close=str(63000 + minute), createdAtTimestamp=str(SINCE + minute * MINUTE))
+
+
+def get_candles(params={}):
+    start = bullish.parse8601(params['createdAtDatetime[gte]'])
+    end = bullish.parse8601(params['createdAtDatetime[lte]'])
+    return [candle(minute) for minute in range(31) if minute not in MISSING and start <= SINCE + minute * MINUTE <= end]
+
+
+def make_exchange(cls, cache_dir, mocker):
+    exchange = cls({'enableRateLimit': False, 'options': {'ohlcvCacheDir': str(cache_dir)}})
+    exchange.symbols_bullish_to_unified = {'BTCUSDC': 'BTC/USDC'}
+    exchange.symbols_unified_to_bullish = {'BTC/USDC': 'BTCUSDC'}
+    mocker.patch.object(exchange, 'milliseconds', return_value=NOW)
+    return exchange
+
+
+def requested_ranges(requests):
+    return [(bullish.parse8601(call[0][0]['createdAtDatetime[gte]']), bullish.parse8601(call[0][0]['createdAtDatetime[lte]']) + 1)
+            for call in requests.call_args_list]
+
+
+def test_serves_cached_candles_and_fetches_missing_ranges_only(tmp_path, mocker):
+    exchange = make_exchange(bullish, tmp_path, mocker)
+    requests = mocker.patch.object(exchange, 'publicGetMarketCandleBySymbol', side_effect=get_candles)
+
+    columns = exchange.fetch_cached_ohlcv('BTC/USDC', '1m', SINCE + 10 * MINUTE, SINCE + 20 * MINUTE)
+    assert isinstance(columns['close'], memoryview)
+    assert list(columns['timestamp']) == [SINCE + minute * MINUTE for minute in range(10, 20)]
+    assert requested_ranges(requests) == [(SINCE + 10 * MINUTE, SINCE + 20 * MINUTE)]
+
+    exchange.fetch_cached_ohlcv('BTC/USDC', '1m', SINCE + 12 * MINUTE, SINCE + 18 * MINUTE)
+    assert requests.call_count == 1
+
+    # Only the head and the closed candles of the tail are fetched, and the missing candle is not requested again
+    columns = exchange.fetch_cached_ohlcv('BTC/USDC', '1m', SINCE, SINCE + 40 * MINUTE)
+    assert requested_ranges(requests)[1:] == [(SINCE, SINCE + 10 * MINUTE), (SINCE + 20 * MINUTE, SINCE + 30 * MINUTE)]
+    assert len(columns) == 29
+    assert columns.to_list()[3] == [SINCE + 4 * MINUTE, 63000.0, 63100.0, 62900.0, 63004.0, 1.5]
+    exchange.fetch_cached_ohlcv('BTC/USDC', '1m', SINCE, SINCE + 5 * MINUTE)
+    assert requests.call_count == 3
+
+    # Nor are ranges without any candle
+    assert len(exchange.fetch_cached_ohlcv('BTC/USDC', '1m', SINCE - 10 * MINUTE, SINCE)) == 0
+    assert len(exchange.fetch_cached_ohlcv('BTC/USDC', '1m', SINCE - 10 * MINUTE, SINCE)) == 0
+    assert requested_ranges(requests)[3:] == [(SINCE - 10 * MINUTE, SINCE)]
+
+
+def test_fetches_only_the_ranges_between_cached_ones(tmp_path, mocker):
+    exchange = make_exchange(bullish, tmp_path, mocker)
+    requests = mocker.patch.object(exchange, 'publicGetMarketCandleBySymbol', side_effect=get_candles)
+    exchange.fetch_cached_ohlcv('BTC/USDC', '1m', SINCE + 20 * MINUTE, SINCE + 25 * MINUTE)
+    exchange.fetch_cached_ohlcv('BTC/USDC', '1m', SINCE + 5 * MINUTE, SINCE + 10 * MINUTE)
+    columns = exchange.fetch_cached_ohlcv('BTC/USDC', '1m', SINCE + 5 * MINUTE, SINCE + 25 * MINUTE)
+    assert requested_ranges(requests)[2:] == [(SINCE + 10 * MINUTE, SINCE + 20 * MINUTE)]
+    assert list(columns['timestamp']) == [SINCE + minute * MINUTE for minute in range(5, 25)]
+
+    # Other environments have their own entries
+    exchange.urls['uat'] = dict(exchange.urls['api'], public='https://api.uat.example.com')
+    exchange.environment = 'UAT'
+    exchange.fetch_cached_ohlcv('BTC/USDC', '1m', SINCE + 5 * MINUTE, SINCE + 10 * MINUTE)
+    assert requests.call_count == 4
+
+
+def test_entries_are_locked_between_processes(tmp_path, mocker):
+    fcntl = pytest.importorskip('fcntl')
+    exchange = make_exchange(bullish, tmp_path, mocker)
+    mocker.patch.object(exchange, 'publicGetMarketCandleBySymbol', side_effect=get_candles)
+    exchange.fetch_cached_ohlcv('BTC/USDC', '1m', SINCE, SINCE + 2 * MINUTE)
+
+    # The lock of another process is held on another open file
+    with open(os.path.join(exchange.candle_cache.directory, 'BTCUSDC', '1m', 'lock')) as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        loader = threading.Thread(target=exchange.fetch_cached_ohlcv, args=('BTC/USDC', '1m', SINCE, SINCE + 2 * MINUTE))
+        loader.start()
+        loader.join(0.2)
+        assert loader.is_alive()
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    loader.join(2)
+    assert not loader.is_alive()
+
+
+def test_fetch_ohlcv_reads_through_the_cache(tmp_path, mocker):
+    exchange = make_exchange(bullish, tmp_path, mocker)
+    uncached = make_exchange(bullish, tmp_path / 'unused', mocker)
+    uncached.options['ohlcvCacheDir'] = None
+    mocker.patch.object(uncached, 'publicGetMarketCandleBySymbol', side_effect=get_candles)
+    requests = mocker.patch.object(exchange, 'publicGetMarketCandleBySymbol', side_effect=get_candles)
+
+    expected = uncached.fetch_ohlcv('BTC/USDC', '1m', limit=20)
+    assert exchange.fetch_ohlcv('BTC/USDC', '1m', limit=20) == expected
+    assert expected[-1][0] == SINCE + 30 * MINUTE
+    calls = requests.call_count
+    # The open candle is fetched every time
+    assert exchange.fetch_ohlcv('BTC/USDC', '1m', limit=20) == expected
+    assert requests.call_count == calls + 1
+    assert exchange.fetch_ohlcv('BTC/USDC', '1m', SINCE + 12 * MINUTE, 5) == uncached.fetch_ohlcv('BTC/USDC', '1m', SINCE + 12 * MINUTE, 5)
+    assert requests.call_count == calls + 1
+    assert exchange.fetch_ohlcv('BTC/USDC', '1m', limit=20, params={'format': 'columns'}).to_list() == expected
+
+
+def test_cache_persists_across_instances(tmp_path, mocker):
+    first = make_exchange(bullish, tmp_path, mocker)
+    mocker.patch.object(first, 'publicGetMarketCandleBySymbol', side_effect=get_candles)
+    loaded = first.fetch_cached_ohlcv('BTC/USDC', '1m', SINCE + 4 * MINUTE, SINCE + 10 * MINUTE)
+
+    # Values appended by an interrupted write are ignored
+    path = os.path.join(first.candle_cache.directory, 'BTCUSDC', '1m')
+    with open(os.path.join(path, 'range.json')) as f:
+        generation = str(json.load(f)['generation'])
+    with open(os.path.join(path, generation, 'timestamp'), 'ab') as f:
+        f.write(b'\x01\x02\x03')
+
+    second = make_exchange(bullish, tmp_path, mocker)
+    requests = mocker.patch.object(second, 'publicGetMarketCandleBySymbol', side_effect=get_candles)
+    assert len(second.fetch_cached_ohlcv('BTC/USDC', '1m', SINCE + 4 * MINUTE, SINCE + 10 * MINUTE)) == 6
+    assert requests.call_count == 0
+    assert len(second.fetch_cached_ohlcv('BTC/USDC', '1m', SINCE + 4 * MINUTE, SINCE + 12 * MINUTE)) == 8
+    assert requested_ranges(requests) == [(SINCE + 10 * MINUTE, SINCE + 12 * MINUTE)]
+    # The candles were written to new files, leaving the ones mapped earlier unchanged
+    assert not os.path.exists(os.path.join(path, generation))
+    assert list(loaded['close']) == [63000.0 + minute for minute in range(4, 10)]
+
+
+def test_requires_cache_directory(mocker):
+    with pytest.raises(NotSupported):
+        bullish().fetch_cached_ohlcv('BTC/USDC', '1m', SINCE)
+
+
+def test_async_fetch_cached_ohlcv(tmp_path, mocker):
+    async def run():
+        exchange = make_exchange(async_bullish, tmp_path, mocker)
+
+        async def get(params={}):
+            return get_candles(params)
+
+        requests = mocker.patch.object(exchange, 'publicGetMarketCandleBySymbol', side_effect=get)
+        try:
+            await exchange.fetch_cached_ohlcv('BTC/USDC', '1m', SINCE, SINCE + 10 * MINUTE)
+            candles = await exchange.fetch_ohlcv('BTC/USDC', '1m', SINCE, 5)
+            return candles, requests.call_count
+        finally:
+            await exchange.close()
+
+    candles, calls = asyncio.run(run())
+    assert [c[0] for c in candles] == [SINCE + minute * MINUTE for minute in (0, 1, 2, 4, 5)]
+    assert calls == 1
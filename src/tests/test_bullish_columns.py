@@ -0,0 +1,95 @@
+import asyncio
+import math
+
+from bullish_ccxt.bullish import bullish
+from bullish_ccxt.columns import candle_columns, candle_rows_to_columns
+from bullish_ccxt.async_support import bullish as async_bullish
+from tests import mock_responses
+
+TRADES = [
+    mock_responses.TRADE,
+    dict(mock_responses.TRADE, tradeId='100020000000000061', side='SELL', isTaker=False, price='63010.5000'),
+    dict(mock_responses.TRADE, tradeId='100020000000000062', symbol='BTC-USDC-PERP', quantity=None),
+]
+
+
+def make_exchange(cls):
+    exchange = cls({'account_id': '111000000000001', 'enableRateLimit': False})
+    exchange.symbols_bullish_to_unified = {'BTCUSDC': 'BTC/USDC', 'BTC-USDC-PERP': 'BTC/USDC:USDC'}
+    exchange.symbols_unified_to_bullish = {'BTC/USDC': 'BTCUSDC', 'BTC/USDC:USDC': 'BTC-USDC-PERP'}
+    return exchange
+
+
+def test_fetch_ohlcv_columns_match_rows(mocker):
+    exchange = make_exchange(bullish)
+    requests = mocker.patch.object(exchange, 'publicGetMarketCandleBySymbol', return_value=mock_responses.CANDLES)
+    columns = exchange.fetch_ohlcv('BTC/USDC', '1m', 1714521600000, 5, params={'format': 'columns'})
+    assert 'format' not in requests.call_args[0][0]
+    assert columns['timestamp'].typecode == 'q'
+    assert columns['close'].typecode == 'd'
+    assert columns.to_list() == exchange.fetch_ohlcv('BTC/USDC', '1m', 1714521600000, 5)
+
+
+def test_fetch_trades_columns(mocker):
+    exchange = make_exchange(bullish)
+    mocker.patch.object(exchange, 'publicGetMarketTradesBySymbol', return_value=TRADES)
+    columns = exchange.fetch_trades('BTC/USDC', params={'format': 'columns'})
+    rows = exchange.fetch_trades('BTC/USDC')
+    assert len(columns) == 3
+    assert list(columns['timestamp']) == [row['timestamp'] for row in rows]
+    assert [str(id) for id in columns['id']] == [row['id'] for row in rows]
+    assert list(columns['price']) == [row['price'] for row in rows]
+    assert list(columns['side']) == [1, -1, 1]
+    assert list(columns['taker']) == [1, 0, 1]
+    assert columns['symbol'] == ['BTC/USDC', 'BTC/USDC', 'BTC/USDC:USDC']
+    assert columns['amount'][:2].tolist() == [0.1, 0.1]
+    assert math.isnan(columns['amount'][2])
+
+
+def test_malformed_values_and_rows_without_timestamp():
+    candles = [dict(mock_responses.CANDLES[0], createdAtTimestamp=timestamp, close='n/a')
+               for timestamp in ('', None, 'n/a', '1714521600000.0')]
+    columns = candle_columns(candles)
+    assert list(columns['timestamp']) == [1714521600000]
+    assert math.isnan(columns['close'][0])
+    rows = [[None, 1.0, 2.0, 0.5, 1.5, 10.0], [1714521600000, 1.0, 2.0, 0.5, None, 10.0]]
+    columns = candle_rows_to_columns(rows)
+    assert list(columns['timestamp']) == [1714521600000]
+    assert math.isnan(columns['close'][0])
+
+
+def test_taker_is_only_set_by_a_boolean(mocker):
+    exchange = make_exchange(bullish)
+    trades = [dict(mock_responses.TRADE, tradeId=str(i), isTaker=is_taker) for i, is_taker in enumerate((True, 'false', 'true', None))]
+    trades.append(dict(mock_responses.TRADE, createdAtTimestamp=None))
+    mocker.patch.object(exchange, 'publicGetMarketTradesBySymbol', return_value=trades)
+    columns = exchange.fetch_trades('BTC/USDC', params={'format': 'columns'})
+    assert list(columns['taker']) == [1, 0, 0, 0]
+    assert list(columns['taker']) == [row['takerOrMaker'] == 'taker' for row in exchange.fetch_trades('BTC/USDC')[:4]]
+    assert columns['symbol'] == ['BTC/USDC'] * 4
+
+
+def test_default_format_option(mocker):
+    exchange = make_exchange(bullish)
+    exchange.options['defaultFormat'] = 'columns'
+    mocker.patch.object(exchange, 'privateGetMyTrades', return_value=mock_responses.paginated(TRADES[:2]))
+    columns = exchange.fetch_my_trades('BTC/USDC')
+    assert columns['side'].tolist() == [1, -1]
+    assert exchange.last_pagination_metadata['next'] is None
+    assert isinstance(exchange.fetch_my_trades('BTC/USDC', params={'format': 'rows'}), list)
+
+
+def test_async_fetch_ohlcv_columns(mocker):
+    async def run():
+        exchange = make_exchange(async_bullish)
+
+        async def get_candles(params={}):
+            return mock_responses.CANDLES
+
+        mocker.patch.object(exchange, 'publicGetMarketCandleBySymbol', side_effect=get_candles)
+        try:
+            return await exchange.fetch_ohlcv('BTC/USDC', '1m', 1714521600000, 5, params={'format': 'columns'})
+        finally:
+            await exchange.close()
+
+    assert len(asyncio.run(run())) == 5
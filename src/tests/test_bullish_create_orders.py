@@ -0,0 +1,89 @@
+import asyncio
+import json
+import threading
+import time
+
+from ccxt.base.errors import InsufficientFunds
+from bullish_ccxt.bullish import bullish
+from bullish_ccxt.async_support import bullish as async_bullish
+from tests import mock_responses
+
+LADDER = [
+    {'symbol': 'BTC/USDC', 'type': 'limit', 'side': 'buy', 'amount': 0.1, 'price': 63000 - i} for i in range(8)
+]
+
+
+def make_exchange(cls=bullish):
+    exchange = cls({'apiKey': 'key', 'secret': 'secret', 'account_id': '111000000000001', 'enableRateLimit': False})
+    exchange.creds = mock_responses.LOGIN
+    exchange.symbols_bullish_to_unified = {'BTCUSDC': 'BTC/USDC'}
+    exchange.symbols_unified_to_bullish = {'BTC/USDC': 'BTCUSDC'}
+    return exchange
+
+
+def acknowledge(body):
+    order = json.loads(body)
+    if order['price'] == '62997':
+        raise InsufficientFunds('bullish NOT_ENOUGH_FUNDS__BUY_LIMIT_ORDER')
+    return dict(mock_responses.CREATE_ORDER, clientOrderId=order['clientOrderId'], price=order['price'])
+
+
+def test_sends_presigned_orders_concurrently_in_input_order(mocker):
+    exchange = make_exchange()
+    in_flight = {'current': 0, 'max': 0}
+    lock = threading.Lock()
+    bodies = []
+
+    def fetch(url, method='GET', headers=None, body=None):
+        assert headers['BX-SIGNATURE']
+        with lock:
+            bodies.append(body)
+            in_flight['current'] += 1
+            in_flight['max'] = max(in_flight['max'], in_flight['current'])
+        time.sleep(0.02)
+        with lock:
+            in_flight['current'] -= 1
+        return acknowledge(body)
+
+    mocker.patch.object(exchange, 'fetch', side_effect=fetch)
+    sign = mocker.spy(exchange, 'sign')
+    results = exchange.create_orders(LADDER, {'concurrency': 4})
+    assert sign.call_count == len(LADDER)
+    assert in_flight['max'] == 4
+    assert [result['price'] for result in results if not isinstance(result, Exception)] == \
+           [str(order['price']) for order in LADDER if order['price'] != 62997]
+    assert isinstance(results[3], InsufficientFunds)
+    assert list(exchange.last_create_orders_errors) == [3]
+    # clientOrderIds increase in input order, whatever order the requests were sent in
+    client_order_ids = [int(result['clientOrderId']) for result in results if not isinstance(result, Exception)]
+    assert client_order_ids == sorted(client_order_ids)
+    assert len(bodies) == len(LADDER)
+
+
+def test_orders_failing_to_build_are_not_sent(mocker):
+    exchange = make_exchange()
+    fetch = mocker.patch.object(exchange, 'fetch', side_effect=lambda url, method, headers, body: acknowledge(body))
+    results = exchange.create_orders([LADDER[0], dict(LADDER[1], side='hold'), dict(LADDER[2], params={'timeInForce': 'IOC'})])
+    assert isinstance(results[1], KeyError)
+    assert list(exchange.last_create_orders_errors) == [1]
+    assert fetch.call_count == 2
+    assert json.loads(fetch.call_args_list[1].args[3])['timeInForce'] == 'IOC'
+
+
+def test_async_create_orders(mocker):
+    async def run():
+        exchange = make_exchange(async_bullish)
+
+        async def fetch(url, method='GET', headers=None, body=None):
+            await asyncio.sleep(0.01)
+            return acknowledge(body)
+
+        mocker.patch.object(exchange, 'fetch', side_effect=fetch)
+        try:
+            return await exchange.create_orders(LADDER, {'concurrency': 3})
+        finally:
+            await exchange.close()
+
+    results = asyncio.run(run())
+    assert [isinstance(result, Exception) for result in results] == [False, False, False, True, False, False, False, False]
+    assert results[0]['price'] == '63000'
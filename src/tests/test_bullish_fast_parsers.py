@@ -0,0 +1,64 @@
+from bullish_ccxt.bullish import bullish
+from tests import mock_responses
+from tests.schema_utils import matches_schema, orders_schema, trades_schema, ticker_schema
+
+ORDERS = [
+    mock_responses.ORDER,
+    dict(mock_responses.ORDER, orderId='390755251232145410', side='SELL', type='MKT', status='FILLED', avgPrice=None),
+    dict(mock_responses.ORDER, orderId='390755251232145411', symbol='BTC-USDC-PERP', price='', baseFee=None, status='CANCELLED'),
+    dict(mock_responses.ORDER, orderId='390755251232145412', symbol='ETHUSDC', clientOrderId=None, createdAtTimestamp=''),
+]
+
+TRADES = [
+    mock_responses.TRADE,
+    dict(mock_responses.TRADE, tradeId='100020000000000061', side='SELL', isTaker=False, price='63010.5000'),
+    dict(mock_responses.TRADE, tradeId='100020000000000062', symbol='BTC-USDC-PERP', quantity=None, isTaker='true'),
+    dict(mock_responses.TRADE, tradeId='100020000000000063', symbol='ETHUSDC', createdAtTimestamp=None),
+]
+
+
+def make_exchange():
+    exchange = bullish({'account_id': '111000000000001', 'enableRateLimit': False})
+    exchange.symbols_bullish_to_unified = {'BTCUSDC': 'BTC/USDC', 'BTC-USDC-PERP': 'BTC/USDC:USDC'}
+    exchange.symbols_unified_to_bullish = {'BTC/USDC': 'BTCUSDC', 'BTC/USDC:USDC': 'BTC-USDC-PERP'}
+    return exchange
+
+
+def test_parse_orders_fast_matches_parse_order():
+    exchange = make_exchange()
+    orders = exchange.parse_orders_fast(ORDERS)
+    assert orders == [exchange.parse_order(order) for order in ORDERS]
+    assert matches_schema(orders[:2], orders_schema)
+    # A missing filled quantity, or a malformed number, parses the same way in both
+    unfilled = [dict(mock_responses.ORDER, quantityFilled=None), dict(mock_responses.ORDER, quantityFilled={}, stopPrice=[])]
+    orders = exchange.parse_orders_fast(unfilled)
+    assert orders == [exchange.parse_order(order) for order in unfilled]
+    assert [(order['filled'], order['remaining']) for order in orders] == [(0.0, 0.1), (0.0, 0.1)]
+
+
+def test_parse_trades_fast_matches_parse_trade():
+    exchange = make_exchange()
+    trades = exchange.parse_trades_fast(TRADES)
+    assert trades == [exchange.parse_trade(trade) for trade in TRADES]
+    assert matches_schema(trades[:2], trades_schema)
+
+
+def test_parse_tickers_fast_matches_parse_ticker():
+    exchange = make_exchange()
+    tickers = [mock_responses.TICKER, dict(mock_responses.TICKER, bestBid=None, last='', createdAtTimestamp='1714521660000')]
+    symbols = ['BTC/USDC', 'BTC/USDC:USDC']
+    parsed = exchange.parse_tickers_fast(tickers, symbols)
+    assert parsed == [exchange.parse_ticker(ticker, symbol) for ticker, symbol in zip(tickers, symbols)]
+    assert matches_schema(parsed[0], ticker_schema)
+
+
+def test_fetch_methods_use_batch_parsers(mocker):
+    exchange = make_exchange()
+    mocker.patch.object(exchange, 'publicGetMarketTradesBySymbol', return_value=TRADES)
+    mocker.patch.object(exchange, 'privateGetOrders', return_value={'data': ORDERS, 'links': {}})
+    parse_trade = mocker.spy(exchange, 'parse_trade')
+    parse_order = mocker.spy(exchange, 'parse_order')
+    assert [trade['id'] for trade in exchange.fetch_trades('BTC/USDC')] == [trade['tradeId'] for trade in TRADES]
+    assert [order['id'] for order in exchange.fetch_orders('BTC/USDC')] == [order['orderId'] for order in ORDERS]
+    assert parse_trade.call_count == 0
+    assert parse_order.call_count == 0
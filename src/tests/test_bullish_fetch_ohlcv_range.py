@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import time
+import pytest
+
+from ccxt.base.errors import BadRequest
+from bullish_ccxt.bullish import bullish
+from bullish_ccxt.async_support import bullish as async_bullish
+from tests import mock_responses
+from tests.schema_utils import matches_schema, candle_schema
+
+SINCE = 1714521600000
+MINUTE = 60000
+# Candles of the first 25 minutes, without the ones at minutes 7 and 8
+MISSING = (7, 8)
+
+
+def candle(minute, symbol='BTCUSDC'):
+    close = '63050.0000' if symbol == 'BTCUSDC' else '3050.0000'
+    return dict(mock_responses.CANDLES[0], close=close, createdAtTimestamp=str(SINCE + minute * MINUTE))
+
+
+def candles_in_chunk(params):
+    start = bullish.parse8601(params['createdAtDatetime[gte]'])
+    end = bullish.parse8601(params['createdAtDatetime[lte]'])
+    # Chunks overlap by one candle, as the API includes both bounds
+    return [candle(minute, params['symbol']) for minute in range(25)
+            if minute not in MISSING and start <= SINCE + minute * MINUTE <= end + MINUTE]
+
+
+def make_exchange(cls):
+    exchange = cls({'enableRateLimit': False})
+    exchange.symbols_bullish_to_unified = {'BTCUSDC': 'BTC/USDC', 'ETHUSDC': 'ETH/USDC'}
+    exchange.symbols_unified_to_bullish = {'BTC/USDC': 'BTCUSDC', 'ETH/USDC': 'ETHUSDC'}
+    return exchange
+
+
+def test_fetches_range_in_concurrent_chunks(mocker):
+    exchange = make_exchange(bullish)
+    in_flight = {'current': 0, 'max': 0}
+    lock = threading.Lock()
+
+    def get_candles(params={}):
+        with lock:
+            in_flight['current'] += 1
+            in_flight['max'] = max(in_flight['max'], in_flight['current'])
+        time.sleep(0.02)
+        with lock:
+            in_flight['current'] -= 1
+        return candles_in_chunk(params)
+
+    requests = mocker.patch.object(exchange, 'publicGetMarketCandleBySymbol', side_effect=get_candles)
+    candles = exchange.fetch_ohlcv_range('BTC/USDC', '1m', SINCE, SINCE + 25 * MINUTE,
+                                         params={'chunkSize': 5, 'concurrency': 3})
+    assert requests.call_count == 5
+    assert in_flight['max'] == 3
+    assert matches_schema(candles, candle_schema)
+    assert [c[0] for c in candles] == [SINCE + minute * MINUTE for minute in range(25) if minute not in MISSING]
+    assert exchange.last_ohlcv_gaps == {'BTC/USDC': [[SINCE + 7 * MINUTE, SINCE + 9 * MINUTE]]}
+    assert requests.call_args_list[0][0][0]['createdAtDatetime[lte]'] == exchange.iso8601(SINCE + 5 * MINUTE - 1)
+    assert 'chunkSize' not in requests.call_args_list[0][0][0]
+
+
+def test_shares_pool_across_symbols(mocker):
+    exchange = make_exchange(bullish)
+    mocker.patch.object(exchange, 'publicGetMarketCandleBySymbol', side_effect=candles_in_chunk)
+    ranges = exchange.fetch_ohlcv_ranges(['BTC/USDC', 'ETH/USDC'], '1m', SINCE, SINCE + 10 * MINUTE,
+                                         params={'chunkSize': 4})
+    assert len(ranges['BTC/USDC']) == len(ranges['ETH/USDC']) == 8
+    assert ranges['ETH/USDC'][0][4] == 3050.0
+    assert exchange.last_ohlcv_gaps['ETH/USDC'] == [[SINCE + 7 * MINUTE, SINCE + 9 * MINUTE]]
+
+
+def test_reports_missing_tail():
+    exchange = make_exchange(bullish)
+    candles = [[SINCE, 1, 1, 1, 1, 1], [SINCE + MINUTE, 1, 1, 1, 1, 1]]
+    assert exchange._find_ohlcv_gaps(candles, MINUTE, SINCE - 30000, SINCE + 4 * MINUTE) == [[SINCE + 2 * MINUTE, SINCE + 4 * MINUTE]]
+
+
+def test_requires_since():
+    with pytest.raises(BadRequest):
+        make_exchange(bullish).fetch_ohlcv_range('BTC/USDC', '1m')
+
+
+def test_async_fetches_range(mocker):
+    async def run():
+        exchange = make_exchange(async_bullish)
+
+        async def get_candles(params={}):
+            await asyncio.sleep(0)
+            return candles_in_chunk(params)
+
+        mocker.patch.object(exchange, 'publicGetMarketCandleBySymbol', side_effect=get_candles)
+        try:
+            candles = await exchange.fetch_ohlcv_range('BTC/USDC', '1m', SINCE, SINCE + 25 * MINUTE, params={'chunkSize': 5})
+            return candles, exchange.last_ohlcv_gaps
+        finally:
+            await exchange.close()
+
+    candles, gaps = asyncio.run(run())
+    assert len(candles) == 23
+    assert gaps == {'BTC/USDC': [[SINCE + 7 * MINUTE, SINCE + 9 * MINUTE]]}
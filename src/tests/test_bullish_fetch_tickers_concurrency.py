@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import time
+import pytest
+
+from ccxt.base.errors import BadSymbol
+from bullish_ccxt.bullish import bullish
+from bullish_ccxt.async_support import bullish as async_bullish
+from tests import mock_responses
+from tests.schema_utils import matches_schema, tickers_schema
+
+SYMBOLS = ['BTC/USDC', 'ETH/USDC', 'BTC/USDC:USDC']
+
+
+def ticker_response(url):
+    if url.endswith('/markets'):
+        return mock_responses.MARKETS
+    if 'ETHUSDC' in url:
+        raise BadSymbol('bullish MARKET_NOT_SUPPORTED')
+    return mock_responses.TICKER
+
+
+@pytest.fixture
+def exchange(mocker):
+    exchange = bullish({'enableRateLimit': False})
+    in_flight = {'current': 0, 'max': 0}
+    lock = threading.Lock()
+
+    def fetch(url, method='GET', headers=None, body=None):
+        with lock:
+            in_flight['current'] += 1
+            in_flight['max'] = max(in_flight['max'], in_flight['current'])
+        time.sleep(0.05)
+        with lock:
+            in_flight['current'] -= 1
+        return ticker_response(url)
+
+    mocker.patch.object(exchange, 'fetch', side_effect=fetch)
+    exchange.in_flight = in_flight
+    return exchange
+
+
+def test_fetches_tickers_concurrently_in_order(exchange):
+    ret = exchange.fetch_tickers(['BTC/USDC', 'BTC/USDC:USDC'], {'concurrency': 2})
+    assert matches_schema(ret, tickers_schema)
+    assert list(ret.keys()) == ['BTC/USDC', 'BTC/USDC:USDC']
+    assert exchange.in_flight['max'] == 2
+
+
+def test_concurrency_is_bounded(exchange):
+    exchange.fetch_tickers(['BTC/USDC'] * 6, {'concurrency': 3, 'partial': True})
+    assert exchange.in_flight['max'] <= 3
+
+
+def test_fails_whole_batch_by_default(exchange):
+    with pytest.raises(BadSymbol):
+        exchange.fetch_tickers(SYMBOLS)
+
+
+def test_partial_results_keep_per_symbol_errors(exchange):
+    ret = exchange.fetch_tickers(SYMBOLS, {'partial': True})
+    assert list(ret.keys()) == ['BTC/USDC', 'BTC/USDC:USDC']
+    assert list(exchange.last_tickers_errors.keys()) == ['ETH/USDC']
+    assert isinstance(exchange.last_tickers_errors['ETH/USDC'], BadSymbol)
+
+
+def test_async_partial_results_keep_per_symbol_errors(mocker):
+    exchange = async_bullish({'enableRateLimit': False})
+
+    async def fetch(url, method='GET', headers=None, body=None):
+        return ticker_response(url)
+
+    mocker.patch.object(exchange, 'fetch', side_effect=fetch)
+    ret = asyncio.run(exchange.fetch_tickers(SYMBOLS, {'concurrency': 2, 'partial': True}))
+    assert list(ret.keys()) == ['BTC/USDC', 'BTC/USDC:USDC']
+    assert list(exchange.last_tickers_errors.keys()) == ['ETH/USDC']
@@ -0,0 +1,98 @@
+import asyncio
+import json
+
+from bullish_ccxt.bullish import bullish
+from bullish_ccxt.async_support import bullish as async_bullish
+from tests import mock_responses
+
+HOUR = 60 * 60 * 1000
+
+
+def make_exchange(cls, cache_dir, mocker, markets=mock_responses.MARKETS):
+    exchange = cls({'enableRateLimit': False, 'options': {'metadataCacheDir': str(cache_dir), 'metadataCacheTtl': HOUR}})
+    if cls is bullish:
+        assets = mocker.patch.object(exchange, 'publicGetAssets', return_value=mock_responses.ASSETS)
+        markets = mocker.patch.object(exchange, 'publicGetMarkets', return_value=markets)
+    else:
+        assets = mocker.patch.object(exchange, 'publicGetAssets', new=mocker.AsyncMock(return_value=mock_responses.ASSETS))
+        markets = mocker.patch.object(exchange, 'publicGetMarkets', new=mocker.AsyncMock(return_value=markets))
+    return exchange, assets, markets
+
+
+# Makes the markets entry older than any TTL
+def expire_markets(cache_dir):
+    path = next(cache_dir.glob('markets-*.json'))
+    entry = json.loads(path.read_text())
+    entry['fetchedAt'] = 0
+    path.write_text(json.dumps(entry))
+
+
+def test_new_instances_load_markets_from_the_cache(tmp_path, mocker):
+    first, _, _ = make_exchange(bullish, tmp_path, mocker)
+    expected = first.load_markets()
+
+    second, assets, markets = make_exchange(bullish, tmp_path, mocker)
+    assert second.load_markets().keys() == expected.keys()
+    assert second.currencies.keys() == first.currencies.keys()
+    assert assets.call_count == 0 and markets.call_count == 0
+    assert second.symbols_bullish_to_unified == first.symbols_bullish_to_unified
+    assert second.metadata_refreshes == {}
+
+    # Other environments have their own entries
+    sandbox, assets, markets = make_exchange(bullish, tmp_path, mocker)
+    sandbox.urls = dict(sandbox.urls, uat={'public': 'https://api.uat.example/trading-api/v1'})
+    sandbox.environment = 'UAT'
+    sandbox.load_markets()
+    assert assets.call_count == 1 and markets.call_count == 1
+
+
+def test_stale_entries_are_served_then_refreshed(tmp_path, mocker):
+    first, _, _ = make_exchange(bullish, tmp_path, mocker)
+    first.load_markets()
+
+    expire_markets(tmp_path)
+
+    stale, assets, markets = make_exchange(bullish, tmp_path, mocker, markets=mock_responses.MARKETS[:2])
+    assert 'BTC/USDC:USDC' in stale.load_markets()
+    assert list(stale.metadata_refreshes) == [next(tmp_path.glob('markets-*.json')).stem]
+    for refresh in stale.metadata_refreshes.values():
+        refresh.join()
+    assert assets.call_count == 0 and markets.call_count == 1
+    assert 'BTC/USDC:USDC' not in stale.markets
+    assert 'BTC-USDC-PERP' not in stale.symbols_bullish_to_unified
+
+    # The refreshed entries are fresh for the next instances
+    fresh, assets, markets = make_exchange(bullish, tmp_path, mocker)
+    assert list(fresh.load_markets()) == list(stale.markets)
+    assert assets.call_count == 0 and markets.call_count == 0
+
+
+def test_unchanged_refresh_keeps_loaded_markets(tmp_path, mocker):
+    first, _, _ = make_exchange(bullish, tmp_path, mocker)
+    first.load_markets()
+
+    expire_markets(tmp_path)
+
+    stale, _, markets = make_exchange(bullish, tmp_path, mocker)
+    loaded = stale.load_markets()
+    for refresh in stale.metadata_refreshes.values():
+        refresh.join()
+    assert markets.call_count == 1
+    assert stale.markets is loaded
+
+
+def test_async_refresh(tmp_path, mocker):
+    first, _, _ = make_exchange(bullish, tmp_path, mocker)
+    first.load_markets()
+    expire_markets(tmp_path)
+
+    async def run():
+        exchange, _, markets = make_exchange(async_bullish, tmp_path, mocker, markets=mock_responses.MARKETS[:2])
+        assert 'BTC/USDC:USDC' in await exchange.load_markets()
+        await asyncio.gather(*exchange.metadata_refreshes.values())
+        await exchange.close()
+        return exchange, markets
+
+    exchange, markets = asyncio.run(run())
+    assert 'BTC/USDC:USDC' not in exchange.markets
+    assert markets.await_count == 1
@@ -0,0 +1,94 @@
+import multiprocessing
+import os
+import threading
+
+import pytest
+
+from bullish_ccxt.bullish import bullish
+from bullish_ccxt.nonce_generator import NonceGenerator
+
+
+class Clock:
+
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_strictly_increasing_when_the_clock_stalls_or_steps_back():
+    clock = Clock(1714521600.0)
+    generator = NonceGenerator(clock=clock)
+    assert [generator.next() for _ in range(3)] == [1714521600000000, 1714521600000001, 1714521600000002]
+    clock.now -= 60
+    assert generator.next() == 1714521600000003
+    clock.now += 120
+    assert generator.next() == 1714521660000000
+
+
+def test_unique_across_threads():
+    generator = NonceGenerator()
+    values = []
+
+    def generate():
+        values.extend([generator.next() for _ in range(1000)])
+
+    threads = [threading.Thread(target=generate) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(values)) == 8000
+
+
+def test_high_water_mark_survives_restarts(tmp_path):
+    path = str(tmp_path / 'nonce')
+    generator = NonceGenerator(path, clock=Clock(1714521600.0))
+    last = [generator.next() for _ in range(5)][-1]
+    generator.close()
+    # Restarted with the clock set back
+    assert NonceGenerator(path, clock=Clock(1714500000.0)).next() == last + 1
+
+
+def test_descriptor_is_closed_with_the_generator(tmp_path):
+    if not os.path.isdir('/proc/self/fd'):
+        pytest.skip('open descriptors are listed in /proc')
+    opened = len(os.listdir('/proc/self/fd'))
+    generators = [NonceGenerator(str(tmp_path / 'nonce')) for _ in range(3)]
+    assert len(os.listdir('/proc/self/fd')) == opened + 3
+    generators[0].close()
+    generators[0].next()
+    assert len(os.listdir('/proc/self/fd')) == opened + 2
+    del generators
+    assert len(os.listdir('/proc/self/fd')) == opened
+
+
+def generate_in_process(path, count, queue):
+    generator = NonceGenerator(path)
+    queue.put([generator.next() for _ in range(count)])
+
+
+def test_unique_across_processes_sharing_the_file(tmp_path):
+    path = str(tmp_path / 'nonce')
+    context = multiprocessing.get_context('fork')
+    queue = context.Queue()
+    processes = [context.Process(target=generate_in_process, args=(path, 2000, queue)) for _ in range(3)]
+    for process in processes:
+        process.start()
+    values = [queue.get(timeout=30) for _ in processes]
+    for process in processes:
+        process.join()
+    assert all(sequence == sorted(sequence) for sequence in values)
+    assert len(set(value for sequence in values for value in sequence)) == 6000
+
+
+def test_orders_and_signatures_share_the_generator(tmp_path):
+    exchange = bullish({'apiKey': 'key', 'secret': 'secret', 'account_id': '111000000000001',
+                        'options': {'nonceFile': str(tmp_path / 'nonce')}})
+    exchange.creds = {'token': 'token'}
+    exchange.symbols_unified_to_bullish = {'BTC/USDC': 'BTCUSDC'}
+    request = exchange._make_create_order_request('BTC/USDC', 'limit', 'buy', 0.1, 63000)
+    headers = exchange.sign('orders', 'privateV2', 'POST', request)['headers']
+    assert int(headers['BX-NONCE']) > int(request['clientOrderId'])
+    assert int(exchange.local_nonce()) > int(headers['BX-NONCE'])
@@ -0,0 +1,118 @@
+import pytest
+
+from bullish_ccxt.bullish import bullish
+from bullish_ccxt.order_tracker import OrderTracker
+from tests import mock_responses
+
+
+class FakeOrders:
+    def __init__(self):
+        self.orders = {}
+        self.trades = []
+        self.requests = []
+
+    def add(self, id, **fields):
+        self.orders[id] = dict(mock_responses.ORDER, orderId=id, clientOrderId='c' + id, **fields)
+
+    def get_orders(self, params={}):
+        self.requests.append(('orders', params))
+        orders = list(self.orders.values())
+        if params.get('status') == 'OPEN':
+            orders = [order for order in orders if order['status'] == 'OPEN']
+        if 'createdAtTimestamp[gte]' in params:
+            orders = [order for order in orders if int(order['createdAtTimestamp']) >= params['createdAtTimestamp[gte]']]
+        return mock_responses.paginated(orders)
+
+    def get_trades(self, params={}):
+        self.requests.append(('trades', params))
+        return mock_responses.paginated(self.trades)
+
+    def get_order(self, params={}):
+        self.requests.append(('order', params))
+        return self.orders[params['id']]
+
+
+@pytest.fixture
+def server():
+    return FakeOrders()
+
+
+@pytest.fixture
+def tracker(mocker, server):
+    exchange = bullish({'account_id': '111000000000001', 'enableRateLimit': False})
+    exchange.symbols_bullish_to_unified = {'BTCUSDC': 'BTC/USDC'}
+    exchange.symbols_unified_to_bullish = {'BTC/USDC': 'BTCUSDC'}
+    mocker.patch.object(exchange, 'privateGetOrders', side_effect=server.get_orders)
+    mocker.patch.object(exchange, 'privateGetMyTrades', side_effect=server.get_trades)
+    mocker.patch.object(exchange, 'privateGetOrderById', side_effect=server.get_order)
+    return OrderTracker(exchange, reconcile_every=3)
+
+
+def test_loads_open_orders_and_indexes_them(tracker, server):
+    server.add('1', status='OPEN')
+    server.add('2', status='CLOSED')
+    events = tracker.refresh()
+    assert [event['type'] for event in events] == ['new']
+    assert tracker.get('1')['id'] == '1'
+    assert tracker.get_by_client_order_id('c1')['id'] == '1'
+    assert tracker.get('2') is None
+
+
+def test_reports_fills_and_status_transitions_from_deltas(tracker, server):
+    server.add('1', status='OPEN', quantityFilled='0.00000000')
+    tracker.refresh()
+    seen = []
+    tracker.add_listener(seen.append)
+
+    server.requests.clear()
+    server.add('1', status='CLOSED', quantityFilled='0.10000000', createdAtTimestamp='0')
+    server.trades = [dict(mock_responses.TRADE, orderId='1')]
+    events = tracker.refresh()
+    assert [event['type'] for event in events] == ['fill', 'status']
+    assert seen == events
+    assert tracker.open_orders() == []
+    # Only the traded order is looked up, the open order list is not downloaded again
+    assert ('order', {'tradingAccountId': '111000000000001', 'id': '1'}) in server.requests
+    assert not any(params.get('status') == 'OPEN' for _, params in server.requests)
+
+
+def test_only_traded_orders_are_looked_up(tracker, server):
+    for id in ('1', '2', '3'):
+        server.add(id, status='OPEN', quantityFilled='0.00000000', createdAtTimestamp='0')
+    tracker.refresh()
+
+    server.requests.clear()
+    for id in ('1', '2', '3'):
+        server.add(id, status='OPEN', quantityFilled='0.01000000', createdAtTimestamp='0')
+    server.trades = [dict(mock_responses.TRADE, tradeId=id, orderId=id) for id in ('1', '2', '3')]
+    events = tracker.refresh()
+    assert [(event['type'], event['order']['id']) for event in events] == [('fill', '1'), ('fill', '2'), ('fill', '3')]
+    assert [request for request, _ in server.requests] == ['orders', 'trades', 'order', 'order', 'order']
+
+
+def test_orders_first_seen_closed_report_their_fill_and_status(tracker, server):
+    tracker.refresh()
+    server.add('1', status='CLOSED', quantityFilled='0.10000000', createdAtTimestamp=str(tracker.exchange.milliseconds()))
+    events = tracker.refresh()
+    assert [event['type'] for event in events] == ['new', 'fill', 'status']
+    assert events[2]['order']['status'] == 'closed'
+    assert tracker.get('1') is None
+
+
+def test_unchanged_orders_are_not_parsed_again(tracker, server, mocker):
+    server.add('1', status='OPEN', createdAtTimestamp=str(tracker.exchange.milliseconds()))
+    tracker.refresh()
+    parse_order = mocker.spy(tracker.exchange, 'parse_order')
+    assert tracker.refresh() == []
+    assert parse_order.call_count == 0
+
+
+def test_reconciles_cancellations_made_elsewhere(tracker, server):
+    server.add('1', status='OPEN', createdAtTimestamp='0')
+    tracker.refresh()
+    server.add('1', status='CANCELLED', createdAtTimestamp='0')
+    assert tracker.refresh() == []
+    assert tracker.refresh() == []
+    events = tracker.refresh()
+    assert [event['type'] for event in events] == ['status']
+    assert tracker.get('1') is None
@@ -0,0 +1,82 @@
+import asyncio
+import threading
+import pytest
+
+from bullish_ccxt.bullish import bullish
+from bullish_ccxt.async_support import bullish as async_bullish
+from tests import mock_responses
+from tests.schema_utils import matches_schema, orders_schema, trades_schema
+
+PAGES = {
+    None: mock_responses.paginated([dict(mock_responses.ORDER, orderId=str(i)) for i in range(0, 3)], 'page2'),
+    'page2': mock_responses.paginated([dict(mock_responses.ORDER, orderId=str(i)) for i in range(3, 6)], 'page3'),
+    'page3': mock_responses.paginated([dict(mock_responses.ORDER, orderId=str(i)) for i in range(6, 8)]),
+}
+
+
+def make_exchange(cls):
+    exchange = cls({'account_id': '111000000000001', 'enableRateLimit': False})
+    exchange.symbols_bullish_to_unified = {'BTCUSDC': 'BTC/USDC'}
+    exchange.symbols_unified_to_bullish = {'BTC/USDC': 'BTCUSDC'}
+    return exchange
+
+
+@pytest.fixture
+def exchange(mocker):
+    exchange = make_exchange(bullish)
+    exchange.requests = []
+
+    def get_orders(params={}):
+        exchange.requests.append(params)
+        return PAGES[params.get('_nextPage')]
+
+    mocker.patch.object(exchange, 'privateGetOrders', side_effect=get_orders)
+    return exchange
+
+
+def test_iterates_over_all_pages(exchange):
+    orders = list(exchange.iter_orders())
+    assert matches_schema(orders, orders_schema)
+    assert [order['id'] for order in orders] == [str(i) for i in range(8)]
+    assert [request.get('_nextPage') for request in exchange.requests] == [None, 'page2', 'page3']
+    assert all(request['_pageSize'] == 100 for request in exchange.requests)
+
+
+def test_stops_fetching_once_limit_is_satisfied(exchange):
+    orders = list(exchange.iter_orders(limit=3))
+    assert len(orders) == 3
+    assert len(exchange.requests) == 1
+    orders = list(exchange.iter_orders(limit=4))
+    assert len(orders) == 4
+    assert len(exchange.requests) == 3
+
+
+def test_prefetches_next_page_while_current_is_consumed(mocker):
+    exchange = make_exchange(bullish)
+    second_page_requested = threading.Event()
+
+    def get_trades(params={}):
+        if params.get('_nextPage') is None:
+            return mock_responses.paginated([mock_responses.TRADE], 'page2')
+        second_page_requested.set()
+        return mock_responses.paginated([mock_responses.TRADE])
+
+    mocker.patch.object(exchange, 'privateGetMyTrades', side_effect=get_trades)
+    trades = exchange.iter_my_trades('BTC/USDC')
+    first = next(trades)
+    assert second_page_requested.wait(1)
+    assert matches_schema([first] + list(trades), trades_schema)
+
+
+def test_async_iterates_over_all_pages(mocker):
+    exchange = make_exchange(async_bullish)
+
+    async def get_orders(params={}):
+        return PAGES[params.get('_nextPage')]
+
+    mocker.patch.object(exchange, 'privateGetOrders', side_effect=get_orders)
+
+    async def collect():
+        return [order['id'] async for order in exchange.iter_orders(limit=5)]
+
+    assert asyncio.run(collect()) == [str(i) for i in range(5)]
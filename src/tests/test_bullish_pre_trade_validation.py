@@ -0,0 +1,121 @@
+import asyncio
+import json
+import pytest
+
+from ccxt.base.errors import BadRequest, InsufficientFunds
+from bullish_ccxt.bullish import bullish
+from bullish_ccxt.async_support import bullish as async_bullish
+from tests import mock_responses
+
+
+def respond(url, method='GET', headers=None, body=None):
+    if url.endswith('/markets'):
+        return mock_responses.MARKETS
+    if url.endswith('/assets'):
+        return mock_responses.ASSETS
+    if '/accounts/asset' in url:
+        return [mock_responses.BALANCE]
+    return dict(mock_responses.CREATE_ORDER, body=json.loads(body))
+
+
+def make_exchange(mocker, mode, cls=bullish):
+    exchange = cls({'apiKey': 'key', 'secret': 'secret', 'account_id': '111000000000001', 'enableRateLimit': False,
+                    'options': {'preTradeValidation': mode}})
+    exchange.creds = mock_responses.LOGIN
+    if cls is bullish:
+        mocker.patch.object(exchange, 'fetch', side_effect=respond)
+    else:
+        async def fetch(*args):
+            return respond(*args)
+        mocker.patch.object(exchange, 'fetch', side_effect=fetch)
+    return exchange
+
+
+def sent_orders(exchange):
+    return [call.args[3] for call in exchange.fetch.call_args_list if call.args[1] == 'POST']
+
+
+def test_rejects_orders_breaking_market_rules_without_sending_them(mocker):
+    exchange = make_exchange(mocker, 'reject')
+    with pytest.raises(BadRequest, match='PRICE_MUST_BE_OF_TICK_SIZE'):
+        exchange.create_order('BTC/USDC', 'limit', 'buy', 0.1, 63000.12345)
+    with pytest.raises(BadRequest, match='ORDER_SIZE_OUTSIDE_VALID_RANGE'):
+        exchange.create_order('BTC/USDC', 'limit', 'buy', 0.123456789, 63000)
+    with pytest.raises(BadRequest, match='ORDER_SIZE_OUTSIDE_VALID_RANGE'):
+        exchange.create_order('BTC/USDC', 'limit', 'buy', 200, 63000)
+    with pytest.raises(BadRequest, match='ORDER_SIZE_OUTSIDE_VALID_RANGE'):
+        exchange.create_order('BTC/USDC', 'limit', 'buy', 0.00001, 1000)
+    assert sent_orders(exchange) == []
+    response = exchange.create_order('BTC/USDC', 'limit', 'buy', 10, 0.1 + 0.2)
+    assert response['body']['price'] == '0.30000000000000004'
+    assert len(sent_orders(exchange)) == 1
+
+
+def test_rounds_to_the_passive_side(mocker):
+    exchange = make_exchange(mocker, 'round')
+    buy = exchange.create_order('BTC/USDC', 'limit', 'buy', 0.123456789, 63000.12345)['body']
+    sell = exchange.create_order('BTC/USDC', 'limit', 'sell', 0.123456789, 63000.12345)['body']
+    assert (buy['quantity'], buy['price']) == ('0.12345678', '63000.1234')
+    assert (sell['quantity'], sell['price']) == ('0.12345678', '63000.1235')
+
+
+def test_checks_funds_against_the_last_balances(mocker):
+    exchange = make_exchange(mocker, 'reject')
+    # Without balances, funds are left to the exchange
+    exchange.create_order('BTC/USDC', 'limit', 'sell', 0.1, 63000)
+    exchange.fetch_balance()
+    exchange.create_order('BTC/USDC', 'limit', 'buy', 0.1, 63000)
+    with pytest.raises(InsufficientFunds, match='NOT_ENOUGH_FUNDS__BUY_LIMIT_ORDER'):
+        exchange.create_order('BTC/USDC', 'limit', 'buy', 0.1, 63000)
+    with pytest.raises(InsufficientFunds, match='NOT_ENOUGH_FUNDS__SELL_LIMIT_ORDER'):
+        exchange.create_order('BTC/USDC', 'limit', 'sell', 0.1, 63000)
+    # Perpetuals trade on margin
+    exchange.create_order('BTC/USDC:USDC', 'limit', 'buy', 0.1, 63000)
+    exchange.fetch_balance()
+    exchange.create_order('BTC/USDC', 'limit', 'buy', 0.1, 63000)
+    assert len(sent_orders(exchange)) == 4
+
+
+def test_async_create_orders_are_validated(mocker):
+    async def run():
+        exchange = make_exchange(mocker, 'reject', async_bullish)
+        try:
+            return await exchange.create_orders([
+                {'symbol': 'BTC/USDC', 'type': 'limit', 'side': 'buy', 'amount': 0.1, 'price': 63000},
+                {'symbol': 'BTC/USDC', 'type': 'limit', 'side': 'buy', 'amount': 0.1, 'price': 63000.00001},
+            ])
+        finally:
+            await exchange.close()
+
+    results = asyncio.run(run())
+    assert results[0]['body']['price'] == '63000'
+    assert isinstance(results[1], BadRequest)
+
+
+def test_sides_are_case_insensitive(mocker):
+    exchange = make_exchange(mocker, 'round')
+    exchange.fetch_balance()
+    buy = exchange.create_order('BTC/USDC', 'limit', 'BUY', 0.1, 63000.12345)['body']
+    assert (buy['side'], buy['price']) == ('BUY', '63000.1234')
+    with pytest.raises(InsufficientFunds, match='NOT_ENOUGH_FUNDS__BUY_LIMIT_ORDER'):
+        exchange.create_order('BTC/USDC', 'limit', 'BUY', 0.1, 63000)
+
+
+def test_funds_are_only_held_by_acknowledged_orders(mocker):
+    exchange = make_exchange(mocker, 'reject')
+    exchange.load_markets()
+    exchange.fetch_balance()
+    free = dict(exchange.order_validator.free)
+    exchange._validate_order('BTC/USDC', 'buy', 0.1, 63000)
+    assert exchange.order_validator.free == free
+
+    exchange.fetch.side_effect = InsufficientFunds('bullish NOT_ENOUGH_FUNDS__BUY_LIMIT_ORDER')
+    with pytest.raises(InsufficientFunds):
+        exchange.create_order('BTC/USDC', 'limit', 'buy', 0.1, 63000)
+    results = exchange.create_orders([{'symbol': 'BTC/USDC', 'type': 'limit', 'side': 'buy', 'amount': 0.1, 'price': 63000}])
+    assert isinstance(results[0], InsufficientFunds)
+    assert exchange.order_validator.free == free
+
+    exchange.fetch.side_effect = respond
+    exchange.create_order('BTC/USDC', 'limit', 'buy', 0.1, 63000)
+    assert exchange.order_validator.free['USDC'] == pytest.approx(free['USDC'] - 6300)
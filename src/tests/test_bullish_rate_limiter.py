@@ -0,0 +1,117 @@
+import asyncio
+import threading
+import time
+
+from bullish_ccxt.bullish import bullish
+from bullish_ccxt.async_support import bullish as async_bullish
+from bullish_ccxt.rate_limiter import TokenBucket
+from tests import mock_responses
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_spaces_requests_beyond_capacity():
+    clock = Clock()
+    bucket = TokenBucket(2, 10, clock)
+    assert [bucket.reserve() for _ in range(4)] == [0, 0, 0.1, 0.2]
+    clock.now += 1
+    assert bucket.reserve() == 0
+    assert bucket.reserve(3) == 0.2
+    bucket.back_off(5)
+    assert bucket.reserve() == 5
+
+
+def test_bucket_is_shared_by_threads():
+    clock = Clock()
+    bucket = TokenBucket(1, 100, clock)
+    delays = []
+    lock = threading.Lock()
+
+    def reserve():
+        for _ in range(10):
+            delay = bucket.reserve()
+            with lock:
+                delays.append(delay)
+
+    threads = [threading.Thread(target=reserve) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(round(delay, 6) for delay in delays) == [round(i / 100, 6) for i in range(80)]
+
+
+def make_exchange(cls=bullish, **options):
+    exchange = cls({
+        'apiKey': 'key',
+        'secret': 'secret',
+        'account_id': '111000000000001',
+        'options': options,
+    })
+    exchange.creds = mock_responses.LOGIN
+    exchange.symbols_bullish_to_unified = {'BTCUSDC': 'BTC/USDC'}
+    exchange.symbols_unified_to_bullish = {'BTC/USDC': 'BTCUSDC'}
+    return exchange
+
+
+def test_requests_draw_from_the_budget_of_their_api(mocker):
+    exchange = make_exchange(rateLimitCosts={'GET orders': 5})
+    assert exchange.rateLimit < 1000
+    mocker.patch.object(exchange, 'fetch', return_value={'data': [], 'links': {}})
+    reserve = mocker.spy(exchange.rate_limiter, 'reserve')
+    exchange.publicGetMarketTickerBySymbol({'symbol': 'BTCUSDC'})
+    exchange.privateGetOrders({'tradingAccountId': '111000000000001'})
+    exchange.privateGetMyTrades({'tradingAccountId': '111000000000001'})
+    assert [call.args for call in reserve.call_args_list] == [('public', 1), ('private', 5), ('private', 1)]
+
+
+def test_adapts_to_rate_limit_headers_and_429(mocker):
+    exchange = make_exchange()
+    sleep = mocker.patch('time.sleep')
+    private_headers = {'Authorization': 'Bearer token'}
+    exchange.on_rest_response(200, 'OK', 'url', 'GET', {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '2'}, '', private_headers, None)
+    assert exchange.rate_limiter.reserve('private') > 1.9
+    assert exchange.rate_limiter.reserve('public') == 0
+    exchange.on_rest_response(429, 'Too Many Requests', 'url', 'GET', {'Retry-After': '3'}, '', {}, None)
+    assert exchange.rate_limiter.reserve('public') > 2.9
+    exchange.on_rest_response(429, 'Too Many Requests', 'url', 'GET', {}, '', {}, None)
+    assert exchange.rate_limiter.reserve('public') > 2.9
+    sleep.assert_not_called()
+
+
+def test_rate_limit_token_is_sent_once_accounts_are_fetched(mocker):
+    exchange = make_exchange()
+    accounts = [
+        {'tradingAccountId': '111000000000002', 'tradingAccountName': 'other', 'rateLimitToken': 'other-token'},
+        {'tradingAccountId': '111000000000001', 'tradingAccountName': 'main', 'rateLimitToken': 'main-token'},
+    ]
+    assert 'BX-RATELIMIT-TOKEN' not in exchange.sign('orders', 'privateV2', 'POST', {'symbol': 'BTCUSDC'})['headers']
+    mocker.patch.object(exchange, 'fetch', return_value=accounts)
+    exchange.fetch_accounts()
+    assert exchange.rate_limit_token == 'main-token'
+    assert exchange.sign('orders', 'privateV2', 'POST', {'symbol': 'BTCUSDC'})['headers']['BX-RATELIMIT-TOKEN'] == 'main-token'
+
+
+def test_async_callers_share_the_budget(mocker):
+    async def run():
+        exchange = make_exchange(async_bullish, rateLimits={'public': {'capacity': 1, 'refillRate': 20}})
+
+        async def fetch(url, method='GET', headers=None, body=None):
+            return mock_responses.TICKER
+
+        mocker.patch.object(exchange, 'fetch', side_effect=fetch)
+        try:
+            started = time.monotonic()
+            await asyncio.gather(*[exchange.fetch_ticker('BTC/USDC') for _ in range(5)])
+            return time.monotonic() - started
+        finally:
+            await exchange.close()
+
+    assert asyncio.run(run()) >= 0.19
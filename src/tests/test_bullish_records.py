@@ -0,0 +1,84 @@
+import asyncio
+import tracemalloc
+import pytest
+from ccxt.base.errors import NotSupported
+
+from bullish_ccxt.bullish import bullish
+from bullish_ccxt.async_support import bullish as async_bullish
+from tests import mock_responses
+from tests.test_bullish_fast_parsers import ORDERS, TRADES
+
+
+def make_exchange(cls=bullish, **options):
+    exchange = cls({'account_id': '111000000000001', 'enableRateLimit': False, 'options': options})
+    exchange.symbols_bullish_to_unified = {'BTCUSDC': 'BTC/USDC', 'BTC-USDC-PERP': 'BTC/USDC:USDC'}
+    exchange.symbols_unified_to_bullish = {'BTC/USDC': 'BTCUSDC', 'BTC/USDC:USDC': 'BTC-USDC-PERP'}
+    return exchange
+
+
+def test_compact_records_read_like_dicts(mocker):
+    exchange = make_exchange(compactRecords=True)
+    mocker.patch.object(exchange, 'publicGetMarketTradesBySymbol', return_value=TRADES)
+    trades = exchange.fetch_trades('BTC/USDC')
+    assert trades == make_exchange().parse_trades_fast(TRADES)
+    trade = trades[0]
+    assert not isinstance(trade, dict)
+    assert trade['price'] == trade.price == 63000.0
+    assert trade.get('fee') is None
+    assert dict(trade)['info'] == mock_responses.TRADE
+    with pytest.raises(AttributeError):
+        trade.__dict__
+    order = exchange.parse_order(mock_responses.ORDER)
+    order['status'] = 'closed'
+    assert order.status == 'closed'
+    assert exchange.parse_ticker(mock_responses.TICKER, 'BTC/USDC')['bid'] == 63000.0
+    assert exchange.parse_balance(mock_responses.BALANCE)['free'] == 10000.0
+    positions = exchange.parse_positions([mock_responses.POSITION])
+    assert positions[0].symbol == 'BTC/USDC:USDC'
+
+
+def test_lazy_info_is_decoded_on_access():
+    exchange = make_exchange(compactRecords=True, recordInfo='lazy')
+    orders = exchange.parse_orders_fast(ORDERS)
+    assert isinstance(orders[0]._info, str)
+    assert orders[0].info == ORDERS[0]
+    assert orders == make_exchange().parse_orders_fast(ORDERS)
+
+
+def test_dropped_info():
+    assert make_exchange(recordInfo='drop').parse_trade(mock_responses.TRADE)['info'] is None
+    trades = make_exchange(compactRecords=True, recordInfo='drop').parse_trades_fast(TRADES)
+    assert [trade['info'] for trade in trades] == [None] * len(TRADES)
+    with pytest.raises(NotSupported):
+        make_exchange(recordInfo='lazy').parse_trade(mock_responses.TRADE)
+
+
+def test_compact_records_use_less_memory():
+    trades = [dict(mock_responses.TRADE, tradeId=str(100020000000000000 + i)) for i in range(1000)]
+
+    def allocated(exchange):
+        tracemalloc.start()
+        parsed = exchange.parse_trades_fast(trades)
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        assert len(parsed) == len(trades)
+        return size
+
+    full = allocated(make_exchange())
+    assert allocated(make_exchange(compactRecords=True)) < full * 0.75
+    assert allocated(make_exchange(compactRecords=True, recordInfo='drop')) < full * 0.75
+
+
+def test_async_fetch_orders_compact(mocker):
+    async def run():
+        exchange = make_exchange(async_bullish, compactRecords=True, recordInfo='lazy')
+        mocker.patch.object(exchange, 'privateGetOrders', new_callable=mocker.AsyncMock,
+                            return_value={'data': ORDERS, 'links': {}})
+        try:
+            return await exchange.fetch_orders('BTC/USDC')
+        finally:
+            await exchange.close()
+
+    orders = asyncio.run(run())
+    assert [order.id for order in orders] == [order['orderId'] for order in ORDERS]
+    assert orders[1]['info'] == ORDERS[1]
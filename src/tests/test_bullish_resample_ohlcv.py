@@ -0,0 +1,108 @@
+import asyncio
+import pytest
+
+from ccxt.base.errors import BadRequest
+from bullish_ccxt.bullish import bullish
+from bullish_ccxt.async_support import bullish as async_bullish
+from tests import mock_responses
+
+SINCE = 1714521600000
+MINUTE = 60000
+# The 15m candle starting at minute 45 is still open, and the 5m candle at minute 20 is missing
+NOW = SINCE + 52 * MINUTE
+
+
+def candle(minute):
+    return dict(mock_responses.CANDLES[0], open=str(63000 + minute), high=str(63100 + minute), low=str(62900 + minute),
+                close=str(63000 + minute + 4), volume='1.0', createdAtTimestamp=str(SINCE + minute * MINUTE))
+
+
+def get_candles(params={}):
+    assert params['timeBucket'] == '5m'
+    start = bullish.parse8601(params['createdAtDatetime[gte]'])
+    end = bullish.parse8601(params['createdAtDatetime[lte]'])
+    return [candle(minute) for minute in range(0, 55, 5) if minute != 20 and start <= SINCE + minute * MINUTE <= min(end, NOW)]
+
+
+def make_exchange(cls, mocker):
+    exchange = cls({'enableRateLimit': False})
+    exchange.symbols_bullish_to_unified = {'BTCUSDC': 'BTC/USDC'}
+    exchange.symbols_unified_to_bullish = {'BTC/USDC': 'BTCUSDC'}
+    mocker.patch.object(exchange, 'milliseconds', return_value=NOW)
+    return exchange
+
+
+def test_resamples_from_coarsest_dividing_timeframe(mocker):
+    exchange = make_exchange(bullish, mocker)
+    mocker.patch.object(exchange, 'publicGetMarketCandleBySymbol', side_effect=get_candles)
+    assert exchange._resample_base_timeframe('15m') == '5m'
+    assert exchange._resample_base_timeframe('4h') == '1h'
+    assert exchange._resample_base_timeframe('2d') == '1d'
+
+    candles = exchange.fetch_ohlcv('BTC/USDC', '15m', SINCE - 5 * MINUTE)
+    assert candles == [
+        [SINCE, 63000.0, 63110.0, 62900.0, 63014.0, 3.0],
+        [SINCE + 15 * MINUTE, 63015.0, 63125.0, 62915.0, 63029.0, 2.0],
+        [SINCE + 30 * MINUTE, 63030.0, 63140.0, 62930.0, 63044.0, 3.0],
+        # Partial bucket
+        [SINCE + 45 * MINUTE, 63045.0, 63150.0, 62945.0, 63054.0, 2.0],
+    ]
+
+
+def test_serves_closed_buckets_from_cache(mocker):
+    exchange = make_exchange(bullish, mocker)
+    requests = mocker.patch.object(exchange, 'publicGetMarketCandleBySymbol', side_effect=get_candles)
+    expected = exchange.fetch_ohlcv('BTC/USDC', '15m', SINCE, 4)
+    calls = requests.call_count
+
+    # Only the open bucket is fetched again, closed ones are kept even when missing a 5m candle
+    assert exchange.fetch_ohlcv('BTC/USDC', '15m', SINCE, 4) == expected
+    assert requests.call_count == calls + 1
+    last = requests.call_args[0][0]
+    assert bullish.parse8601(last['createdAtDatetime[gte]']) == SINCE + 45 * MINUTE
+
+    assert exchange.fetch_ohlcv('BTC/USDC', '15m', SINCE, 2) == expected[:2]
+    assert requests.call_count == calls + 1
+    assert exchange.fetch_ohlcv('BTC/USDC', '15m', SINCE, 2, params={'format': 'columns'}).to_list() == expected[:2]
+
+    # Buckets without candles are not cached either
+    assert exchange.fetch_ohlcv('BTC/USDC', '15m', SINCE - 30 * MINUTE, 2) == []
+    assert exchange.fetch_ohlcv('BTC/USDC', '15m', SINCE - 30 * MINUTE, 2) == []
+    assert requests.call_count == calls + 3
+
+
+def test_missing_values_are_left_out(mocker):
+    exchange = make_exchange(bullish, mocker)
+
+    def get_candles_with_missing_values(params={}):
+        candles = get_candles(params)
+        candles[0] = dict(candles[0], open=None, high=None, volume=None)
+        candles[1] = dict(candles[1], low=None, createdAtTimestamp=None)
+        return candles
+
+    mocker.patch.object(exchange, 'publicGetMarketCandleBySymbol', side_effect=get_candles_with_missing_values)
+    assert exchange.fetch_ohlcv('BTC/USDC', '15m', SINCE, 1) == [[SINCE, 63010.0, 63110.0, 62900.0, 63014.0, 1.0]]
+
+
+def test_rejects_timeframes_without_native_divisor():
+    with pytest.raises(BadRequest):
+        bullish().fetch_ohlcv('BTC/USDC', '45s')
+
+
+def test_async_resamples(mocker):
+    async def run():
+        exchange = make_exchange(async_bullish, mocker)
+
+        async def get(params={}):
+            return get_candles(params)
+
+        mocker.patch.object(exchange, 'publicGetMarketCandleBySymbol', side_effect=get)
+        try:
+            return await exchange.fetch_ohlcv('BTC/USDC', '10m', SINCE, 2)
+        finally:
+            await exchange.close()
+
+    assert asyncio.run(run()) == [
+        [SINCE, 63000.0, 63105.0, 62900.0, 63009.0, 2.0],
+        [SINCE + 10 * MINUTE, 63010.0, 63115.0, 62910.0, 63019.0, 2.0],
+    ]
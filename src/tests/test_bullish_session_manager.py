@@ -0,0 +1,90 @@
+import asyncio
+import base64
+import json
+import time
+
+from ccxt.base.errors import AuthenticationError
+from bullish_ccxt.bullish import bullish
+from bullish_ccxt.async_support import bullish as async_bullish
+from bullish_ccxt.session_manager import parse_token_expiry
+from tests import mock_responses
+
+
+def make_token(expires_at_ms):
+    claims = base64.urlsafe_b64encode(json.dumps({'exp': expires_at_ms // 1000}).encode()).decode().rstrip('=')
+    return 'eyJhbGciOiJIUzI1NiJ9.' + claims + '.c2lnbmF0dXJl'
+
+
+def make_exchange(cls, options={}):
+    return cls({
+        'apiKey': 'key',
+        'secret': 'secret',
+        'account_id': '111000000000001',
+        'enableRateLimit': False,
+        'options': options,
+    })
+
+
+def test_parses_token_expiry():
+    assert parse_token_expiry(make_token(1714608000000)) == 1714608000000
+    assert parse_token_expiry('not-a-jwt') is None
+
+
+def test_refreshes_token_in_the_background_before_expiry(mocker):
+    exchange = make_exchange(bullish, {'sessionRefreshMargin': 4950})
+    tokens = [make_token(exchange.milliseconds() + 5000), make_token(exchange.milliseconds() + 3600000)]
+    logins = mocker.patch.object(exchange, 'publicGetHmacLogin', side_effect=[{'token': token} for token in tokens])
+    mocker.patch.object(exchange, 'fetch', return_value=mock_responses.paginated([]))
+
+    exchange.privateGetOrders()
+    assert exchange.creds['token'] == tokens[0]
+    time.sleep(0.5)
+    assert logins.call_count == 2
+    assert exchange.creds['token'] == tokens[1]
+    exchange.privateGetOrders()
+    assert exchange.last_request_headers['Authorization'] == 'Bearer ' + tokens[1]
+    exchange.session_manager.close()
+
+
+def test_expired_token_is_replaced_before_signing(mocker):
+    exchange = make_exchange(bullish, {'sessionAutoRefresh': False})
+    tokens = [make_token(exchange.milliseconds() - 1000), make_token(exchange.milliseconds() + 3600000)]
+    mocker.patch.object(exchange, 'publicGetHmacLogin', side_effect=[{'token': token} for token in tokens])
+    mocker.patch.object(exchange, 'fetch', return_value=mock_responses.paginated([]))
+    exchange.login()
+    exchange.privateGetOrders()
+    assert exchange.last_request_headers['Authorization'] == 'Bearer ' + tokens[1]
+
+
+def test_replays_request_once_after_auth_error(mocker):
+    exchange = make_exchange(bullish, {'sessionAutoRefresh': False})
+    logins = mocker.patch.object(exchange, 'publicGetHmacLogin', side_effect=[{'token': 'first'}, {'token': 'second'}])
+    fetch = mocker.patch.object(exchange, 'fetch', side_effect=[
+        AuthenticationError('bullish CLIENT_NOT_LOGGED_IN'),
+        mock_responses.paginated([]),
+    ])
+    assert exchange.privateGetOrders() == mock_responses.paginated([])
+    assert logins.call_count == 2
+    assert fetch.call_count == 2
+    assert exchange.last_request_headers['Authorization'] == 'Bearer second'
+
+
+def test_async_replays_request_once_after_auth_error(mocker):
+    exchange = make_exchange(async_bullish, {'sessionAutoRefresh': False})
+    logins = mocker.patch.object(exchange, 'publicGetHmacLogin', side_effect=[{'token': 'first'}, {'token': 'second'}])
+    responses = [AuthenticationError('bullish CLIENT_NOT_LOGGED_IN'), mock_responses.paginated([])]
+
+    async def fetch(url, method='GET', headers=None, body=None):
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    async def login(params={}):
+        return {'token': logins()['token']}
+
+    exchange.publicGetHmacLogin = login
+    mocker.patch.object(exchange, 'fetch', side_effect=fetch)
+    assert asyncio.run(exchange.privateGetOrders()) == mock_responses.paginated([])
+    assert logins.call_count == 2
+    assert exchange.last_request_headers['Authorization'] == 'Bearer second'
@@ -0,0 +1,59 @@
+import hmac
+import json
+from hashlib import sha256
+
+from bullish_ccxt.bullish import bullish
+from tests import mock_responses
+
+ORDER_REQUEST = {
+    'symbol': 'BTCUSDC', 'commandType': 'V3CreateOrder', 'side': 'BUY', 'type': 'LMT', 'timeInForce': 'GTC',
+    'quantity': '0.1', 'price': '63000.0', 'clientOrderId': '1714521600000000', 'tradingAccountId': '111000000000001',
+}
+
+
+def make_exchange(secret='secret'):
+    exchange = bullish({'apiKey': 'key', 'secret': secret, 'account_id': '111000000000001'})
+    exchange.creds = mock_responses.LOGIN
+    return exchange
+
+
+def reference_signature(secret, message):
+    return hmac.new(secret.encode('utf-8'), message.encode('utf-8'), sha256).hexdigest()
+
+
+def test_signs_the_body_as_sent():
+    exchange = make_exchange()
+    request = exchange.sign('orders', 'privateV2', 'POST', ORDER_REQUEST)
+    headers = request['headers']
+    assert json.loads(request['body']) == ORDER_REQUEST
+    message = headers['BX-TIMESTAMP'] + headers['BX-NONCE'] + 'POST' + '/trading-api/v2/orders' + request['body']
+    assert headers['BX-SIGNATURE'] == reference_signature('secret', sha256(message.encode('utf-8')).hexdigest())
+    assert request['url'] == 'https://api.exchange.bullish.com/trading-api/v2/orders'
+
+
+def test_signs_the_login():
+    exchange = make_exchange()
+    headers = exchange.sign('users/hmac/login', 'public', 'GET', {})['headers']
+    message = headers['BX-TIMESTAMP'] + headers['BX-NONCE'] + 'GET' + '/trading-api/v1/users/hmac/login'
+    assert headers['BX-SIGNATURE'] == reference_signature('secret', message)
+    assert headers['BX-PUBLIC-KEY'] == 'key'
+
+    # The query string is not part of the signed path
+    request = exchange.sign('users/hmac/login', 'public', 'GET', {'ttl': '60'})
+    assert request['url'].endswith('/users/hmac/login?ttl=60')
+    headers = request['headers']
+    message = headers['BX-TIMESTAMP'] + headers['BX-NONCE'] + 'GET' + '/trading-api/v1/users/hmac/login'
+    assert headers['BX-SIGNATURE'] == reference_signature('secret', message)
+
+
+def test_signer_is_keyed_again_when_the_secret_changes():
+    exchange = make_exchange()
+    exchange.sign('orders', 'privateV2', 'POST', ORDER_REQUEST)
+    signer = exchange.signer
+    exchange.sign('orders', 'privateV2', 'POST', ORDER_REQUEST)
+    assert exchange.signer is signer
+    exchange.secret = 'other'
+    headers = exchange.sign('users/hmac/login', 'public', 'GET', {})['headers']
+    message = headers['BX-TIMESTAMP'] + headers['BX-NONCE'] + 'GET' + '/trading-api/v1/users/hmac/login'
+    assert headers['BX-SIGNATURE'] == reference_signature('other', message)
+    assert exchange.signer is not signer
@@ -0,0 +1,43 @@
+import subprocess
+import sys
+
+from bullish_ccxt.bullish import bullish
+from bullish_ccxt.async_support import bullish as async_bullish
+
+CONFIG = {'apiKey': 'key', 'secret': 'secret', 'account_id': '111000000000001', 'options': {'nonceFile': None}}
+
+
+OPTIONAL_MODULES = ['array_order_book', 'candle_cache', 'columns', 'fast_parsers', 'metadata_cache', 'order_tracker',
+                    'order_validator', 'records']
+STARTUP = """
+import sys, bullish_ccxt
+bullish_ccxt.bullish({})
+print(sorted(set(sys.modules) & {"websocket", "ccxt.async_support", "bullish"} | {name for name in %r if "bullish_ccxt." + name in sys.modules}))
+bullish_ccxt.ArrayOrderBook
+print("bullish_ccxt.array_order_book" in sys.modules)
+""" % OPTIONAL_MODULES
+
+
+def test_import_and_construction_only_load_the_core():
+    output = subprocess.run([sys.executable, '-c', STARTUP], capture_output=True, text=True, check=True).stdout
+    assert output.split() == ['[]', 'True']
+
+
+def test_instances_have_camelcase_aliases():
+    exchange = bullish(dict(CONFIG, user_id='u1'))
+    assert exchange.accountId == '111000000000001' and exchange.userId == 'u1'
+    assert exchange.fetchOHLCV == exchange.fetch_ohlcv and exchange.fetchCachedOHLCV == exchange.fetch_cached_ohlcv
+    assert exchange.logger.name == 'ccxt.base.exchange'
+    assert 'fetch_ohlcv' in dir(exchange)
+
+
+def test_describe_is_copied_for_every_instance():
+    first, second = bullish({'options': {'recordInfo': 'drop'}}), async_bullish({})
+    assert first.describe() == second.describe()
+    assert first.describe()['options']['recordInfo'] == 'keep'
+    first.describe()['options']['rateLimits']['public']['capacity'] = 1
+    first.options['rateLimits']['public']['capacity'] = 1
+    first.has['fetchOHLCV'] = False
+    assert second.options['rateLimits']['public']['capacity'] == 50
+    assert bullish({}).describe()['options']['rateLimits']['public']['capacity'] == 50
+    assert second.has['fetchOHLCV'] and bullish({}).has['fetchOHLCV']
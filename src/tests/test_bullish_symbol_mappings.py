@@ -0,0 +1,47 @@
+import pytest
+
+from bullish_ccxt.bullish import bullish
+from tests import mock_responses
+
+
+@pytest.fixture
+def exchange(mocker):
+    exchange = bullish({'enableRateLimit': False})
+    mocker.patch.object(exchange, 'fetch', return_value=mock_responses.MARKETS)
+    return exchange
+
+
+def test_mappings_only_cover_listed_markets(exchange):
+    exchange.load_market_symbol_mappings()
+    assert exchange.symbols_bullish_to_unified == {
+        'BTCUSDC': 'BTC/USDC',
+        'ETHUSDC': 'ETH/USDC',
+        'BTC-USDC-PERP': 'BTC/USDC:USDC',
+    }
+    assert exchange.to_bullish_symbol('BTC/USDC:USDC') == 'BTC-USDC-PERP'
+    assert exchange.fetch.call_count == 1
+
+
+def test_unknown_symbols_are_parsed_on_demand(exchange):
+    assert exchange.to_unified_symbol('SOLUSDC') == 'SOL/USDC'
+    assert exchange.to_unified_symbol('SOL-USDC-PERP') == 'SOL/USDC:USDC'
+    assert exchange.to_bullish_symbol('SOL/USDC') == 'SOLUSDC'
+    assert exchange.to_bullish_symbol('ETH/USDC:USDC') == 'ETH-USDC-PERP'
+    assert exchange.symbols_bullish_to_unified['SOLUSDC'] == 'SOL/USDC'
+    assert exchange.to_unified_symbol('UNKNOWN') == 'UNKNOWN'
+    assert exchange.to_bullish_symbol(None) is None
+
+
+def test_fetch_markets_refreshes_mappings_without_extra_request(exchange):
+    markets = exchange.fetch_markets()
+    assert [market['symbol'] for market in markets] == ['BTC/USDC', 'ETH/USDC', 'BTC/USDC:USDC']
+    assert exchange.fetch.call_count == 1
+
+
+def test_reloads_swap_in_new_mappings(exchange):
+    exchange.load_market_symbol_mappings()
+    mappings = exchange.symbols_bullish_to_unified
+    exchange._build_market_symbol_mappings(mock_responses.MARKETS[:1])
+    # Threads holding the previous maps keep reading complete ones
+    assert len(mappings) == 3
+    assert exchange.symbols_bullish_to_unified == {'BTCUSDC': 'BTC/USDC'}
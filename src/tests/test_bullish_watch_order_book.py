@@ -0,0 +1,106 @@
+import time
+import pytest
+
+from ccxt.base.errors import NotSupported
+from bullish_ccxt.bullish import bullish
+from tests.mock_websocket_server import MockWebSocketServer
+from tests.schema_utils import matches_schema, orderbook_schema
+
+
+def level2(message_type, sequence_number, bids, asks):
+    return {
+        'type': message_type,
+        'dataType': 'V1TALevel2',
+        'data': {
+            'symbol': 'BTCUSDC',
+            'bids': bids,
+            'asks': asks,
+            'sequenceNumber': sequence_number,
+            'timestamp': str(1714521600000 + sequence_number),
+            'datetime': '2024-05-01T00:00:00.000Z',
+        },
+    }
+
+
+class SnapshotOnSubscribe:
+    def __init__(self):
+        self.sequence_number = 1
+
+    def __call__(self, server, connection, message):
+        if message['method'] == 'subscribe':
+            server.send(connection, level2('snapshot', self.sequence_number,
+                                           ['63000.0', '1.0', '62999.0', '2.0'], ['63001.0', '1.5', '63002.0', '2.5']))
+
+
+@pytest.fixture
+def server():
+    with MockWebSocketServer(SnapshotOnSubscribe()) as server:
+        yield server
+
+
+@pytest.fixture
+def exchange(server):
+    exchange = bullish({'enableRateLimit': False, 'timeout': 2000, 'options': {'wsReconnectDelay': 50}})
+    exchange.urls['api']['ws']['public'] = server.url
+    exchange.symbols_bullish_to_unified = {'BTCUSDC': 'BTC/USDC'}
+    exchange.symbols_unified_to_bullish = {'BTC/USDC': 'BTCUSDC'}
+    yield exchange
+    exchange.close_streams()
+
+
+def wait_for_subscriptions(server, count):
+    for _ in range(200):
+        if sum(1 for message in server.received if message['method'] == 'subscribe') >= count:
+            return
+        time.sleep(0.01)
+    raise AssertionError('Subscription not received')
+
+
+def test_maintains_book_from_snapshot_and_updates(exchange, server):
+    book = exchange.watch_order_book('BTC/USDC')
+    assert matches_schema(book, orderbook_schema)
+    assert book['bids'] == [[63000.0, 1.0], [62999.0, 2.0]]
+    assert server.received[0]['params'] == {'topic': 'l2Orderbook', 'symbol': 'BTCUSDC'}
+
+    server.broadcast(level2('update', 2, ['63000.5', '3.0', '63000.0', '0'], []))
+    book = exchange.watch_order_book('BTC/USDC')
+    assert book['bids'] == [[63000.5, 3.0], [62999.0, 2.0]]
+    assert book['asks'] == [[63001.0, 1.5], [63002.0, 2.5]]
+    assert book['nonce'] == 2
+
+    server.broadcast(level2('update', 3, [], ['63000.8', '0.5']))
+    book = exchange.watch_order_book('BTC/USDC', limit=1)
+    assert book['asks'] == [[63000.8, 0.5]]
+
+
+def test_resyncs_on_sequence_gap(exchange, server):
+    exchange.watch_order_book('BTC/USDC')
+    server.handler.sequence_number = 10
+    server.broadcast(level2('update', 5, ['1.0', '1.0'], []))
+    book = exchange.watch_order_book('BTC/USDC')
+    assert book['nonce'] == 10
+    assert [1.0, 1.0] not in book['bids']
+    assert [message['method'] for message in server.received] == ['subscribe', 'unsubscribe', 'subscribe']
+
+
+def test_resubscribes_after_reconnect(exchange, server):
+    exchange.watch_order_book('BTC/USDC')
+    server.handler.sequence_number = 20
+    server.drop_connections()
+    wait_for_subscriptions(server, 2)
+    book = exchange.watch_order_book('BTC/USDC')
+    assert book['nonce'] == 20
+
+
+def test_streams_from_the_environment_endpoint(exchange, server):
+    exchange.urls['local'] = {'ws': {'public': server.url}}
+    exchange.urls['api']['ws']['public'] = 'ws://127.0.0.1:1'
+    exchange.environment = 'LOCAL'
+    assert exchange.watch_order_book('BTC/USDC')['bids']
+
+    exchange.close_streams()
+    exchange.streams = {}
+    exchange.environment = 'UAT'
+    exchange.urls['uat'] = {'public': 'https://api.uat.example/trading-api/v1'}
+    with pytest.raises(NotSupported, match='UAT'):
+        exchange.watch_order_book('BTC/USDC')
@@ -0,0 +1,143 @@
+import asyncio
+import time
+import pytest
+
+from bullish_ccxt.bullish import bullish
+from bullish_ccxt.async_support import bullish as async_bullish
+from tests import mock_responses
+from tests.mock_websocket_server import MockWebSocketServer
+
+DATA_TYPES = {'orders': 'V1TAOrder', 'trades': 'V1TATrade', 'assetAccounts': 'V1TAAssetAccount'}
+SNAPSHOTS = {'orders': [mock_responses.ORDER], 'trades': [mock_responses.TRADE], 'assetAccounts': [mock_responses.BALANCE]}
+
+
+def private_data(message_type, topic, data):
+    return {'type': message_type, 'dataType': DATA_TYPES[topic], 'data': data}
+
+
+def snapshot_on_subscribe(server, connection, message):
+    if message['method'] == 'subscribe':
+        topic = message['params']['topic']
+        server.send(connection, private_data('snapshot', topic, SNAPSHOTS[topic]))
+
+
+def make_exchange(cls, server, mocker):
+    exchange = cls({
+        'apiKey': 'key',
+        'secret': 'secret',
+        'account_id': '111000000000001',
+        'enableRateLimit': False,
+        'timeout': 2000,
+        'options': {'wsReconnectDelay': 50},
+    })
+    exchange.urls['api']['ws']['private'] = server.url
+    exchange.symbols_bullish_to_unified = {'BTCUSDC': 'BTC/USDC'}
+    exchange.symbols_unified_to_bullish = {'BTC/USDC': 'BTCUSDC'}
+    login = mocker.AsyncMock if cls is async_bullish else mocker.Mock
+    mocker.patch.object(exchange, 'publicGetHmacLogin', new_callable=login, return_value=mock_responses.LOGIN)
+    return exchange
+
+
+@pytest.fixture
+def server():
+    with MockWebSocketServer(snapshot_on_subscribe) as server:
+        yield server
+
+
+@pytest.fixture
+def exchange(server, mocker):
+    exchange = make_exchange(bullish, server, mocker)
+    yield exchange
+    exchange.close_streams()
+
+
+def wait_for_subscriptions(server, count):
+    for _ in range(200):
+        if sum(1 for message in server.received if message['method'] == 'subscribe') >= count:
+            return
+        time.sleep(0.01)
+    raise AssertionError('Subscription not received')
+
+
+def test_authenticates_with_the_session_token(exchange, server):
+    exchange.watch_balance()
+    assert server.request_headers[0]['authorization'] == 'Bearer ' + mock_responses.LOGIN['token']
+    assert server.received[0]['params'] == {'topic': 'assetAccounts', 'tradingAccountId': '111000000000001'}
+
+
+def test_watches_orders_as_they_change(exchange, server):
+    orders = exchange.watch_orders('BTC/USDC')
+    assert [order['id'] for order in orders] == [mock_responses.ORDER['orderId']]
+    assert orders[0]['symbol'] == 'BTC/USDC'
+
+    # Unchanged orders are not reported again, filled ones are
+    filled = dict(mock_responses.ORDER, quantityFilled='0.10000000', status='CLOSED')
+    server.broadcast(private_data('update', 'orders', [mock_responses.ORDER, filled]))
+    orders = exchange.watch_orders()
+    assert len(orders) == 1
+    assert orders[0]['filled'] == 0.1
+    assert orders[0]['status'] == 'closed'
+
+
+def test_watches_my_trades_and_balance(exchange, server):
+    trades = exchange.watch_my_trades('BTC/USDC')
+    assert [trade['id'] for trade in trades] == [mock_responses.TRADE['tradeId']]
+
+    balance = exchange.watch_balance()
+    assert balance['USDC']['free'] == 10000.0
+
+    server.broadcast(private_data('update', 'assetAccounts', dict(mock_responses.BALANCE, availableQuantity='9000.000000')))
+    server.broadcast(private_data('update', 'trades', dict(mock_responses.TRADE, tradeId='100020000000000061')))
+    assert exchange.watch_balance()['USDC']['free'] == 9000.0
+    assert [trade['id'] for trade in exchange.watch_my_trades()] == ['100020000000000061']
+
+
+def test_resubscribes_after_reconnect_without_repeating_updates(exchange, server):
+    exchange.watch_my_trades()
+    server.drop_connections()
+    wait_for_subscriptions(server, 2)
+    assert len(server.request_headers) == 2
+    # The snapshot sent again on reconnect only holds trades already reported
+    server.broadcast(private_data('update', 'trades', dict(mock_responses.TRADE, tradeId='100020000000000062')))
+    assert [trade['id'] for trade in exchange.watch_my_trades()] == ['100020000000000062']
+
+
+def test_async_watch_orders(server, mocker):
+    async def run():
+        exchange = make_exchange(async_bullish, server, mocker)
+        try:
+            return await exchange.watch_orders('BTC/USDC')
+        finally:
+            await exchange.close()
+
+    orders = asyncio.run(run())
+    assert orders[0]['id'] == mock_responses.ORDER['orderId']
+    assert server.request_headers[0]['authorization'] == 'Bearer ' + mock_responses.LOGIN['token']
+
+
+def test_undrained_updates_are_bounded(server, mocker):
+    exchange = make_exchange(bullish, server, mocker)
+    exchange.options['wsMaxPendingUpdates'] = 2
+    try:
+        exchange.watch_orders()
+        server.broadcast(private_data('update', 'orders', [dict(mock_responses.ORDER, orderId=str(i)) for i in range(3)]))
+        stream = exchange.streams['private']
+        for _ in range(200):
+            if stream.dropped_updates['orders']:
+                break
+            time.sleep(0.01)
+        assert stream.dropped_updates['orders'] == 1
+        assert [order['id'] for order in exchange.watch_orders()] == ['1', '2']
+    finally:
+        exchange.close_streams()
+
+
+def test_streams_from_the_environment_endpoint(server, mocker):
+    exchange = make_exchange(bullish, server, mocker)
+    exchange.urls['dev'] = {'ws': {'private': server.url}}
+    exchange.urls['api']['ws']['private'] = 'ws://127.0.0.1:1'
+    exchange.environment = 'DEV'
+    try:
+        assert exchange.watch_balance()
+    finally:
+        exchange.close_streams()